@@ -1,21 +1,42 @@
+import importlib
 import streamlit as st
-from src.ui import setup_page
-from src.auth import render_auth_sidebar
-from src.posts import render_feed_page, render_write_page
-from src.travel import render_travel_page
+from src import metrics
+from src.ui import PROFILE_PAGE, setup_page, render_metrics_panel
+from src.auth import render_auth_sidebar, is_admin
 
-setup_page()  # 페이지 설정과 상단 타이틀만 담당
-
-# 사이드바 로그인/회원가입 처리 (세션 상태 관리)
-render_auth_sidebar()
+# 네비게이션 메뉴 → (모듈, 렌더 함수)
+# 페이지 모듈은 선택됐을 때 처음 import한다 (첫 화면은 홈 모듈만 읽는다)
+PAGES = {
+    "🏠 홈": ("src.posts", "render_feed_page"),
+    "✍️ 글쓰기": ("src.posts", "render_write_page"),
+    "🧭 여행메이트": ("src.travel", "render_travel_page"),
+    PROFILE_PAGE: ("src.profile", "render_profile_page"),
+}
 
-# 네비게이션 (메뉴만 보유, 실제 화면 렌더는 각 모듈)
-pages = {
-    "🏠 홈": render_feed_page,
-    "✍️ 글쓰기": render_write_page,
-    "🧭 여행메이트": render_travel_page,
+# 관리자(COMMUNITY_ADMIN_USERS)에게만 보이는 메뉴
+ADMIN_PAGES = {
+    "📊 통계": ("src.admin", "render_stats_page"),
 }
-page = st.sidebar.radio("메뉴", list(pages.keys()))
 
-# 선택된 페이지 실행
-pages[page]()
\ No newline at end of file
+metrics.serve()  # COMMUNITY_METRICS_PORT가 있으면 지표 엔드포인트 (프로세스당 1번)
+
+with metrics.rerun():  # 리런 시간과 파일 읽기/쓰기 바이트 기록 (계측이 켜져 있을 때만)
+    setup_page()  # 페이지 설정과 상단 타이틀만 담당
+
+    # 사이드바 로그인/회원가입 처리 (세션 상태 관리)
+    render_auth_sidebar()
+
+    # 네비게이션 (메뉴만 보유, 실제 화면 렌더는 각 모듈)
+    # @사용자명 버튼은 menu 값을 바꿔 프로필로 보낸다 (로그아웃 등으로 없어진 메뉴면 첫 화면)
+    pages = {**PAGES, **ADMIN_PAGES} if is_admin() else PAGES
+    if st.session_state.get("menu") not in pages:
+        st.session_state.pop("menu", None)
+    page = st.sidebar.radio("메뉴", list(pages.keys()), key="menu")
+
+    # 선택된 페이지 실행
+    module_name, func_name = pages[page]
+    getattr(importlib.import_module(module_name), func_name)()
+
+    # 관리자 디버그 패널
+    if is_admin():
+        render_metrics_panel()
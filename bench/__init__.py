@@ -0,0 +1,10 @@
+"""
+데이터 계층 벤치마크
+
+    python -m bench --size 100k --backend sqlite --out bench_sqlite_100k.json
+
+generate.py가 규모별(1k / 100k / 1m) 합성 데이터를 만들고, run.py가
+src/data.py 공개 함수와 피드/여행 화면의 정렬·검색 경로를 잰다.
+"""
+from .generate import SIZES, generate
+from .run import run
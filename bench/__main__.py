@@ -0,0 +1,30 @@
+import argparse
+import os
+
+from .generate import SIZES
+from .run import READ_CASES, WRITE_CASES, run, write_report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m bench",
+        description="합성 데이터로 src/data.py 함수들의 실행 시간을 재고 JSON으로 출력",
+    )
+    parser.add_argument("--size", choices=list(SIZES), default="1k", help="게시글 수 규모")
+    parser.add_argument("--backend", choices=["csv", "sqlite", "log"],
+                        default=os.environ.get("COMMUNITY_STORAGE", "csv"), help="저장소 백엔드")
+    parser.add_argument("--repeat", type=int, default=20, help="케이스별 반복 횟수")
+    parser.add_argument("--seed", type=int, default=0, help="데이터 생성 시드")
+    parser.add_argument("--case", action="append", choices=READ_CASES + WRITE_CASES,
+                        help="측정할 케이스 (여러 번 지정 가능, 기본: 전체)")
+    parser.add_argument("--workdir", help="데이터를 만들 디렉토리 (기본: 임시 디렉토리)")
+    parser.add_argument("--out", help="결과 JSON 파일 (기본: 표준 출력)")
+    args = parser.parse_args(argv)
+
+    out = os.path.abspath(args.out) if args.out else None
+    report = run(args.size, args.backend, args.repeat, args.seed, args.workdir, args.case)
+    write_report(report, out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+
+# 규모 이름 → 게시글 수 (사용자/여행메이트는 1/10, 좋아요는 약 2배)
+SIZES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+
+# 한국어 게시글 재료
+PLACES = ["델리", "뭄바이", "바라나시", "자이푸르", "아그라", "고아", "콜카타", "첸나이",
+          "자이살메르", "우다이푸르", "리시케시", "다르질링", "푸네", "벵갈루루", "하이데라바드"]
+SUBJECTS = ["맛집", "숙소", "기차표", "사막투어", "일출", "야시장", "카레", "짜이", "요가 수업",
+            "릭샤", "환전", "유심", "사원", "갠지스 강", "타지마할", "시장", "축제", "트레킹"]
+ENDINGS = ["추천해 주세요!", "정말 좋았어요 ✨", "어디가 좋을까요?", "같이 가실 분 있나요?",
+           "후기 남깁니다.", "꼭 가보세요!", "조심하세요 ⚠️", "너무 더워요 ☀️", "가격 공유해요."]
+TAGS = ["india", "travel", "food", "delhi", "mumbai", "varanasi", "goa", "train", "hostel",
+        "yoga", "인도", "여행", "맛집", "동행", "숙소", "기차", "사막", "community"]
+
+# 여행메이트 재료
+DEPARTURES = ["서울", "부산", "인천", "대구", "광주", "델리", "뭄바이"]
+TRANSPORTS = ["Train", "Bus", "Flight", "Car", "Any"]
+BUDGETS = ["50000-150000", "150000-250000", "250000-500000", "500000-1000000"]
+COUNTRIES = ["Korea", "India", "Japan", "USA"]
+KOREA_CITIES = ["Seoul", "Busan", "Incheon", "Daegu", "Gwangju", "Daejeon"]
+
+# 생성 데이터의 기준 시각 (재현 가능하도록 고정)
+BASE_TIME = pd.Timestamp("2025-01-01 00:00:00")
+
+
+def _timestamps(rng, n: int, days: int = 365) -> pd.Series:
+    seconds = np.sort(rng.integers(0, days * 86400, size=n))
+    return (BASE_TIME + pd.to_timedelta(seconds, unit="s")).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def password_hash(i: int) -> str:
+    """생성된 i번째 사용자의 비밀번호 해시 (비밀번호는 f"pw{i}")"""
+    return hashlib.sha256(f"pw{i}".encode()).hexdigest()
+
+
+def make_users(rng, n: int) -> pd.DataFrame:
+    ids = np.arange(1, n + 1)
+    return pd.DataFrame({
+        "user_id": ids,
+        "username": [f"user{i}" for i in ids],
+        "password_sha256": [password_hash(i) for i in ids],
+        "email": [f"user{i}@example.com" for i in ids],
+        "country": rng.choice(COUNTRIES, size=n),
+        "city_in_korea": rng.choice(KOREA_CITIES, size=n),
+        "joined_at": _timestamps(rng, n),
+    })
+
+
+def make_posts(rng, n: int, n_users: int) -> pd.DataFrame:
+    places = rng.choice(PLACES, size=n)
+    subjects = rng.choice(SUBJECTS, size=n)
+    endings = rng.choice(ENDINGS, size=n)
+    content = [f"{p} {s} {e}" for p, s, e in zip(places, subjects, endings)]
+
+    # 게시글마다 태그 0~3개
+    tag_counts = rng.integers(0, 4, size=n)
+    tag_picks = rng.integers(0, len(TAGS), size=(n, 3))
+    tags = [",".join(dict.fromkeys(TAGS[t] for t in picks[:k])) for picks, k in zip(tag_picks, tag_counts)]
+
+    return pd.DataFrame({
+        "post_id": np.arange(1, n + 1),
+        "user_id": rng.integers(1, n_users + 1, size=n),
+        "content": content,
+        "tags": tags,
+        "created_at": _timestamps(rng, n),
+        "likes": 0,
+        "reposts": rng.poisson(0.3, size=n),
+    })
+
+
+def make_likes(rng, n_edges: int, n_users: int, n_posts: int) -> dict:
+    """사용자 → 좋아요 한 게시글 (인기 게시글에 몰리도록 Zipf 분포)"""
+    users = rng.integers(1, n_users + 1, size=n_edges)
+    posts = np.minimum(rng.zipf(1.3, size=n_edges), n_posts)
+    # 인기 게시글이 항상 1번이 되지 않도록 게시글 번호를 섞는다
+    posts = rng.permutation(n_posts)[posts - 1] + 1
+    edges = np.unique(np.stack([users, posts], axis=1), axis=0)
+    likes = {}
+    for user_id, post_id in edges:
+        likes.setdefault(int(user_id), []).append(int(post_id))
+    return likes
+
+
+def make_travel_mates(rng, n: int, n_users: int) -> pd.DataFrame:
+    date_from = BASE_TIME + pd.to_timedelta(rng.integers(0, 365, size=n), unit="D")
+    date_to = date_from + pd.to_timedelta(rng.integers(0, 30, size=n), unit="D")
+    destinations = rng.choice(PLACES, size=n)
+    return pd.DataFrame({
+        "mate_id": np.arange(1, n + 1),
+        "user_id": rng.integers(1, n_users + 1, size=n),
+        "title": [f"{d} 여행메이트 구해요" for d in destinations],
+        "departure_city": rng.choice(DEPARTURES, size=n),
+        "destination_city": destinations,
+        "date_from": date_from.strftime("%Y-%m-%d"),
+        "date_to": date_to.strftime("%Y-%m-%d"),
+        "budget_range_krw": rng.choice(BUDGETS, size=n),
+        "preferred_transport": rng.choice(TRANSPORTS, size=n),
+        "contact": [f"kakao{i}" for i in range(n)],
+        "notes": [f"{s} 좋아해요" for s in rng.choice(SUBJECTS, size=n)],
+        "status": rng.choice(["open", "closed"], size=n, p=[0.7, 0.3]),
+        "created_at": _timestamps(rng, n),
+    })
+
+
+def generate(data_dir: str, size: str = "1k", seed: int = 0) -> dict:
+    """
+    data_dir에 벤치마크용 데이터(CSV + 좋아요 JSON)를 만든다
+
+    Returns:
+        dict: 테이블별 행 수
+    """
+    n_posts = SIZES[size]
+    n_users = max(10, n_posts // 10)
+    n_tms = max(10, n_posts // 10)
+    rng = np.random.default_rng(seed)
+
+    users = make_users(rng, n_users)
+    posts = make_posts(rng, n_posts, n_users)
+    likes = make_likes(rng, n_posts * 2, n_users, n_posts)
+    tms = make_travel_mates(rng, n_tms, n_users)
+
+    # 게시글의 좋아요 수는 좋아요 그래프와 맞춘다
+    liked = np.concatenate([np.asarray(p) for p in likes.values()]) if likes else np.array([], dtype=int)
+    posts["likes"] = np.bincount(liked, minlength=n_posts + 1)[1:]
+
+    os.makedirs(data_dir, exist_ok=True)
+    users.to_csv(os.path.join(data_dir, "users.csv"), index=False)
+    posts.to_csv(os.path.join(data_dir, "posts.csv"), index=False)
+    tms.to_csv(os.path.join(data_dir, "travel_mates.csv"), index=False)
+    with open(os.path.join(data_dir, "user_likes.json"), "w", encoding="utf-8") as f:
+        json.dump({str(u): p for u, p in likes.items()}, f, separators=(",", ":"))
+
+    return {
+        "users": n_users,
+        "posts": n_posts,
+        "travel_mates": n_tms,
+        "likes": int(len(liked)),
+    }
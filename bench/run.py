@@ -0,0 +1,166 @@
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from .generate import generate, password_hash, PLACES
+
+# 저장소 루트 (src 패키지를 찾기 위해 sys.path에 넣는다)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 측정 케이스 이름
+# 읽기 전용 함수는 첫 호출(캐시 비움)과 반복 호출(캐시 적중)을 따로 잰다
+READ_CASES = [
+    "get_posts", "is_post_liked_by_user", "verify_user", "get_tms", "get_user_statistics",
+    "feed.latest", "feed.likes", "feed.hot", "feed.search", "feed.relevance", "feed.tag",
+    "travel.latest", "travel.open", "travel.search",
+]
+WRITE_CASES = ["add_post", "toggle_like", "delete_post", "add_user", "add_travel_mate"]
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def _summary(samples: list) -> dict:
+    ms = np.asarray(samples) * 1000
+    return {
+        "n": len(ms),
+        "min_ms": round(float(ms.min()), 3),
+        "median_ms": round(float(np.median(ms)), 3),
+        "mean_ms": round(float(ms.mean()), 3),
+        "p95_ms": round(float(np.percentile(ms, 95)), 3),
+        "max_ms": round(float(ms.max()), 3),
+    }
+
+
+def _timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def _cases(data, rows: dict) -> dict:
+    """케이스 이름 → i번째 반복에서 호출할 함수"""
+    from src.travel import _travel_view
+
+    n_posts, n_users = rows["posts"], rows["users"]
+
+    def feed(order, query="", tag=None):
+        return lambda i: data.get_posts_page(order, None, data.FEED_PAGE_SIZE, query, tag)
+
+    return {
+        "get_posts": lambda i: data.get_posts(),
+        "is_post_liked_by_user": lambda i: data.is_post_liked_by_user(i % n_posts + 1, i % n_users + 1),
+        "verify_user": lambda i: data.verify_user(f"user{i % n_users + 1}", password_hash(i % n_users + 1)),
+        "get_tms": lambda i: data.get_tms(),
+        "get_user_statistics": lambda i: data.get_user_statistics(),
+        # posts.render_feed_page의 정렬/검색/태그 경로
+        "feed.latest": feed("latest"),
+        "feed.likes": feed("likes"),
+        "feed.hot": feed("hot"),
+        "feed.search": lambda i: data.get_posts_page("latest", None, data.FEED_PAGE_SIZE,
+                                                     PLACES[i % len(PLACES)]),
+        "feed.relevance": lambda i: data.get_posts_page("relevance", None, data.FEED_PAGE_SIZE,
+                                                        f"{PLACES[i % len(PLACES)]} 맛집"),
+        "feed.tag": feed("latest", tag="인도"),
+        # travel.render_travel_page의 정렬/검색 경로
+        "travel.latest": lambda i: _travel_view(data.get_tms(), "", "최신순"),
+        "travel.open": lambda i: _travel_view(data.get_tms(), "", "모집중"),
+        "travel.search": lambda i: _travel_view(data.get_tms(), PLACES[i % len(PLACES)], "최신순"),
+        # 쓰기
+        "add_post": lambda i: data.add_post(i % n_users + 1, f"벤치마크 게시글 {i} 델리 맛집", "bench,인도"),
+        "toggle_like": lambda i: data.toggle_like(i % n_posts + 1, n_users - i % n_users),
+        "delete_post": lambda i: data.delete_post(n_posts - i),
+        "add_user": lambda i: data.add_user(f"bench{i}", password_hash(i), f"bench{i}@example.com"),
+        "add_travel_mate": lambda i: data.add_travel_mate(
+            i % n_users + 1, "벤치마크 여행메이트", "서울", PLACES[i % len(PLACES)],
+            "2025-03-01", "2025-03-10", "150000-250000", "Train", "bench", "벤치마크"
+        ),
+    }
+
+
+def _measure(all_cases: dict, selected: list, repeat: int, table_cache) -> dict:
+    results = {}
+    for name in selected:
+        fn = all_cases[name]
+        if name in READ_CASES:
+            # 첫 호출은 캐시를 비우고 저장소에서 다시 읽는 비용
+            table_cache.invalidate()
+            first = _timed(lambda: fn(0))
+            samples = [_timed(lambda i=i: fn(i)) for i in range(1, repeat + 1)]
+        else:
+            first = None
+            samples = [_timed(lambda i=i: fn(i)) for i in range(repeat)]
+        results[name] = {"first_ms": None if first is None else round(first * 1000, 3),
+                         **_summary(samples)}
+    return results
+
+
+def run(size: str = "1k", backend: str = "csv", repeat: int = 20, seed: int = 0,
+        workdir: str = None, cases: list = None) -> dict:
+    """
+    합성 데이터를 만들고 데이터 계층 함수들의 실행 시간을 잰다
+
+    저장소 백엔드는 src 모듈을 읽을 때 정해지므로 한 프로세스에서 한 번만
+    호출한다 (백엔드 비교는 백엔드마다 따로 실행해서 결과 JSON을 비교).
+    """
+    workdir = workdir or tempfile.mkdtemp(prefix=f"bench_{size}_{backend}_")
+    os.environ["COMMUNITY_STORAGE"] = backend
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+
+    gen_start = time.perf_counter()
+    rows = generate(os.path.join(workdir, "data"), size, seed)
+    generate_s = time.perf_counter() - gen_start
+
+    # data 경로는 작업 디렉토리 기준이므로 생성한 디렉토리로 옮겨 간다
+    os.chdir(workdir)
+    from src import data
+    from src.cache import table_cache
+
+    # 데이터 계층의 print 출력이 결과 JSON에 섞이지 않도록 stderr로 돌린다
+    with contextlib.redirect_stdout(sys.stderr):
+        setup_s = _timed(data.initialize_data)
+        results = _measure(_cases(data, rows), cases or READ_CASES + WRITE_CASES, repeat, table_cache)
+
+    return {
+        "meta": {
+            "size": size,
+            "backend": backend,
+            "rows": rows,
+            "repeat": repeat,
+            "seed": seed,
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "started_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "generate_s": round(generate_s, 3),
+            "setup_s": round(setup_s, 3),
+            "workdir": workdir,
+        },
+        "results": results,
+    }
+
+
+def write_report(report: dict, out: str = None) -> None:
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if out:
+        with open(out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
@@ -0,0 +1,160 @@
+"""
+시작 시간 예산 점검
+
+    python -m bench.startup --size 1k --out startup.json
+
+매번 새 프로세스에서 재므로 import 캐시가 섞이지 않는다.
+- 모듈별 import 시간 (src.storage, src.data, src.auth, src.posts, src.travel, app 첫 화면에 필요한 묶음)
+- 첫 렌더 시간 (AppTest로 app.py를 처음 실행: import + 첫 화면) 과 이어지는 리런 시간
+예산을 넘으면 0이 아닌 종료 코드를 돌려준다.
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from .generate import SIZES, generate
+from .run import ROOT, _git_commit, write_report
+
+# 새 프로세스에서 import 시간을 재는 모듈
+MODULES = ["src.storage", "src.data", "src.auth", "src.posts", "src.travel"]
+
+# 기본 예산 (초) - 첫 화면에 필요한 import 묶음 / 첫 렌더
+IMPORT_BUDGET_S = 1.5
+FIRST_RENDER_BUDGET_S = 3.0
+
+# 첫 화면(홈) 렌더 전에 app.py가 읽는 모듈
+FIRST_PAINT_MODULES = ["streamlit", "src.ui", "src.auth", "src.posts"]
+
+_IMPORT_SCRIPT = """
+import importlib, json, sys, time
+start = time.perf_counter()
+for name in sys.argv[1:]:
+    importlib.import_module(name)
+print(json.dumps(time.perf_counter() - start))
+"""
+
+_RENDER_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(sys.argv[1], default_timeout=60).run()
+first = time.perf_counter() - start
+start = time.perf_counter()
+at.run()
+rerun = time.perf_counter() - start
+print(json.dumps({"first_render_s": first, "rerun_s": rerun,
+                  "exception": [str(e.value) for e in at.exception]}))
+"""
+
+
+def _python(script: str, args: list, cwd: str, env: dict):
+    """새 인터프리터에서 script를 실행하고 마지막 줄의 JSON을 돌려준다"""
+    out = subprocess.run(
+        [sys.executable, "-c", script, *args], cwd=cwd, env=env,
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def _best(fn, repeat: int) -> float:
+    return min(fn() for _ in range(repeat))
+
+
+def _prepare(workdir: str, size: str) -> None:
+    """workdir에 app.py, src, assets와 합성 데이터를 둔다 (저장소의 data/는 건드리지 않음)"""
+    for name in ("src", "assets"):
+        shutil.copytree(os.path.join(ROOT, name), os.path.join(workdir, name), dirs_exist_ok=True,
+                        ignore=shutil.ignore_patterns("__pycache__"))
+    shutil.copy(os.path.join(ROOT, "app.py"), workdir)
+    generate(os.path.join(workdir, "data"), size)
+
+
+def run(size: str = "1k", backend: str = "csv", repeat: int = 3, workdir: str = None,
+        import_budget: float = IMPORT_BUDGET_S, render_budget: float = FIRST_RENDER_BUDGET_S) -> dict:
+    workdir = workdir or tempfile.mkdtemp(prefix=f"startup_{size}_{backend}_")
+    _prepare(workdir, size)
+    env = dict(os.environ, COMMUNITY_STORAGE=backend, PYTHONPATH=workdir)
+
+    def import_time(*names):
+        return lambda: _python(_IMPORT_SCRIPT, list(names), workdir, env)
+
+    # 바이트코드 캐시를 한 번 만든 뒤 잰다 (배포 환경과 같은 조건)
+    subprocess.run([sys.executable, "-m", "compileall", "-q", workdir], check=True)
+
+    def interpreter_time():
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], cwd=workdir, env=env, check=True)
+        return time.perf_counter() - start
+
+    baseline_s = _best(interpreter_time, repeat)
+    imports = {name: round(_best(import_time(name), repeat), 3) for name in MODULES}
+    first_paint_s = _best(import_time(*FIRST_PAINT_MODULES), repeat)
+
+    renders = [_python(_RENDER_SCRIPT, [os.path.join(workdir, "app.py")], workdir, env)
+               for _ in range(repeat)]
+    exceptions = [e for r in renders for e in r["exception"]]
+    first_render_s = min(r["first_render_s"] for r in renders)
+    rerun_s = min(r["rerun_s"] for r in renders)
+
+    over = []
+    if first_paint_s > import_budget:
+        over.append(f"import {first_paint_s:.3f}s > {import_budget}s")
+    if first_render_s > render_budget:
+        over.append(f"first_render {first_render_s:.3f}s > {render_budget}s")
+    if exceptions:
+        over.append("app.py raised: " + "; ".join(exceptions))
+
+    return {
+        "meta": {
+            "size": size,
+            "backend": backend,
+            "repeat": repeat,
+            "commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "workdir": workdir,
+        },
+        "budget": {"import_s": import_budget, "first_render_s": render_budget},
+        "results": {
+            "interpreter_s": round(baseline_s, 3),
+            "import_s": imports,
+            "first_paint_import_s": round(first_paint_s, 3),
+            "first_render_s": round(first_render_s, 3),
+            "rerun_s": round(rerun_s, 3),
+        },
+        "over_budget": over,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m bench.startup",
+        description="새 프로세스에서 import 시간과 첫 렌더 시간을 재고 예산과 비교",
+    )
+    parser.add_argument("--size", choices=list(SIZES), default="1k", help="게시글 수 규모")
+    parser.add_argument("--backend", choices=["csv", "sqlite", "log"],
+                        default=os.environ.get("COMMUNITY_STORAGE", "csv"), help="저장소 백엔드")
+    parser.add_argument("--repeat", type=int, default=3, help="측정 반복 횟수 (최솟값 사용)")
+    parser.add_argument("--import-budget", type=float, default=IMPORT_BUDGET_S,
+                        help="첫 화면 import 묶음 예산 (초)")
+    parser.add_argument("--render-budget", type=float, default=FIRST_RENDER_BUDGET_S,
+                        help="첫 렌더 예산 (초)")
+    parser.add_argument("--workdir", help="앱과 데이터를 복사할 디렉토리 (기본: 임시 디렉토리)")
+    parser.add_argument("--out", help="결과 JSON 파일 (기본: 표준 출력)")
+    args = parser.parse_args(argv)
+
+    out = os.path.abspath(args.out) if args.out else None
+    report = run(args.size, args.backend, args.repeat, args.workdir,
+                 args.import_budget, args.render_budget)
+    write_report(report, out)
+    for line in report["over_budget"]:
+        print(f"예산 초과: {line}", file=sys.stderr)
+    return 1 if report["over_budget"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
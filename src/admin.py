@@ -0,0 +1,40 @@
+import streamlit as st
+from . import metrics
+from .auth import is_admin
+from .data import STATS_DAYS, get_community_stats
+from .stats import DAILY, TOTALS
+
+# 기간 선택지 (일)
+PERIODS = (7, 30, 90, 365)
+
+
+def _render_totals(totals: dict):
+    first, second = st.columns(4), st.columns(4)
+    for column, name in zip(first + second, TOTALS):
+        column.metric(TOTALS[name], f"{totals.get(name, 0):,}")
+
+
+@metrics.timed("render_seconds", "render_stats_page")
+def render_stats_page():
+    """관리자 통계 - 쓰기 경로가 유지하는 카운터만 읽으므로 테이블 크기와 상관없다"""
+    if not is_admin():
+        st.warning("관리자만 볼 수 있습니다.")
+        return
+
+    st.subheader("📊 커뮤니티 통계")
+    days = st.selectbox("기간", PERIODS, index=PERIODS.index(STATS_DAYS) if STATS_DAYS in PERIODS else 1,
+                        format_func=lambda d: f"최근 {d}일")
+    totals, daily = get_community_stats(days)
+    if not totals:
+        st.error("통계를 불러오지 못했습니다.")
+        return
+    _render_totals(totals)
+
+    daily = daily.rename(columns=DAILY)
+    st.markdown("**게시글 / 좋아요 / 리포스트 (일별)**")
+    st.bar_chart(daily[[DAILY["posts"], DAILY["likes"], DAILY["reposts"]]])
+    st.markdown("**가입 (일별)**")
+    st.bar_chart(daily[[DAILY["users"]]])
+    st.markdown("**여행메이트 새 모집 / 마감 (일별)**")
+    st.bar_chart(daily[[DAILY["travel_mates"], DAILY["travel_closed"]]])
+    st.caption("기간 합계 - " + ", ".join(f"{label} {int(daily[label].sum()):,}" for label in daily.columns))
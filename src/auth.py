@@ -1,15 +1,26 @@
 import streamlit as st
 import hashlib
-from .data import get_users, add_user
+import os
+from . import metrics
+
+# src.data(pandas, 저장소, 색인)는 로그인/가입 버튼을 눌렀을 때 처음 import한다 -
+# 사이드바는 모든 화면에 그려지므로 여기서 읽으면 첫 화면이 데이터 계층 전체를 기다린다
+
+# 관리자 화면(디버그 패널 등)을 볼 수 있는 사용자명 (쉼표 구분)
+ADMIN_USERS = {u.strip() for u in os.environ.get("COMMUNITY_ADMIN_USERS", "").split(",") if u.strip()}
+
+
+def is_admin() -> bool:
+    user = st.session_state.get("user")
+    return bool(user) and user.get("username") in ADMIN_USERS
 
 
 def _sha256(s: str) -> str:
     return hashlib.sha256(s.encode()).hexdigest()
 
 
+@metrics.timed("render_seconds", "render_auth_sidebar")
 def render_auth_sidebar():
-    users = get_users()
-
     st.sidebar.header("로그인")
     login_user = st.sidebar.text_input("아이디")
     login_pw = st.sidebar.text_input("비밀번호", type="password")
@@ -17,9 +28,11 @@ def render_auth_sidebar():
         if not login_user or not login_pw:
             st.sidebar.error("아이디/비밀번호를 입력하세요.")
         else:
-            row = users[users["username"] == login_user]
-            if len(row) == 1 and row.iloc[0]["password_sha256"] == _sha256(login_pw):
-                st.session_state["user"] = dict(row.iloc[0])
+            from .data import verify_user
+
+            user = verify_user(login_user, _sha256(login_pw))
+            if user:
+                st.session_state["user"] = user
                 st.sidebar.success(f"어서오세요, {login_user}님!")
             else:
                 st.sidebar.error("로그인 실패")
@@ -32,6 +45,8 @@ def render_auth_sidebar():
         su_pw = st.text_input("새 비밀번호", type="password", key="su_pw")
         if st.button("가입하기"):
             if su_user and su_email and su_pw:
+                from .data import add_user
+
                 ok, info = add_user(su_user, _sha256(su_pw), su_email)
                 if ok:
                     st.success("가입 완료! 사이드바에서 로그인 해주세요.")
@@ -0,0 +1,335 @@
+"""
+대량 가져오기/내보내기
+
+가져오기는 CSV 또는 JSON Lines 파일을 조각 단위로 읽어 검증하고, 기존 데이터와
+파일 안에서 겹치는 행을 걸러낸 뒤, 남은 행에 ID를 한 번에 부여해 테이블에 한 번만
+쓴다 (행마다 add_user/add_post를 부르면 행마다 파일 전체를 다시 써서 O(N²)).
+내보내기는 저장소에서 조각 단위로 읽은 것을 바로 파일에 이어 쓴다.
+"""
+import hashlib
+import math
+import os
+import re
+import sys
+from datetime import datetime
+import pandas as pd
+
+from . import data
+from .storage import SCAN_CHUNK_ROWS, TABLES, atomic_write, get_storage
+
+FORMATS = ("csv", "jsonl")
+
+# 내보낼 수 있는 테이블 (likes는 (user_id, post_id) 쌍)
+EXPORT_TABLES = (*TABLES, "likes")
+
+# 건너뛴 이유마다 기억해 둘 행 번호 수
+EXAMPLES = 5
+
+_SHA256 = re.compile(r"[0-9a-f]{64}")
+_TRAVEL_STATUSES = ("open", "closed")
+
+
+def detect_format(path: str, fmt: str = None) -> str:
+    """지정한 형식, 없으면 확장자로 (.jsonl/.ndjson/.json → jsonl, 나머지는 csv)"""
+    if fmt:
+        return fmt
+    return "jsonl" if os.path.splitext(path)[1].lower() in (".jsonl", ".ndjson", ".json") else "csv"
+
+
+def read_chunks(path: str, fmt: str = None, chunk_size: int = SCAN_CHUNK_ROWS):
+    """파일을 조각 단위로 읽어 (조각 첫 행 번호, DataFrame)을 차례로 반환 (행 번호는 1부터)"""
+    if detect_format(path, fmt) == "csv":
+        # 문자열 그대로 읽는다 - 변환과 검증은 행 단위로
+        reader = pd.read_csv(path, chunksize=chunk_size, dtype=str, keep_default_na=False)
+    else:
+        reader = pd.read_json(path, lines=True, chunksize=chunk_size, dtype=False,
+                              convert_dates=False)
+    row_number = 1
+    with reader:
+        for chunk in reader:
+            yield row_number, chunk
+            row_number += len(chunk)
+
+
+# =============================================================================
+# 값 정리
+# =============================================================================
+
+def _text(value) -> str:
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ""
+    return str(value).strip()
+
+
+def _int(value):
+    """정수 ID/카운트 (빈 값은 0, 정수가 아니면 None)"""
+    text = _text(value)
+    if not text:
+        return 0
+    try:
+        number = float(text)
+    except ValueError:
+        return None
+    return int(number) if number.is_integer() else None
+
+
+def _timestamp(value, fmt: str = "%Y-%m-%d %H:%M:%S"):
+    """날짜/시각 문자열 → fmt (빈 값은 "", 읽을 수 없으면 None)"""
+    text = _text(value)
+    if not text:
+        return ""
+    parsed = pd.to_datetime(text, errors="coerce")
+    return None if pd.isna(parsed) else parsed.strftime(fmt)
+
+
+def _now() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+# =============================================================================
+# 가져오기
+# =============================================================================
+
+class ImportReport:
+    """읽은 행 수, 추가한 ID, 건너뛴 이유별 건수와 앞쪽 행 번호"""
+
+    def __init__(self, table: str):
+        self.table = table
+        self.read = 0
+        self.ids = []
+        self.skipped = {}
+        self.failed = False
+
+    def skip(self, row_number: int, reason: str) -> None:
+        entry = self.skipped.setdefault(reason, [0, []])
+        entry[0] += 1
+        if len(entry[1]) < EXAMPLES:
+            entry[1].append(row_number)
+
+    def summary(self) -> str:
+        ids = f" (ID {self.ids[0]}~{self.ids[-1]})" if self.ids else ""
+        lines = [f"{self.table}: {self.read:,}행 읽음, {len(self.ids):,}행 추가{ids}"]
+        for reason, (count, rows) in self.skipped.items():
+            lines.append(f"  건너뜀 - {reason}: {count:,}행 (행 {', '.join(map(str, rows))} ...)")
+        if self.failed:
+            lines.append("  쓰기 실패 - 아무 행도 추가하지 않았습니다")
+        return "\n".join(lines)
+
+
+class _Authors:
+    """작성자 열 해석: username 열이 있으면 사용자명으로, 없으면 user_id로"""
+
+    def __init__(self):
+        self.index = data.get_user_index()
+
+    def resolve(self, record: dict):
+        username = _text(record.get("username"))
+        if username:
+            user = self.index.by_username.get(username)
+            return int(user["user_id"]) if user else None
+        user_id = _int(record.get("user_id"))
+        return user_id if user_id in self.index.usernames else None
+
+
+class _UserImport:
+    table = "users"
+    write = staticmethod(data.add_users)
+
+    def __init__(self):
+        index = data.get_user_index()
+        self.usernames = set(index.by_username)
+        self.emails = set(index.by_email)
+
+    def validate(self, record: dict):
+        """(추가할 행, None) 또는 (None, 건너뛰는 이유)"""
+        username, email = _text(record.get("username")), _text(record.get("email"))
+        if not username:
+            return None, "사용자명 없음"
+        if "@" not in email:
+            return None, "이메일 형식 오류"
+        password = _text(record.get("password_sha256")).lower()
+        if not password and _text(record.get("password")):
+            password = hashlib.sha256(_text(record.get("password")).encode()).hexdigest()
+        if not _SHA256.fullmatch(password):
+            return None, "비밀번호(password_sha256 또는 password) 없음/형식 오류"
+        joined_at = _timestamp(record.get("joined_at"))
+        if joined_at is None:
+            return None, "joined_at 형식 오류"
+        if username in self.usernames:
+            return None, "이미 있는 사용자명"
+        if email in self.emails:
+            return None, "이미 있는 이메일"
+        self.usernames.add(username)
+        self.emails.add(email)
+        return {
+            "username": username,
+            "password_sha256": password,
+            "email": email,
+            "country": _text(record.get("country")) or None,
+            "city_in_korea": _text(record.get("city_in_korea")) or None,
+            "joined_at": joined_at or _now(),
+        }, None
+
+
+class _PostImport:
+    table = "posts"
+    write = staticmethod(data.add_posts)
+
+    def __init__(self):
+        self.authors = _Authors()
+        posts = data.get_posts()
+        created = pd.to_datetime(posts["created_at"], errors="coerce").dt.strftime("%Y-%m-%d %H:%M:%S")
+        # 같은 작성자·작성 시각·내용이면 같은 게시글로 본다
+        self.seen = set(zip(posts["user_id"].astype(int), created, posts["content"]))
+
+    def validate(self, record: dict):
+        user_id = self.authors.resolve(record)
+        if user_id is None:
+            return None, "작성자(username/user_id)가 없는 사용자"
+        content = _text(record.get("content"))
+        if not content:
+            return None, "내용 없음"
+        created_at = _timestamp(record.get("created_at"))
+        if created_at is None:
+            return None, "created_at 형식 오류"
+        created_at = created_at or _now()
+        likes, reposts = _int(record.get("likes")), _int(record.get("reposts"))
+        if likes is None or reposts is None or likes < 0 or reposts < 0:
+            return None, "좋아요/리포스트 수 오류"
+        key = (user_id, created_at, content)
+        if key in self.seen:
+            return None, "이미 있는 게시글"
+        self.seen.add(key)
+        return {
+            "user_id": user_id,
+            "content": content,
+            "tags": ",".join(data.normalize_tags(_text(record.get("tags")))),
+            "created_at": created_at,
+            "likes": likes,
+            "reposts": reposts,
+        }, None
+
+
+class _TravelMateImport:
+    table = "travel_mates"
+    write = staticmethod(data.add_travel_mates)
+
+    # 글쓰기 화면에서 필수인 항목
+    REQUIRED = ("title", "departure_city", "destination_city", "contact")
+
+    def __init__(self):
+        self.authors = _Authors()
+        tms = data.get_tms()
+        date_from = pd.to_datetime(tms["date_from"], errors="coerce").dt.strftime("%Y-%m-%d")
+        # 같은 작성자·제목·도착 도시·출발일이면 같은 모집글로 본다
+        self.seen = set(zip(tms["user_id"].astype(int), tms["title"],
+                            tms["destination_city"].astype(str), date_from))
+
+    def validate(self, record: dict):
+        user_id = self.authors.resolve(record)
+        if user_id is None:
+            return None, "작성자(username/user_id)가 없는 사용자"
+        row = {column: _text(record.get(column)) for column in TABLES["travel_mates"]["columns"][2:]}
+        missing = [column for column in self.REQUIRED if not row[column]]
+        if missing:
+            return None, f"필수 항목 없음 ({', '.join(missing)})"
+        date_from = _timestamp(row["date_from"], "%Y-%m-%d")
+        date_to = _timestamp(row["date_to"], "%Y-%m-%d")
+        if not date_from or not date_to or date_to < date_from:
+            return None, "기간(date_from/date_to) 오류"
+        created_at = _timestamp(row["created_at"])
+        if created_at is None:
+            return None, "created_at 형식 오류"
+        status = row["status"].lower() or "open"
+        if status not in _TRAVEL_STATUSES:
+            return None, "status는 open/closed"
+        key = (user_id, row["title"], row["destination_city"], date_from)
+        if key in self.seen:
+            return None, "이미 있는 모집글"
+        self.seen.add(key)
+        row.update(user_id=user_id, date_from=date_from, date_to=date_to, status=status,
+                   created_at=created_at or _now())
+        return {column: value if value != "" else None for column, value in row.items()}, None
+
+
+IMPORTERS = {importer.table: importer for importer in (_UserImport, _PostImport, _TravelMateImport)}
+
+
+def import_file(table: str, path: str, fmt: str = None, chunk_size: int = SCAN_CHUNK_ROWS,
+                dry_run: bool = False, progress=None) -> ImportReport:
+    """
+    path의 행들을 검증·중복 제거해서 table에 한 번에 추가
+
+    파일은 조각 단위로 읽고, 통과한 행만 모아 마지막에 한 번 쓴다.
+    dry_run이면 검증 결과만 보고 쓰지 않는다.
+    """
+    importer = IMPORTERS[table]()
+    report = ImportReport(table)
+    rows = []
+    for first_row, chunk in read_chunks(path, fmt, chunk_size):
+        for offset, record in enumerate(chunk.to_dict("records")):
+            row, reason = importer.validate(record)
+            if row is None:
+                report.skip(first_row + offset, reason)
+            else:
+                rows.append(row)
+        report.read += len(chunk)
+        if progress is not None:
+            progress(table, len(chunk))
+    if rows and not dry_run:
+        report.ids = importer.write(rows)
+        report.failed = not report.ids
+    return report
+
+
+# =============================================================================
+# 내보내기
+# =============================================================================
+
+def _table_chunks(storage, table: str, chunk_size: int):
+    if table == "likes":
+        for pairs in storage.scan_likes(chunk_size):
+            yield pd.DataFrame(pairs, columns=["user_id", "post_id"])
+    else:
+        yield from storage.scan(table, chunk_size)
+
+
+def _write_chunks(f, chunks, fmt: str, progress=None, label: str = "") -> int:
+    rows = 0
+    for chunk in chunks:
+        if fmt == "csv":
+            chunk.to_csv(f, index=False, header=rows == 0)
+        elif len(chunk):
+            text = chunk.to_json(orient="records", lines=True, force_ascii=False)
+            f.write(text if text.endswith("\n") else text + "\n")
+        rows += len(chunk)
+        if progress is not None:
+            progress(label, len(chunk))
+    return rows
+
+
+def export_table(table: str, path: str, fmt: str = None, chunk_size: int = SCAN_CHUNK_ROWS,
+                 storage=None, progress=None) -> int:
+    """
+    table을 조각 단위로 읽어 path에 CSV/JSON Lines로 쓰고 행 수 반환 ("-"면 표준 출력)
+
+    파일은 임시 파일에 다 쓴 뒤 교체하므로 중간에 멈춰도 반쯤 쓴 백업이 남지 않는다.
+    """
+    storage = storage or get_storage()
+    fmt = detect_format(path, fmt)
+    chunks = _table_chunks(storage, table, chunk_size)
+    if path == "-":
+        try:
+            return _write_chunks(sys.stdout, chunks, fmt, progress, table)
+        except BrokenPipeError:
+            # `| head`처럼 읽는 쪽이 먼저 닫았다 - 종료 때 다시 flush하다 실패하지 않게
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            return 0
+    rows = 0
+
+    def write(f):
+        nonlocal rows
+        rows = _write_chunks(f, chunks, fmt, progress, table)
+
+    atomic_write(path, write)
+    return rows
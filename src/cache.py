@@ -0,0 +1,134 @@
+import pandas as pd
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+# 파생 뷰(정렬/검색 결과 등) 캐시 메모리 상한 (바이트)
+CACHE_MAX_BYTES = int(os.environ.get("COMMUNITY_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+# pandas Copy-on-Write가 켜져 있으면 얕은 복사만으로 원본이 보호된다
+_COPY_ON_WRITE = int(pd.__version__.split(".")[0]) >= 3 or bool(
+    pd.get_option("mode.copy_on_write") is True
+)
+
+
+def _read_only_view(value):
+    """호출자가 수정해도 캐시 원본이 바뀌지 않는 사본을 반환"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=not _COPY_ON_WRITE)
+    return value
+
+
+def _estimate_size(value) -> int:
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, (dict, set, list, tuple)):
+        return sys.getsizeof(value) + sum(sys.getsizeof(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class TableCache:
+    """
+    프로세스 전역 테이블 캐시
+
+    테이블마다 파싱된 DataFrame 하나를 모든 세션이 공유하고, 저장소가
+    알려주는 버전(파일 식별자 + 쓰기 카운터)이 바뀌면 다시 읽는다.
+    테이블에서 파생된 뷰는 버전별로 저장하며 메모리 상한을 넘으면
+    가장 오래 쓰이지 않은 것부터 버린다.
+    """
+
+    def __init__(self, max_bytes: int = CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.RLock()
+        self._tables = {}
+        self._derived = OrderedDict()
+        self._derived_bytes = 0
+
+    def get_table(self, table: str, version, loader):
+        """버전이 같으면 캐시된 테이블, 다르면 loader()로 다시 읽은 테이블"""
+        with self._lock:
+            entry = self._tables.get(table)
+            if entry is not None and entry[0] == version:
+                return _read_only_view(entry[1])
+        value = loader()
+        with self._lock:
+            if value is None:
+                self._tables.pop(table, None)
+            else:
+                self._tables[table] = (version, value)
+            self._drop_stale(table, version)
+        return _read_only_view(value)
+
+    def get_derived(self, table: str, version, name, builder):
+        """테이블 버전별 파생 뷰 (LRU, 메모리 상한 적용)"""
+        key = (table, name)
+        with self._lock:
+            entry = self._derived.get(key)
+            if entry is not None and entry[0] == version:
+                self._derived.move_to_end(key)
+                return _read_only_view(entry[1])
+        value = builder()
+        size = _estimate_size(value)
+        with self._lock:
+            old = self._derived.pop(key, None)
+            if old is not None:
+                self._derived_bytes -= old[2]
+            if size <= self.max_bytes:
+                self._derived[key] = (version, value, size)
+                self._derived_bytes += size
+                self._evict()
+        return _read_only_view(value)
+
+    def advance_derived(self, table: str, old_version, new_version, name, update) -> bool:
+        """
+        old_version의 파생 뷰를 update(value)로 고쳐 new_version 것으로 옮긴다
+
+        테이블을 다시 읽지 않고 뷰만 증분 갱신할 때 쓴다. 캐시에 old_version
+        뷰가 없거나 update가 False를 돌려주면 뷰를 버리고 False를 반환하므로,
+        다음 조회에서 새로 만든다.
+        """
+        key = (table, name)
+        with self._lock:
+            entry = self._derived.get(key)
+            if entry is None:
+                return False
+            if entry[0] != old_version or not update(entry[1]):
+                self._derived_bytes -= self._derived.pop(key)[2]
+                return False
+            self._derived[key] = (new_version, entry[1], entry[2])
+            self._derived.move_to_end(key)
+            return True
+
+    def discard_derived(self, table: str, name) -> None:
+        """파생 뷰 하나만 버린다 (다음 조회에서 새로 만든다)"""
+        with self._lock:
+            entry = self._derived.pop((table, name), None)
+            if entry is not None:
+                self._derived_bytes -= entry[2]
+
+    def invalidate(self, table: str = None) -> None:
+        """테이블(없으면 전체) 캐시 무효화"""
+        with self._lock:
+            for key in list(self._tables):
+                if table is None or key == table:
+                    del self._tables[key]
+            for key in list(self._derived):
+                if table is None or key[0] == table:
+                    self._derived_bytes -= self._derived.pop(key)[2]
+
+    def _drop_stale(self, table: str, version) -> None:
+        for key in list(self._derived):
+            if key[0] == table and self._derived[key][0] != version:
+                self._derived_bytes -= self._derived.pop(key)[2]
+
+    def _evict(self) -> None:
+        while self._derived_bytes > self.max_bytes and self._derived:
+            _, (_, _, size) = self._derived.popitem(last=False)
+            self._derived_bytes -= size
+
+
+# 프로세스 전체에서 공유하는 캐시 인스턴스
+table_cache = TableCache()
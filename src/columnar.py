@@ -0,0 +1,203 @@
+import json
+import os
+import shutil
+import time
+import numpy as np
+import pandas as pd
+
+
+# 컬럼형 스냅샷을 함께 유지할 테이블 (쉼표 구분, 기본은 사용 안 함)
+COLUMNAR_TABLES = tuple(
+    t.strip() for t in os.environ.get("COMMUNITY_COLUMNAR", "").split(",") if t.strip()
+)
+
+# 고정폭 int64 배열로 저장할 컬럼 (나머지는 offsets + blob 문자열)
+INT_COLUMNS = {
+    "posts": ("post_id", "user_id", "likes", "reposts"),
+    "travel_mates": ("mate_id", "user_id"),
+}
+
+# 문자열과 함께 정렬용 int64 나노초 배열도 저장할 시각 컬럼
+TIME_COLUMNS = {
+    "posts": ("created_at",),
+    "travel_mates": ("created_at",),
+}
+
+_arrow = None
+
+
+def _arrow_str():
+    """
+    기본 문자열 dtype이 Arrow 기반이면 (pyarrow 모듈, dtype), 아니면 None
+
+    pyarrow는 무거워서 컬럼형 스냅샷을 처음 읽을 때 불러온다.
+    """
+    global _arrow
+    if _arrow is None:
+        _arrow = False
+        try:
+            import pyarrow
+        except ImportError:  # 없으면 문자열 컬럼을 디코딩해서 만든다
+            return None
+        default_str = pd.Series(["a"]).dtype
+        if isinstance(default_str, pd.StringDtype) and default_str.storage == "pyarrow":
+            _arrow = (pyarrow, default_str)
+    return _arrow or None
+
+
+def _write_array(path: str, array: np.ndarray) -> None:
+    with open(path, "wb") as f:
+        np.save(f, array)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _encode_strings(values: pd.Series) -> tuple:
+    """
+    문자열 컬럼 → (offsets int64[n+1], utf-8 blob)
+
+    i번째 값은 blob[offsets[i]:offsets[i+1]] (Arrow large_string과 같은 배치).
+    결측값은 빈 문자열로 저장하고, 읽을 때 CSV와 같이 빈 문자열을 NaN으로 돌린다.
+    """
+    encoded = [v.encode("utf-8") if isinstance(v, str) else b"" for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype="int64")
+    np.cumsum(np.fromiter(map(len, encoded), dtype="int64", count=len(encoded)), out=offsets[1:])
+    return offsets, b"".join(encoded)
+
+
+def write_columns(directory: str, table: str, df: pd.DataFrame, source=None) -> None:
+    """
+    df를 directory 아래 새 세대(generation)로 쓰고 CURRENT가 그것을 가리키게 한다
+
+    이미 열려 있는 이전 세대는 그대로 매핑된 채 남으므로 읽는 쪽이 깨지지 않는다.
+    source는 원본(CSV) 파일 식별자 - 읽을 때 원본과 맞는지 확인하는 데 쓴다.
+    """
+    generation = f"{time.time_ns()}-{os.getpid()}"
+    gen_dir = os.path.join(directory, generation)
+    os.makedirs(gen_dir)
+
+    ints, times = INT_COLUMNS.get(table, ()), TIME_COLUMNS.get(table, ())
+    for column in df.columns:
+        if column in ints:
+            values = pd.to_numeric(df[column], errors="coerce").fillna(0).to_numpy(dtype="int64")
+            _write_array(os.path.join(gen_dir, f"{column}.npy"), values)
+            continue
+        offsets, blob = _encode_strings(df[column].astype(object).where(df[column].notna(), None))
+        _write_array(os.path.join(gen_dir, f"{column}.off.npy"), offsets)
+        with open(os.path.join(gen_dir, f"{column}.blob"), "wb") as f:
+            f.write(blob)
+            f.flush()
+            os.fsync(f.fileno())
+        if column in times:
+            parsed = pd.to_datetime(df[column], errors="coerce")
+            ns = parsed.to_numpy(dtype="datetime64[ns]").view("int64")
+            _write_array(os.path.join(gen_dir, f"{column}.ns.npy"), ns)
+
+    meta = {
+        "generation": generation,
+        "table": table,
+        "rows": len(df),
+        "columns": list(df.columns),
+        "source": list(source) if source else None,
+    }
+    tmp_path = os.path.join(directory, f"CURRENT.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, os.path.join(directory, "CURRENT"))
+
+    # 이전 세대 정리 (다른 프로세스가 매핑 중이어도 리눅스에서는 안전)
+    for name in os.listdir(directory):
+        old = os.path.join(directory, name)
+        if name != generation and os.path.isdir(old):
+            shutil.rmtree(old, ignore_errors=True)
+
+
+class ColumnarTable:
+    """
+    mmap으로 연 컬럼형 스냅샷 한 세대
+
+    정수/시각 배열은 복사 없이 매핑된 그대로 쓰고, 문자열도 pandas 문자열이
+    Arrow 기반이면 매핑된 offsets/blob을 그대로 Arrow 버퍼로 넘긴다.
+    배열은 mmap_mode="c"로 열어서 호출자가 값을 바꿔도 디스크 파일에는
+    반영되지 않는다.
+    """
+
+    def __init__(self, directory: str, meta: dict):
+        self.meta = meta
+        self.rows = meta["rows"]
+        self.columns = meta["columns"]
+        self.source = tuple(meta["source"]) if meta.get("source") else None
+        self._dir = os.path.join(directory, meta["generation"])
+        self._arrays = {}
+
+    def _load(self, name: str) -> np.ndarray:
+        if name not in self._arrays:
+            # memmap 서브클래스 대신 같은 메모리를 가리키는 일반 ndarray 뷰
+            self._arrays[name] = np.load(os.path.join(self._dir, name), mmap_mode="c").view(np.ndarray)
+        return self._arrays[name]
+
+    def has(self, name: str) -> bool:
+        return os.path.exists(os.path.join(self._dir, name))
+
+    def array(self, column: str) -> np.ndarray:
+        """정수 컬럼의 매핑된 int64 배열"""
+        return self._load(f"{column}.npy")
+
+    def sort_key(self, column: str):
+        """정렬용 int64 배열 (정수 컬럼 그대로, 시각 컬럼은 나노초) - 없으면 None"""
+        for name in (f"{column}.npy", f"{column}.ns.npy"):
+            if self.has(name):
+                return self._load(name)
+        return None
+
+    def _blob(self, column: str) -> np.ndarray:
+        path = os.path.join(self._dir, f"{column}.blob")
+        if os.path.getsize(path) == 0:
+            return np.zeros(0, dtype=np.uint8)  # 빈 파일은 mmap할 수 없다
+        return np.memmap(path, dtype=np.uint8, mode="c").view(np.ndarray)
+
+    def strings(self, column: str) -> pd.Series:
+        """문자열 컬럼 전체 (빈 문자열은 CSV와 같이 NaN)"""
+        offsets = self._load(f"{column}.off.npy")
+        blob = self._blob(column)
+        arrow = _arrow_str()
+        if arrow is not None:
+            pa, dtype = arrow
+            valid = np.packbits(np.diff(offsets) > 0, bitorder="little")
+            array = pa.LargeStringArray.from_buffers(
+                self.rows, pa.py_buffer(offsets), pa.py_buffer(blob), pa.py_buffer(valid)
+            )
+            return pd.Series(dtype.__from_arrow__(array))
+        raw = blob.tobytes()
+        values = [raw[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(self.rows)]
+        return pd.Series([v if v else np.nan for v in values], dtype=None if self.rows else object)
+
+    def blob_bytes(self) -> int:
+        return sum(
+            os.path.getsize(os.path.join(self._dir, name))
+            for name in os.listdir(self._dir) if name.endswith(".blob")
+        )
+
+    def frame(self) -> pd.DataFrame:
+        data = {}
+        for column in self.columns:
+            if self.has(f"{column}.npy"):
+                data[column] = self.array(column)
+            else:
+                data[column] = self.strings(column)
+        return pd.DataFrame(data, columns=self.columns, copy=False)
+
+
+def open_columns(directory: str):
+    """directory의 현재 세대 (없거나 읽는 중 정리됐으면 None)"""
+    try:
+        with open(os.path.join(directory, "CURRENT"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    table = ColumnarTable(directory, meta)
+    if not os.path.isdir(table._dir):
+        return None
+    return table
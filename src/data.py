@@ -1,17 +1,152 @@
 import pandas as pd
-import json
+import numpy as np
 import os
+import sys
+import threading
+import unicodedata
 from datetime import datetime
+from types import MappingProxyType
+from .storage import DATA_DIR, USER_LIKES_FILE, TABLES, get_storage
+from .cache import table_cache
+from .intervals import IntervalTree
+from .ranking import HotRanking, hot_keys
+from . import metrics, search, stats
 
 # 데이터 파일 경로
-DATA_DIR = "data"
-USERS_FILE = os.path.join(DATA_DIR, "users.csv")
-POSTS_FILE = os.path.join(DATA_DIR, "posts.csv")
-TMS_FILE = os.path.join(DATA_DIR, "travel_mates.csv")  # 추가
-USER_LIKES_FILE = os.path.join(DATA_DIR, "user_likes.json")
+USERS_FILE = TABLES["users"]["file"]
+POSTS_FILE = TABLES["posts"]["file"]
+TMS_FILE = TABLES["travel_mates"]["file"]  # 추가
 
-# 데이터 디렉토리 생성
-os.makedirs(DATA_DIR, exist_ok=True)
+# =============================================================================
+# 테이블 스키마 (불러올 때 한 번만 타입을 맞춘다)
+# =============================================================================
+
+# 컬럼 → dtype (여기 없는 컬럼은 저장소가 준 그대로 - 자유 텍스트 등)
+SCHEMAS = {
+    "users": {
+        "user_id": "int32",
+        "country": "category",
+        "city_in_korea": "category",
+        "joined_at": "datetime64[ns]",
+    },
+    "posts": {
+        "post_id": "int32",
+        "user_id": "int32",
+        "created_at": "datetime64[ns]",
+        "likes": "int32",
+        "reposts": "int32",
+    },
+    "travel_mates": {
+        "mate_id": "int32",
+        "user_id": "int32",
+        "departure_city": "category",
+        "destination_city": "category",
+        "date_from": "datetime64[ns]",
+        "date_to": "datetime64[ns]",
+        "preferred_transport": "category",
+        "status": "category",
+        "created_at": "datetime64[ns]",
+    },
+    "post_tags": {
+        "post_id": "int32",
+    },
+    "post_images": {
+        "post_id": "int32",
+        "position": "int32",
+    },
+}
+
+def _apply_schema(table: str, df):
+    """SCHEMAS대로 컬럼 타입 변환 (ID/카운트의 결측값은 0, 읽을 수 없는 시각은 NaT)"""
+    if df is None:
+        return None
+    columns = {}
+    for column, dtype in SCHEMAS.get(table, {}).items():
+        if column not in df.columns or df[column].dtype == dtype:
+            continue
+        values = df[column]
+        if dtype == "int32":
+            columns[column] = pd.to_numeric(values, errors="coerce").fillna(0).astype("int32")
+        elif dtype == "category":
+            columns[column] = values.astype("category")
+        else:
+            columns[column] = pd.to_datetime(values, errors="coerce", format="ISO8601").astype(dtype)
+    return df.assign(**columns) if columns else df
+
+# =============================================================================
+# 테이블 캐시
+# =============================================================================
+
+def _load_table(table: str):
+    """저장소 버전이 그대로면 프로세스 캐시에서, 아니면 새로 읽어서 반환"""
+    storage = get_storage()
+    return table_cache.get_table(
+        table, storage.version(table), lambda: _apply_schema(table, storage.load(table))
+    )
+
+def get_table_view(table: str, name, builder):
+    """
+    테이블에서 파생된 뷰(정렬/검색 결과 등)를 캐시해서 반환
+    
+    builder는 테이블 DataFrame을 받아 뷰를 만드는 함수이며,
+    테이블 버전이 바뀌기 전까지는 다시 호출되지 않는다.
+    """
+    storage = get_storage()
+    version = storage.version(table)
+    return table_cache.get_derived(
+        table, version, name, lambda: builder(_load_table(table))
+    )
+
+def _rows_by_id(table: str, ids: list) -> pd.DataFrame:
+    """기본키 목록 순서대로 행을 가져온다 (없는 ID는 건너뜀)"""
+    key = TABLES[table]["key"]
+    by_id = get_table_view(table, "by_id", lambda df: df.set_index(key, drop=False).rename_axis(None))
+    return by_id.loc[[i for i in ids if i in by_id.index]]
+
+# =============================================================================
+# 검색 (n-gram 역색인)
+# =============================================================================
+
+def _search_table(table: str, query: str) -> pd.DataFrame:
+    """검색어의 모든 단어를 포함하는 행을 관련도 순으로 반환"""
+    # 색인은 테이블 버전이 바뀔 때만 테이블과 다시 맞춰 본다 (버전은 테이블보다 먼저 읽는다)
+    version = get_storage().version(table)
+    ids = search.search(table, _load_table(table), query, version)
+    df = _rows_by_id(table, ids)
+    # n-gram 교집합은 후보일 뿐이므로 일치한 행만 실제 포함 여부를 확인
+    terms = search.query_terms(query)
+    keep = [
+        all(term in search.row_text(table, row) for term in terms)
+        for row in df[search.SEARCH_FIELDS[table]].to_dict("records")
+    ]
+    return df[np.asarray(keep, dtype=bool)]
+
+def search_posts(query: str) -> pd.DataFrame:
+    """내용/태그 검색 (관련도 순)"""
+    get_posts()  # 최초 실행 시 기본 데이터 생성
+    return _search_table("posts", query)
+
+def search_travel_mates(query: str) -> pd.DataFrame:
+    """제목/내용/출발·도착 도시 검색 (관련도 순)"""
+    get_tms()  # 최초 실행 시 기본 데이터 생성
+    return _search_table("travel_mates", query)
+
+def _update_search_index(table: str, key: int, row: dict = None) -> None:
+    """행 추가(row 있음)/삭제(row 없음) 시 검색 색인 갱신"""
+    try:
+        if row is None:
+            search.remove_document(table, key)
+        else:
+            search.add_document(table, key, row)
+    except Exception as e:
+        print(f"검색 색인 갱신 오류: {e}")
+
+def _index_documents(table: str, docs: list) -> None:
+    """여러 행 추가 시 검색 색인 갱신 (변경 로그에 한 번에 덧붙인다)"""
+    try:
+        search.add_documents(table, docs)
+    except Exception as e:
+        print(f"검색 색인 갱신 오류: {e}")
 
 # =============================================================================
 # 사용자 관련 함수들
@@ -19,8 +154,9 @@ os.makedirs(DATA_DIR, exist_ok=True)
 
 def get_users() -> pd.DataFrame:
     """사용자 목록을 반환"""
-    if os.path.exists(USERS_FILE):
-        return pd.read_csv(USERS_FILE)
+    df = _load_table("users")
+    if df is not None:
+        return df
     else:
         # 기본 사용자 데이터 생성 - 해시화된 비밀번호 사용
         users_data = {
@@ -34,52 +170,126 @@ def get_users() -> pd.DataFrame:
             ]
         }
         df = pd.DataFrame(users_data)
-        df.to_csv(USERS_FILE, index=False)
-        return df
+        get_storage().save("users", df)
+        return _apply_schema("users", df)
+
+class UserIndex:
+    """
+    사용자 해시 색인 - 사용자명/이메일/ID로 O(1) 조회
+
+    users 테이블 버전별 파생 뷰로 캐시되고, 회원가입 때는 테이블을
+    다시 읽지 않고 새 사용자 한 명만 추가해서 다음 버전으로 옮긴다.
+    """
+
+    __slots__ = ("by_username", "by_email", "usernames", "last_id")
+
+    def __init__(self, users: pd.DataFrame):
+        records = users[["user_id", "username", "email", "password_sha256"]].to_dict("records")
+        self.by_username = {row["username"]: row for row in records}
+        self.by_email = {row["email"]: row["user_id"] for row in records}
+        self.usernames = {row["user_id"]: row["username"] for row in records}
+        self.last_id = max(self.usernames, default=0)
+
+    def add(self, row: dict) -> bool:
+        """새 사용자 추가 - 그 사이 다른 프로세스가 가입시킨 사용자가 있으면 False"""
+        if row["user_id"] != self.last_id + 1:
+            return False
+        self.by_username[row["username"]] = row
+        self.by_email[row["email"]] = row["user_id"]
+        self.usernames[row["user_id"]] = row["username"]
+        self.last_id = row["user_id"]
+        return True
+
+    def __sizeof__(self) -> int:
+        # 캐시 메모리 상한 계산용 대략값 (사전 3개 + 사용자 행)
+        return (sum(map(sys.getsizeof, (self.by_username, self.by_email, self.usernames)))
+                + sys.getsizeof({}) * len(self.by_username))
+
+# 같은 프로세스의 회원가입은 차례로 (중복 검사와 색인 갱신 사이에 다른 가입이 끼지 않게)
+_signup_lock = threading.Lock()
+
+def get_user_index() -> UserIndex:
+    """사용자 색인 (사용자 테이블이 바뀔 때만 다시 만든다)"""
+    # 만들 때만 get_users()로 읽는다 (최초 실행 시 기본 데이터 생성)
+    return get_table_view("users", "index", lambda _: UserIndex(get_users()))
+
+def get_user(username: str) -> dict:
+    """사용자명으로 사용자 행 조회 (없으면 빈 dict)"""
+    row = get_user_index().by_username.get(username)
+    return dict(row) if row else {}
+
+def get_usernames(user_ids) -> dict:
+    """사용자 ID 목록 → {user_id: username} (화면 한 장의 작성자를 한 번에 조회)"""
+    usernames = get_user_index().usernames
+    return {user_id: usernames[user_id] for user_id in set(user_ids) if user_id in usernames}
 
 def add_user(username: str, password_sha256: str, email: str) -> tuple:
     """새 사용자 추가"""
     try:
-        users_df = get_users()
-        
-        # 중복 사용자명/이메일 체크
-        if username in users_df["username"].values:
-            return False, "이미 존재하는 사용자명입니다."
-        if email in users_df["email"].values:
-            return False, "이미 존재하는 이메일입니다."
-        
-        # 새 사용자 ID 생성
-        new_user_id = users_df["user_id"].max() + 1 if len(users_df) > 0 else 1
-        
-        # 새 사용자 추가
-        new_user = pd.DataFrame({
-            "user_id": [new_user_id],
-            "username": [username],
-            "email": [email],
-            "password_sha256": [password_sha256]
-        })
-        
-        users_df = pd.concat([users_df, new_user], ignore_index=True)
-        users_df.to_csv(USERS_FILE, index=False)
+        storage = get_storage()
+        with _signup_lock, storage.write_lock("users"):
+            index = get_user_index()
+            version = storage.version("users")
+
+            # 중복 사용자명/이메일 체크
+            if username in index.by_username:
+                return False, "이미 존재하는 사용자명입니다."
+            if email in index.by_email:
+                return False, "이미 존재하는 이메일입니다."
+
+            # 새 사용자 추가 (ID는 저장소에서 부여)
+            row = {"username": username, "email": email, "password_sha256": password_sha256}
+            user_id = storage.insert("users", row)
+
+            # 색인은 다시 만들지 않고 새 사용자만 더한다 (쓰기 잠금 안이라 버전 차이는 이 쓰기뿐)
+            table_cache.advance_derived(
+                "users", version, storage.version("users"), "index",
+                lambda index: index.add({"user_id": user_id, **row})
+            )
+        _record_stats(("users", 1, datetime.now()))
         return True, "회원가입 성공"
     except Exception as e:
         print(f"사용자 추가 오류: {e}")
         return False, f"오류가 발생했습니다: {e}"
 
+def add_users(rows: list) -> list:
+    """
+    여러 사용자를 한 번에 추가하고 부여한 user_id 목록 반환 (대량 가져오기용)
+
+    rows는 users 컬럼 dict 목록. 중복 검사는 src/bulk.py가 미리 하지만, 그 사이
+    가입한 사용자와 사용자명/이메일이 겹치면 아무것도 쓰지 않고 빈 목록을 반환한다.
+    """
+    if not rows:
+        return []
+    try:
+        storage = get_storage()
+        with _signup_lock, storage.write_lock("users"):
+            index = get_user_index()
+            version = storage.version("users")
+            taken = [row["username"] for row in rows if row["username"] in index.by_username]
+            taken += [row["email"] for row in rows if row["email"] in index.by_email]
+            if taken:
+                print(f"사용자 일괄 추가 오류: 이미 존재하는 사용자명/이메일 {taken[:5]}")
+                return []
+
+            user_ids = storage.insert_rows("users", rows)
+            table_cache.advance_derived(
+                "users", version, storage.version("users"), "index",
+                lambda index: all(index.add({"user_id": user_id, **row})
+                                  for user_id, row in zip(user_ids, rows))
+            )
+        _record_stats(*(("users", 1, row.get("joined_at") or datetime.now()) for row in rows))
+        return user_ids
+    except Exception as e:
+        print(f"사용자 일괄 추가 오류: {e}")
+        return []
+
 def verify_user(username: str, password_sha256: str) -> dict:
     """사용자 인증"""
     try:
-        users_df = get_users()
-        user_row = users_df[
-            (users_df["username"] == username) & (users_df["password_sha256"] == password_sha256)
-        ]
-        
-        if len(user_row) > 0:
-            return {
-                "user_id": int(user_row.iloc[0]["user_id"]),
-                "username": user_row.iloc[0]["username"],
-                "email": user_row.iloc[0]["email"]
-            }
+        user = get_user_index().by_username.get(username)
+        if user and user["password_sha256"] == password_sha256:
+            return {"user_id": user["user_id"], "username": user["username"], "email": user["email"]}
         return {}
     except Exception as e:
         print(f"사용자 인증 오류: {e}")
@@ -91,8 +301,9 @@ def verify_user(username: str, password_sha256: str) -> dict:
 
 def get_posts() -> pd.DataFrame:
     """게시글 목록을 반환"""
-    if os.path.exists(POSTS_FILE):
-        return pd.read_csv(POSTS_FILE)
+    df = _load_table("posts")
+    if df is not None:
+        return df
     else:
         # 기본 게시글 데이터 생성
         posts_data = {
@@ -113,51 +324,117 @@ def get_posts() -> pd.DataFrame:
             ]
         }
         df = pd.DataFrame(posts_data)
-        df.to_csv(POSTS_FILE, index=False)
-        return df
+        get_storage().save("posts", df)
+        return _apply_schema("posts", df)
 
-def add_post(user_id: int, content: str, tags: str) -> bool:
-    """새 게시글 추가"""
+def add_post(user_id: int, content: str, tags: str, images: list = ()) -> bool:
+    """새 게시글 추가 (images는 src/images.store_images가 돌려준 원본 해시 목록)"""
     try:
-        posts_df = get_posts()
-        
-        # 새 게시글 ID 생성
-        new_post_id = posts_df["post_id"].max() + 1 if len(posts_df) > 0 else 1
-        
-        # 새 게시글 추가
-        new_post = pd.DataFrame({
-            "post_id": [new_post_id],
-            "user_id": [user_id],
-            "content": [content],
-            "tags": [tags],
-            "likes": [0],
-            "reposts": [0],
-            "created_at": [datetime.now().strftime("%Y-%m-%d %H:%M:%S")]
-        })
-        
-        posts_df = pd.concat([posts_df, new_post], ignore_index=True)
-        posts_df.to_csv(POSTS_FILE, index=False)
+        get_posts()  # 최초 실행 시 기본 데이터 생성
+        get_post_tags()
+        get_post_images_table()
+
+        # 태그는 저장할 때 한 번만 정규화
+        tag_list = normalize_tags(tags)
+        tags = ",".join(tag_list)
+
+        # 새 게시글 추가 (ID는 저장소에서 부여)
+        storage = get_storage()
+        created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with storage.write_lock("posts"):
+            version = storage.version("posts")
+            post_id = storage.insert("posts", {
+                "user_id": user_id,
+                "content": content,
+                "tags": tags,
+                "likes": 0,
+                "reposts": 0,
+                "created_at": created_at
+            })
+            _update_hot_ranking(
+                version, lambda ranking: ranking.add(post_id, pd.Timestamp(created_at).value)
+            )
+            _update_user_rows("posts", version, lambda index: index.add(user_id, post_id))
+            storage.insert_many("post_tags", [{"post_id": post_id, "tag": tag} for tag in tag_list])
+            storage.insert_many("post_images", [
+                {"post_id": post_id, "position": position, "image": image}
+                for position, image in enumerate(dict.fromkeys(images))
+            ])
+        _update_search_index("posts", post_id, {"content": content, "tags": tags})
+        _record_stats(("posts", 1, created_at))
         return True
     except Exception as e:
         print(f"게시글 추가 오류: {e}")
         return False
 
+def add_posts(rows: list) -> list:
+    """
+    검증된 게시글 여러 개를 한 번에 추가하고 부여한 post_id 목록 반환 (대량 가져오기용)
+
+    rows는 {"user_id", "content", "tags"(정규화된 문자열), "created_at", "likes", "reposts"}
+    dict 목록. 게시글·태그 매핑·검색 색인을 각각 한 번씩만 쓴다.
+    """
+    if not rows:
+        return []
+    try:
+        get_posts()  # 최초 실행 시 기본 데이터 생성
+        get_post_tags()
+
+        def rank(ranking):
+            for post_id, row in zip(post_ids, rows):
+                ranking.add(post_id, pd.Timestamp(row["created_at"]).value)
+                if row["likes"] or row["reposts"]:
+                    ranking.set_counts(post_id, likes=row["likes"], reposts=row["reposts"])
+            return True
+
+        storage = get_storage()
+        with storage.write_lock("posts"):
+            version = storage.version("posts")
+            post_ids = storage.insert_rows("posts", rows)
+            _update_hot_ranking(version, rank)
+            _update_user_rows("posts", version, lambda index: all(
+                index.add(row["user_id"], post_id) for post_id, row in zip(post_ids, rows)
+            ))
+            storage.insert_many("post_tags", [
+                {"post_id": post_id, "tag": tag}
+                for post_id, row in zip(post_ids, rows) for tag in normalize_tags(row["tags"])
+            ])
+        _index_documents("posts", list(zip(post_ids, rows)))
+        # 가져온 좋아요/리포스트 수는 그날 일어난 일이 아니므로 합계에만
+        _record_stats(*(event for row in rows for event in (
+            ("posts", 1, row["created_at"]), ("likes", row["likes"], None), ("reposts", row["reposts"], None)
+        )))
+        return post_ids
+    except Exception as e:
+        print(f"게시글 일괄 추가 오류: {e}")
+        return []
+
 def delete_post(post_id: int) -> bool:
     """게시글 삭제"""
     try:
-        posts_df = get_posts()
-        
-        # 해당 post_id가 존재하는지 확인
-        if post_id not in posts_df["post_id"].values:
-            return False
-        
-        # 해당 게시글 삭제
-        posts_df = posts_df[posts_df["post_id"] != post_id]
-        posts_df.to_csv(POSTS_FILE, index=False)
-        
-        # 해당 게시글의 좋아요 정보도 삭제
-        _remove_post_from_likes(post_id)
+        storage = get_storage()
+        # 작성자 색인과 통계에서 뺄 작성자·좋아요/리포스트 수, 좋아요 한 사용자
+        before = _rows_by_id("posts", [post_id])[["user_id", "likes", "reposts"]].to_dict("records")
+        before = before[0] if before else {"user_id": None, "likes": 0, "reposts": 0}
+        likers = storage.post_likers(post_id)
+        with storage.write_lock("posts"):
+            # 해당 게시글 삭제 (존재하지 않으면 False)
+            version = storage.version("posts")
+            if not storage.delete("posts", post_id):
+                return False
+            _update_hot_ranking(version, lambda ranking: ranking.remove(post_id))
+            _update_user_rows("posts", version, lambda index: index.remove(before["user_id"], post_id))
+            
+            # 해당 게시글의 좋아요/태그/이미지 정보도 삭제 (이미지 원본은 유지보수 compact가 정리)
+            _remove_post_from_likes(post_id)
+            storage.delete_where("post_tags", "post_id", post_id)
+            storage.delete_where("post_images", "post_id", post_id)
         
+        _update_search_index("posts", post_id)
+        # 이 게시글만 좋아요 했던 사용자는 더 이상 좋아요 한 사용자가 아니다
+        gone = sum(1 for user_id in likers if not storage.liked_post_ids(user_id))
+        _record_stats(("posts", -1, None), ("likes", -int(before["likes"]), None),
+                      ("reposts", -int(before["reposts"]), None), ("active_likers", -gone, None))
         return True
     except Exception as e:
         print(f"게시글 삭제 오류: {e}")
@@ -166,22 +443,241 @@ def delete_post(post_id: int) -> bool:
 def inc_repost(post_id: int) -> bool:
     """리포스트 수 증가"""
     try:
-        posts_df = get_posts()
-        posts_df.loc[posts_df["post_id"] == post_id, "reposts"] += 1
-        posts_df.to_csv(POSTS_FILE, index=False)
+        storage = get_storage()
+        with storage.write_lock("posts"):
+            version = storage.version("posts")
+            reposts = storage.increment("posts", post_id, "reposts", 1)
+            if reposts is not None:
+                _update_hot_ranking(version, lambda ranking: ranking.set_counts(post_id, reposts=reposts))
+        if reposts is not None:
+            _record_stats(("reposts", 1, datetime.now()))
         return True
     except Exception as e:
         print(f"리포스트 증가 오류: {e}")
         return False
 
+# =============================================================================
+# 태그 (정규화 매핑 + 태그 색인)
+# =============================================================================
+
+def normalize_tags(tags) -> list:
+    """쉼표로 구분된 태그 문자열을 정규화된 목록으로 (소문자, 앞의 # 제거, 중복 제거)"""
+    if not isinstance(tags, str):
+        return []
+    result = []
+    for tag in tags.split(","):
+        tag = unicodedata.normalize("NFKC", tag).strip().lstrip("#").strip().casefold()
+        if tag and tag not in result:
+            result.append(tag)
+    return result
+
+def get_post_tags() -> pd.DataFrame:
+    """게시글↔태그 매핑 (처음이면 게시글의 태그 컬럼으로 생성)"""
+    df = _load_table("post_tags")
+    if df is not None:
+        return df
+    df = build_post_tags(get_posts())
+    get_storage().save("post_tags", df)
+    return _apply_schema("post_tags", df)
+
+def build_post_tags(posts: pd.DataFrame) -> pd.DataFrame:
+    """게시글들의 태그 컬럼 → 게시글↔태그 매핑 행"""
+    rows = [
+        {"post_id": int(post_id), "tag": tag}
+        for post_id, tags in zip(posts["post_id"], posts["tags"])
+        for tag in normalize_tags(tags)
+    ]
+    return pd.DataFrame(rows, columns=TABLES["post_tags"]["columns"])
+
+def _build_tag_index(post_tags: pd.DataFrame):
+    index = {
+        tag: frozenset(int(post_id) for post_id in post_ids)
+        for tag, post_ids in post_tags.groupby("tag")["post_id"]
+    }
+    return MappingProxyType(index)
+
+def get_tag_index():
+    """태그 → 게시글 ID 집합 (읽기 전용, 매핑이 바뀔 때만 다시 만든다)"""
+    get_post_tags()
+    return get_table_view("post_tags", "index", _build_tag_index)
+
+def get_tag_counts(limit: int = None) -> list:
+    """태그별 게시글 수 [(tag, count), ...] - 많은 순, 태그 색인에서 계산"""
+    counts = get_table_view(
+        "post_tags", "counts",
+        lambda _: tuple(sorted(
+            ((tag, len(post_ids)) for tag, post_ids in get_tag_index().items()),
+            key=lambda item: (-item[1], item[0])
+        ))
+    )
+    return list(counts[:limit])
+
+def get_posts_by_tag(tag: str) -> pd.DataFrame:
+    """태그가 정확히 일치하는 게시글"""
+    tag_list = normalize_tags(tag)
+    post_ids = get_tag_index().get(tag_list[0], frozenset()) if tag_list else frozenset()
+    return _rows_by_id("posts", sorted(post_ids))
+
+# =============================================================================
+# 게시글 첨부 이미지 (파일은 src/images.py)
+# =============================================================================
+
+def get_post_images_table() -> pd.DataFrame:
+    """게시글↔이미지 매핑 (처음이면 빈 테이블 생성)"""
+    df = _load_table("post_images")
+    if df is not None:
+        return df
+    df = pd.DataFrame(columns=TABLES["post_images"]["columns"])
+    get_storage().save("post_images", df)
+    return _apply_schema("post_images", df)
+
+def _build_image_index(post_images: pd.DataFrame):
+    ordered = post_images.sort_values(["post_id", "position"], kind="stable")
+    index = {
+        int(post_id): tuple(images)
+        for post_id, images in ordered.groupby("post_id", sort=False)["image"]
+    }
+    return MappingProxyType(index)
+
+def get_post_images(post_ids) -> dict:
+    """게시글 ID 목록 → {post_id: (원본 해시, ...)} - 이미지가 있는 게시글만"""
+    get_post_images_table()
+    index = get_table_view("post_images", "index", _build_image_index)
+    return {int(post_id): index[int(post_id)] for post_id in post_ids if int(post_id) in index}
+
+# =============================================================================
+# 타임라인 페이지네이션
+# =============================================================================
+
+# 한 번에 보여줄 게시글 수 (기본값)
+FEED_PAGE_SIZE = int(os.environ.get("COMMUNITY_FEED_PAGE_SIZE", 10))
+
+# 정렬 이름 → 정렬 컬럼 (값이 같으면 post_id 내림차순)
+# relevance는 검색 순위를 그대로 쓰며, 검색어가 없으면 latest와 같다
+# hot은 좋아요/리포스트 수와 작성 시각으로 계산한 인기도 (src/ranking.py)
+FEED_ORDERS = {"latest": "created_at", "likes": "likes", "relevance": "relevance", "hot": "hot"}
+
+def _sort_key(values: pd.Series) -> np.ndarray:
+    """정렬 컬럼을 비교 가능한 int64 배열로 변환 (시각은 나노초)"""
+    if pd.api.types.is_numeric_dtype(values):
+        return values.fillna(0).to_numpy(dtype="int64")
+    if not pd.api.types.is_datetime64_any_dtype(values):
+        values = pd.to_datetime(values, errors="coerce")
+    return values.to_numpy(dtype="datetime64[ns]").view("int64")
+
+def _hot_keys(df: pd.DataFrame) -> np.ndarray:
+    return hot_keys(_sort_key(df["likes"]), _sort_key(df["reposts"]), _sort_key(df["created_at"]))
+
+def _build_hot_ranking(posts: pd.DataFrame) -> HotRanking:
+    return HotRanking(
+        posts["post_id"].to_numpy(dtype="int64"), _sort_key(posts["likes"]),
+        _sort_key(posts["reposts"]), _sort_key(posts["created_at"])
+    )
+
+def get_hot_ranking() -> HotRanking:
+    """hot 점수 상위 게시글 (좋아요/리포스트/작성/삭제 때 증분 갱신)"""
+    ranking = get_table_view("posts", "hot", lambda _: _build_hot_ranking(get_posts()))
+    if ranking.expired():
+        table_cache.discard_derived("posts", "hot")
+        ranking = get_table_view("posts", "hot", lambda _: _build_hot_ranking(get_posts()))
+    return ranking
+
+def _update_hot_ranking(version, update) -> None:
+    """
+    게시글을 바꾼 뒤 hot 순위를 다시 만들지 않고 그 게시글만 반영
+
+    version은 storage.write_lock("posts") 안에서 읽은 변경 전 버전이고 이 함수도 그
+    잠금 안에서 부른다 - 그래야 두 버전 사이의 변경이 이 쓰기뿐이다. 이 프로세스의 다른
+    스레드가 그 사이 순위를 옮겼으면 버전이 맞지 않아 버려지고 다음 조회에서 새로 만든다.
+    """
+    table_cache.advance_derived("posts", version, get_storage().version("posts"), "hot", update)
+
+def _feed_candidates(posts: pd.DataFrame, query: str, column: str, tag: str) -> tuple:
+    if query:
+        df = search_posts(query)
+        if tag:
+            df = df[df["post_id"].isin(get_posts_by_tag(tag)["post_id"])]
+    elif tag:
+        df = get_posts_by_tag(tag)
+    else:
+        df = posts
+    ids = df["post_id"].to_numpy(dtype="int64")
+    if column == "relevance":
+        return df, np.arange(len(df), 0, -1, dtype="int64"), ids
+    if column == "hot":
+        return df, _hot_keys(df), ids
+    if df is posts:
+        # 컬럼형 스냅샷이 있으면 매핑된 정렬키를 그대로 쓴다 (같은 행 순서일 때만)
+        mapped = get_storage().sort_keys("posts", column)
+        if mapped is not None and len(mapped[0]) == len(ids) and np.array_equal(mapped[0], ids):
+            return df, mapped[1], mapped[0]
+    return df, _sort_key(df[column]), ids
+
+def _keyset_page(candidates: tuple, cursor, limit: int) -> tuple:
+    """(정렬키, post_id)가 cursor보다 작은 행 중 상위 limit개 - 전체 정렬 없이 top-k 선택"""
+    df, keys, ids = candidates
+    positions = np.arange(len(df))
+    if cursor is not None:
+        cursor_key, cursor_id = cursor
+        positions = np.flatnonzero((keys < cursor_key) | ((keys == cursor_key) & (ids < cursor_id)))
+    if len(positions) > limit:
+        # limit번째로 큰 키 이상인 행만 남긴 뒤 그 안에서만 정렬
+        kth = np.partition(keys[positions], len(positions) - limit)[len(positions) - limit]
+        positions = positions[keys[positions] >= kth]
+    order = np.lexsort((ids[positions], keys[positions]))[::-1][:limit]
+    positions = positions[order]
+
+    next_cursor = None
+    if len(positions) == limit:
+        last = positions[-1]
+        next_cursor = (int(keys[last]), int(ids[last]))
+    return df.iloc[positions], next_cursor
+
+def get_posts_page(order: str = "latest", cursor=None, limit: int = FEED_PAGE_SIZE,
+                   query: str = "", tag: str = None) -> tuple:
+    """
+    타임라인 한 페이지를 키셋(커서) 방식으로 반환
+    
+    Args:
+        order: "latest"(작성 시각순), "likes"(좋아요순), "relevance"(검색 관련도순),
+            "hot"(인기순 - 좋아요/리포스트를 작성 후 경과 시간으로 감쇠)
+        cursor: 이전 페이지가 돌려준 next_cursor (첫 페이지는 None)
+        limit: 페이지 크기
+        query: 내용/태그 검색어
+        tag: 정확히 일치해야 하는 태그 (태그 필터)
+    
+    Returns:
+        tuple: (페이지 DataFrame, next_cursor - 마지막 페이지면 None)
+    """
+    column = FEED_ORDERS[order]
+    if column == "relevance" and not query:
+        column = FEED_ORDERS["latest"]
+    storage = get_storage()
+    if column == "hot" and not query and not tag:
+        # 앞쪽 페이지는 증분 갱신되는 상위 집합에서 바로 꺼낸다
+        page = get_hot_ranking().page(cursor, limit)
+        if page is not None:
+            return _rows_by_id("posts", page[0]), page[1]
+    elif not query and not tag:
+        # 백엔드가 직접 지원하면 보이는 페이지만 읽어온다
+        page = storage.page("posts", column, cursor, limit)
+        if page is not None:
+            return _apply_schema("posts", page[0]), page[1]
+    candidates = get_table_view(
+        "posts", ("feed", query.lower(), column, tag),
+        lambda posts: _feed_candidates(posts, query, column, tag)
+    )
+    return _keyset_page(candidates, cursor, limit)
+
 # =============================================================================
 # 여행메이트 관련 함수들 (travel.py에서 필요)
 # =============================================================================
 
 def get_tms() -> pd.DataFrame:
     """여행메이트 목록을 반환"""
-    if os.path.exists(TMS_FILE):
-        return pd.read_csv(TMS_FILE)
+    df = _load_table("travel_mates")
+    if df is not None:
+        return df
     else:
         # 기본 여행메이트 데이터 생성
         tms_data = {
@@ -200,138 +696,227 @@ def get_tms() -> pd.DataFrame:
             "created_at": ["2024-08-15 10:00:00", "2024-08-15 15:30:00"]
         }
         df = pd.DataFrame(tms_data)
-        df.to_csv(TMS_FILE, index=False)
-        return df
+        get_storage().save("travel_mates", df)
+        return _apply_schema("travel_mates", df)
 
 def add_travel_mate(user_id: int, title: str, departure_city: str, destination_city: str,
                    date_from, date_to, budget_range_krw: str, preferred_transport: str,
                    contact: str, notes: str) -> bool:
     """새 여행메이트 등록"""
     try:
-        tms_df = get_tms()
-        
-        # 새 메이트 ID 생성
-        new_mate_id = tms_df["mate_id"].max() + 1 if len(tms_df) > 0 else 1
+        get_tms()  # 최초 실행 시 기본 데이터 생성
         
-        # 새 여행메이트 추가
-        new_mate = pd.DataFrame({
-            "mate_id": [new_mate_id],
-            "user_id": [user_id],
-            "title": [title],
-            "departure_city": [departure_city],
-            "destination_city": [destination_city],
-            "date_from": [str(date_from)],
-            "date_to": [str(date_to)],
-            "budget_range_krw": [budget_range_krw],
-            "preferred_transport": [preferred_transport],
-            "contact": [contact],
-            "notes": [notes],
-            "status": ["open"],
-            "created_at": [datetime.now().strftime("%Y-%m-%d %H:%M:%S")]
+        # 새 여행메이트 추가 (ID는 저장소에서 부여)
+        created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        storage = get_storage()
+        with storage.write_lock("travel_mates"):
+            version = storage.version("travel_mates")
+            mate_id = storage.insert("travel_mates", {
+                "user_id": user_id,
+                "title": title,
+                "departure_city": departure_city,
+                "destination_city": destination_city,
+                "date_from": str(date_from),
+                "date_to": str(date_to),
+                "budget_range_krw": budget_range_krw,
+                "preferred_transport": preferred_transport,
+                "contact": contact,
+                "notes": notes,
+                "status": "open",
+                "created_at": created_at
+            })
+            _update_user_rows("travel_mates", version, lambda index: index.add(user_id, mate_id))
+        _update_search_index("travel_mates", mate_id, {
+            "title": title,
+            "notes": notes,
+            "departure_city": departure_city,
+            "destination_city": destination_city
         })
-        
-        tms_df = pd.concat([tms_df, new_mate], ignore_index=True)
-        tms_df.to_csv(TMS_FILE, index=False)
+        _record_stats(("travel_mates", 1, created_at), ("travel_open", 1, None))
         return True
     except Exception as e:
         print(f"여행메이트 추가 오류: {e}")
         return False
 
+def add_travel_mates(rows: list) -> list:
+    """검증된 여행메이트 여러 개를 한 번에 추가하고 부여한 mate_id 목록 반환 (대량 가져오기용)"""
+    if not rows:
+        return []
+    try:
+        get_tms()  # 최초 실행 시 기본 데이터 생성
+        storage = get_storage()
+        with storage.write_lock("travel_mates"):
+            version = storage.version("travel_mates")
+            mate_ids = storage.insert_rows("travel_mates", rows)
+            _update_user_rows("travel_mates", version, lambda index: all(
+                index.add(row["user_id"], mate_id) for mate_id, row in zip(mate_ids, rows)
+            ))
+        _index_documents("travel_mates", list(zip(mate_ids, rows)))
+        _record_stats(*(event for row in rows for event in (
+            ("travel_mates", 1, row["created_at"]), (f"travel_{row['status']}", 1, None)
+        )))
+        return mate_ids
+    except Exception as e:
+        print(f"여행메이트 일괄 추가 오류: {e}")
+        return []
+
 def close_travel_mate(mate_id: int) -> bool:
     """여행메이트 마감"""
     try:
-        tms_df = get_tms()
-        tms_df.loc[tms_df["mate_id"] == mate_id, "status"] = "closed"
-        tms_df.to_csv(TMS_FILE, index=False)
+        # 이미 마감된 글을 다시 마감해도 통계는 그대로
+        was_open = (_rows_by_id("travel_mates", [mate_id])["status"] == "open").any()
+        if get_storage().update("travel_mates", mate_id, {"status": "closed"}) and was_open:
+            _record_stats(("travel_open", -1, None), ("travel_closed", 1, datetime.now()))
         return True
     except Exception as e:
         print(f"여행메이트 마감 오류: {e}")
         return False
 
+# =============================================================================
+# 여행메이트 매칭 (도착 도시 + 기간 겹침)
+# =============================================================================
+
+def _city_key(city) -> str:
+    if not isinstance(city, str):
+        return ""
+    return unicodedata.normalize("NFKC", city).strip().casefold()
+
+def _date_ordinal(value):
+    """날짜(문자열/date)를 일 단위 정수로 - 읽을 수 없으면 None"""
+    try:
+        ts = pd.Timestamp(value)
+    except (ValueError, TypeError):
+        return None
+    return None if pd.isna(ts) else ts.date().toordinal()
+
+def _build_destination_index(tms: pd.DataFrame, open_only: bool):
+    """도착 도시별 여행 기간 구간 트리"""
+    intervals = {}
+    for mate_id, city, date_from, date_to, status in zip(
+        tms["mate_id"], tms["destination_city"], tms["date_from"], tms["date_to"], tms["status"]
+    ):
+        if open_only and status != "open":
+            continue
+        start, end = _date_ordinal(date_from), _date_ordinal(date_to)
+        if start is None or end is None:
+            continue
+        intervals.setdefault(_city_key(city), []).append((min(start, end), max(start, end), int(mate_id)))
+    return MappingProxyType({city: IntervalTree(items) for city, items in intervals.items()})
+
+def find_travel_mates(destination_city: str, date_from, date_to, open_only: bool = True) -> pd.DataFrame:
+    """
+    도착 도시가 같고 여행 기간이 겹치는 여행메이트 글 (출발 도시는 상관없음)
+    
+    도착 도시별 구간 트리로 찾으므로 O(log n + 결과 수)에 끝난다.
+    구간 트리는 여행메이트 테이블이 바뀔 때 한 번 다시 만든다.
+    """
+    get_tms()  # 최초 실행 시 기본 데이터 생성
+    index = get_table_view(
+        "travel_mates", ("destinations", open_only),
+        lambda tms: _build_destination_index(tms, open_only)
+    )
+    tree = index.get(_city_key(destination_city))
+    start, end = _date_ordinal(date_from), _date_ordinal(date_to)
+    if tree is None or start is None or end is None:
+        return _rows_by_id("travel_mates", [])
+    df = _rows_by_id("travel_mates", tree.overlapping(min(start, end), max(start, end)))
+    return df.sort_values(["date_from", "mate_id"])
+
 # =============================================================================
 # 개선된 좋아요 시스템
 # =============================================================================
 
 def get_user_likes() -> dict:
-    """사용자별 좋아요 상태를 반환"""
-    if os.path.exists(USER_LIKES_FILE):
-        try:
-            with open(USER_LIKES_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
-            return {}
-    return {}
+    """사용자별 좋아요 상태를 반환 {user_id: {post_id, ...}}"""
+    return get_storage().load_likes()
 
 def save_user_likes(user_likes: dict) -> bool:
     """사용자별 좋아요 상태를 저장"""
     try:
-        with open(USER_LIKES_FILE, "w", encoding="utf-8") as f:
-            json.dump(user_likes, f, ensure_ascii=False, indent=2)
+        get_storage().save_likes(user_likes)
         return True
     except Exception as e:
         print(f"좋아요 데이터 저장 오류: {e}")
         return False
 
+def get_liked_post_ids(user_id: int) -> frozenset:
+    """
+    사용자가 좋아요 한 게시글 ID 집합
+    
+    좋아요 데이터가 바뀌기 전까지 캐시되므로, 화면에서는 한 번만 불러와
+    게시글마다 집합 포함 여부로 확인하면 된다.
+    """
+    storage = get_storage()
+    return table_cache.get_derived(
+        "likes", storage.version("likes"), ("user", int(user_id)),
+        lambda: frozenset(storage.liked_post_ids(user_id))
+    )
+
+def get_post_likers(post_id: int) -> frozenset:
+    """게시글을 좋아요 한 사용자 ID 집합 (좋아요 데이터가 바뀌기 전까지 캐시)"""
+    storage = get_storage()
+    return table_cache.get_derived(
+        "likes", storage.version("likes"), ("post", int(post_id)),
+        lambda: frozenset(storage.post_likers(post_id))
+    )
+
+def get_post_likers_many(post_ids) -> dict:
+    """
+    게시글 ID 목록 → {post_id: 좋아요 한 사용자 ID 집합} - 좋아요가 있는 게시글만
+
+    화면 한 장의 게시글을 저장소에 한 번에 물어본다 (SQLite는 IN 쿼리 한 번).
+    좋아요 데이터가 바뀌기 전까지 같은 목록은 캐시된다.
+    """
+    storage = get_storage()
+    post_ids = tuple(sorted({int(post_id) for post_id in post_ids}))
+    return table_cache.get_derived(
+        "likes", storage.version("likes"), ("posts", post_ids),
+        lambda: MappingProxyType({post_id: frozenset(likers)
+                                  for post_id, likers in storage.post_likers_many(post_ids).items()})
+    )
+
 def is_post_liked_by_user(post_id: int, user_id: int) -> bool:
     """사용자가 특정 게시글을 좋아요 했는지 확인"""
-    user_likes = get_user_likes()
-    user_key = str(user_id)
-    post_key = str(post_id)
-    
-    if user_key not in user_likes:
-        return False
-    
-    return post_key in user_likes[user_key]
+    return int(post_id) in get_liked_post_ids(user_id)
 
-def toggle_like(post_id: int, user_id: int) -> dict:
+def toggle_like(post_id: int, user_id: int, liked: bool = None) -> dict:
     """
     좋아요를 토글하고 결과를 반환
     
+    liked를 주면 토글 대신 그 상태로 맞춘다 (이미 그 상태면 아무것도 바꾸지 않고
+    like_count는 None) - 백그라운드 쓰기처럼 늦게 반영돼도 결과가 같아야 할 때 쓴다.
+
     Returns:
         dict: {"liked": bool, "like_count": int, "success": bool}
     """
     try:
-        # 현재 사용자별 좋아요 상태 가져오기
-        user_likes = get_user_likes()
-        user_key = str(user_id)
-        post_key = str(post_id)
-        
-        # 사용자가 이미 이 게시글을 좋아요 했는지 확인
-        if user_key not in user_likes:
-            user_likes[user_key] = []
-        
-        user_liked_posts = user_likes[user_key]
-        is_currently_liked = post_key in user_liked_posts
-        
-        # 게시글 데이터 가져오기
-        posts_df = get_posts()
-        post_mask = posts_df["post_id"] == post_id
-        post_row = posts_df[post_mask]
-        
-        if len(post_row) == 0:
-            return {"liked": False, "like_count": 0, "success": False}
-        
-        current_likes = int(post_row.iloc[0]["likes"])
-        
-        if is_currently_liked:
-            # 좋아요 취소
-            user_liked_posts.remove(post_key)
-            new_like_count = max(0, current_likes - 1)  # 0보다 작아지지 않도록
-            liked = False
-        else:
-            # 좋아요 추가
-            user_liked_posts.append(post_key)
-            new_like_count = current_likes + 1
-            liked = True
-        
-        # 사용자 좋아요 상태 저장
-        user_likes[user_key] = user_liked_posts
-        save_user_likes(user_likes)
-        
-        # 게시글의 좋아요 수 업데이트
-        posts_df.loc[post_mask, "likes"] = new_like_count
-        posts_df.to_csv(POSTS_FILE, index=False)
-        
+        storage = get_storage()
+        with storage.write_lock("posts"):
+            # 사용자가 이미 이 게시글을 좋아요 했는지 확인
+            is_currently_liked = storage.is_liked(post_id, user_id)
+            if liked is not None and liked == is_currently_liked:
+                return {"liked": liked, "like_count": None, "success": True}
+            
+            # 게시글의 좋아요 수 업데이트 (0보다 작아지지 않도록)
+            delta = -1 if is_currently_liked else 1
+            version = storage.version("posts")
+            new_like_count = storage.increment("posts", post_id, "likes", delta, floor=0)
+            
+            if new_like_count is None:
+                return {"liked": False, "like_count": 0, "success": False}
+            _update_hot_ranking(
+                version, lambda ranking: ranking.set_counts(post_id, likes=new_like_count)
+            )
+            
+            # 사용자 좋아요 상태 저장
+            liked = not is_currently_liked
+            had_likes = bool(storage.liked_post_ids(user_id))
+            storage.set_like(post_id, user_id, liked)
+
+        # 좋아요 한 사용자 수는 첫 좋아요/마지막 좋아요 취소 때만 바뀐다
+        likers = (1 if liked and not had_likes
+                  else -1 if not liked and not storage.liked_post_ids(user_id) else 0)
+        _record_stats(("likes", delta, datetime.now()), ("active_likers", likers, None))
         return {"liked": liked, "like_count": new_like_count, "success": True}
         
     except Exception as e:
@@ -341,20 +926,107 @@ def toggle_like(post_id: int, user_id: int) -> dict:
 def _remove_post_from_likes(post_id: int) -> bool:
     """게시글 삭제 시 해당 게시글의 좋아요 정보도 제거"""
     try:
-        user_likes = get_user_likes()
-        post_key = str(post_id)
-        
-        # 모든 사용자의 좋아요 목록에서 해당 게시글 제거
-        for user_id in user_likes:
-            if post_key in user_likes[user_id]:
-                user_likes[user_id].remove(post_key)
-        
-        save_user_likes(user_likes)
+        get_storage().remove_post_likes(post_id)
         return True
     except Exception as e:
         print(f"게시글 좋아요 정보 삭제 오류: {e}")
         return False
 
+# =============================================================================
+# 사용자별 활동 (user_id 보조 색인 - 프로필 화면)
+# =============================================================================
+
+class UserRows:
+    """
+    user_id → 그 사용자가 쓴 행의 기본키 목록 (오름차순)
+
+    테이블 버전별 파생 뷰로 한 번 만들고, 글 추가/삭제 때는 다시 만들지 않고
+    그 행만 더하거나 빼서 다음 버전으로 옮긴다. 프로필은 이 목록만큼만 읽는다.
+    """
+
+    __slots__ = ("keys",)
+
+    def __init__(self, user_ids, keys):
+        user_ids = np.asarray(user_ids, dtype="int64")
+        keys = np.asarray(keys, dtype="int64")
+        order = np.lexsort((keys, user_ids))
+        user_ids, keys = user_ids[order], keys[order]
+        # user_id가 바뀌는 위치마다 한 사용자의 구간
+        starts = np.flatnonzero(np.diff(user_ids, prepend=-1) != 0)
+        ends = np.append(starts[1:], len(user_ids))
+        self.keys = {int(user_ids[start]): keys[start:end].tolist() for start, end in zip(starts, ends)}
+
+    def get(self, user_id: int) -> list:
+        return list(self.keys.get(int(user_id), ()))
+
+    def add(self, user_id: int, key: int) -> bool:
+        keys = self.keys.setdefault(int(user_id), [])
+        if keys and keys[-1] >= key:
+            return False  # ID는 늘어나기만 한다 - 순서가 어긋났으면 다시 만든다
+        keys.append(int(key))
+        return True
+
+    def remove(self, user_id, key: int) -> bool:
+        """모르는 행이면 False (뷰를 버리고 다시 만든다)"""
+        keys = self.keys.get(int(user_id)) if user_id is not None else None
+        if not keys or int(key) not in keys:
+            return False
+        keys.remove(int(key))
+        return True
+
+    def __sizeof__(self) -> int:
+        # 캐시 메모리 상한 계산용 대략값 (사전 + 키 목록)
+        return sys.getsizeof(self.keys) + sum(56 + 8 * len(keys) for keys in self.keys.values())
+
+def _build_user_rows(table: str, df: pd.DataFrame) -> UserRows:
+    return UserRows(df["user_id"].to_numpy(dtype="int64"), df[TABLES[table]["key"]].to_numpy(dtype="int64"))
+
+def _update_user_rows(table: str, version, update) -> None:
+    """행을 추가/삭제한 뒤 user_id 색인을 다시 만들지 않고 그 행만 반영 (_update_hot_ranking처럼 write_lock 안에서)"""
+    table_cache.advance_derived(table, version, get_storage().version(table), "by_user", update)
+
+def _user_keys(table: str, user_id: int) -> list:
+    """user_id가 쓴 행의 기본키 (오름차순) - 백엔드 인덱스, 없으면 캐시된 보조 색인"""
+    keys = get_storage().keys_by_user(table, user_id)
+    if keys is None:
+        keys = get_table_view(table, "by_user", lambda df: _build_user_rows(table, df)).get(user_id)
+    return keys
+
+def _fetch_rows(table: str, keys: list) -> pd.DataFrame:
+    """기본키 목록 순서대로 행 - 백엔드가 바로 읽을 수 있으면 그 행만 읽는다"""
+    df = get_storage().rows(table, keys)
+    if df is None:
+        return _rows_by_id(table, keys)
+    return _apply_schema(table, df)
+
+def get_user_activity_counts(user_id: int) -> dict:
+    """사용자의 게시글/여행메이트/좋아요 한 글 수 (색인 길이만 본다)"""
+    get_posts()  # 최초 실행 시 기본 데이터 생성
+    get_tms()
+    return {
+        "posts": len(_user_keys("posts", user_id)),
+        "travel_mates": len(_user_keys("travel_mates", user_id)),
+        "liked": len(get_liked_post_ids(user_id)),
+    }
+
+def get_user_posts(user_id: int, limit: int = None) -> pd.DataFrame:
+    """사용자가 쓴 게시글 (최신 글부터 limit개)"""
+    get_posts()  # 최초 실행 시 기본 데이터 생성
+    keys = _user_keys("posts", user_id)[::-1]
+    return _fetch_rows("posts", keys[:limit])
+
+def get_user_travel_mates(user_id: int, limit: int = None) -> pd.DataFrame:
+    """사용자가 올린 여행메이트 모집글 (최신 글부터 limit개)"""
+    get_tms()  # 최초 실행 시 기본 데이터 생성
+    keys = _user_keys("travel_mates", user_id)[::-1]
+    return _fetch_rows("travel_mates", keys[:limit])
+
+def get_user_liked_posts(user_id: int, limit: int = None) -> pd.DataFrame:
+    """사용자가 좋아요 한 게시글 (좋아요 색인에서, 최신 글부터 limit개)"""
+    get_posts()  # 최초 실행 시 기본 데이터 생성
+    keys = sorted(get_liked_post_ids(user_id), reverse=True)
+    return _fetch_rows("posts", keys[:limit])
+
 # =============================================================================
 # 기존 호환성을 위한 함수 (deprecated)
 # =============================================================================
@@ -365,9 +1037,14 @@ def inc_like(post_id: int) -> bool:
     단순히 좋아요 수만 증가 (사용자 추적 없음)
     """
     try:
-        posts_df = get_posts()
-        posts_df.loc[posts_df["post_id"] == post_id, "likes"] += 1
-        posts_df.to_csv(POSTS_FILE, index=False)
+        storage = get_storage()
+        with storage.write_lock("posts"):
+            version = storage.version("posts")
+            likes = storage.increment("posts", post_id, "likes", 1)
+            if likes is not None:
+                _update_hot_ranking(version, lambda ranking: ranking.set_counts(post_id, likes=likes))
+        if likes is not None:
+            _record_stats(("likes", 1, datetime.now()))
         return True
     except Exception as e:
         print(f"좋아요 증가 오류: {e}")
@@ -386,27 +1063,57 @@ def initialize_data():
     print("데이터 초기화 완료!")
 
 def get_user_statistics() -> dict:
-    """사용자 통계 반환"""
+    """사용자 통계 반환 (쓰기 경로가 유지하는 카운터에서 읽는다)"""
     try:
-        users_df = get_users()
-        posts_df = get_posts()
-        tms_df = get_tms()
-        user_likes = get_user_likes()
-        
+        totals, _ = stats.community.read(1, _compute_stats)
         return {
-            "total_users": len(users_df),
-            "total_posts": len(posts_df),
-            "total_travel_mates": len(tms_df),
-            "total_likes": posts_df["likes"].sum(),
-            "total_reposts": posts_df["reposts"].sum(),
-            "active_likers": len(user_likes)
+            "total_users": totals["users"],
+            "total_posts": totals["posts"],
+            "total_travel_mates": totals["travel_mates"],
+            "total_likes": totals["likes"],
+            "total_reposts": totals["reposts"],
+            "active_likers": totals["active_likers"]
         }
     except Exception as e:
         print(f"통계 조회 오류: {e}")
         return {}
 
+# =============================================================================
+# 커뮤니티 통계 (누적 카운터 + 일별 집계)
+# =============================================================================
+
+# 관리자 통계 화면의 기본 기간 (일)
+STATS_DAYS = int(os.environ.get("COMMUNITY_STATS_DAYS", 30))
+
+def _compute_stats() -> dict:
+    """통계를 처음 만들 때만 - 테이블 전체를 한 번 읽는다"""
+    user_likes = get_user_likes()
+    pairs = [(user_id, post_id) for user_id, post_ids in user_likes.items() for post_id in post_ids]
+    return stats.compute([get_users()], [get_posts()], [get_tms()], [pairs])
+
+def _record_stats(*events) -> None:
+    """쓰기가 끝난 뒤 통계 카운터 갱신 (실패해도 쓰기는 성공으로 둔다)"""
+    try:
+        stats.community.record(events, _compute_stats)
+    except Exception as e:
+        print(f"통계 갱신 오류: {e}")
+
+def get_community_stats(days: int = STATS_DAYS) -> tuple:
+    """
+    (합계 {이름: 값}, 최근 days일 일별 집계 DataFrame) - 관리자 통계 화면용
+
+    테이블을 읽지 않으므로 데이터 크기와 상관없이 days에만 비례한다.
+    """
+    try:
+        return stats.community.read(days, _compute_stats)
+    except Exception as e:
+        print(f"통계 조회 오류: {e}")
+        return {}, pd.DataFrame()
+
+# COMMUNITY_METRICS가 켜져 있으면 공개 함수 호출 시간을 기록
+metrics.instrument(globals(), "data")
+
 if __name__ == "__main__":
-    # 테스트 실행
-    initialize_data()
-    print("데이터 파일이 생성되었습니다.")
-    print(f"통계: {get_user_statistics()}")
\ No newline at end of file
+    # 유지보수 명령은 src/maintenance.py가 맡는다 (인자가 없으면 예전처럼 기본 데이터 생성)
+    from .maintenance import main
+    sys.exit(main(sys.argv[1:] or ["init"]))
@@ -0,0 +1,301 @@
+"""
+게시글 첨부 이미지 (내용 주소 저장 + 작은 크기 변형 캐시)
+
+원본은 SHA-256 이름으로 data/images/<앞 두 글자>/<해시>에 한 번만 저장한다
+(같은 사진을 여러 번 올려도 한 벌). 업로드할 때 작업자 풀에서 썸네일과 피드
+크기 변형을 만들어 data/image_cache/에 두고, 화면은 변형만 가리킨다.
+변형 캐시는 크기 상한을 넘으면 가장 오래 안 쓴 파일부터 지우고, 지워진 변형은
+다음에 필요할 때 원본에서 다시 만든다.
+"""
+import hashlib
+import io
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from . import metrics
+from .storage import DATA_DIR, file_lock
+
+IMAGES_DIR = os.path.join(DATA_DIR, "images")
+IMAGE_CACHE_DIR = os.path.join(DATA_DIR, "image_cache")
+
+# 변형 이름 → 긴 변의 최대 픽셀
+VARIANTS = {"thumb": 240, "feed": 960}
+
+# 변형 캐시 크기 상한 (MB) - 넘으면 오래 안 쓴 변형부터 지워 90%까지 줄인다
+IMAGE_CACHE_MB = float(os.environ.get("COMMUNITY_IMAGE_CACHE_MB", 256))
+
+# 변형을 만드는 작업자 수 (Pillow는 크기 조정 중 GIL을 놓으므로 스레드로 충분)
+IMAGE_WORKERS = int(os.environ.get("COMMUNITY_IMAGE_WORKERS", min(4, os.cpu_count() or 1)))
+
+# 업로드 한 장의 최대 크기 (MB)와 게시글 하나의 최대 장수
+IMAGE_MAX_MB = float(os.environ.get("COMMUNITY_IMAGE_MAX_MB", 10))
+MAX_IMAGES_PER_POST = int(os.environ.get("COMMUNITY_MAX_IMAGES_PER_POST", 4))
+
+# 받는 원본 형식 (Pillow 형식 이름)
+FORMATS = ("JPEG", "PNG", "WEBP", "GIF")
+
+# 변형 접근 시각(mtime)을 다시 기록하는 최소 간격 (초) - 화면마다 utime을 부르지 않게
+TOUCH_SECONDS = 60
+
+# 압축 폭탄 방지 (픽셀 수 상한)
+MAX_IMAGE_PIXELS = 50_000_000
+
+# 이보다 최근에 저장/재사용된 원본은 참조가 없어도 지우지 않는다 (초) -
+# store_images와 add_post 사이에 compact가 돌아도 올리는 중인 사진을 지우지 않게
+PRUNE_GRACE_SECONDS = int(os.environ.get("COMMUNITY_IMAGE_PRUNE_GRACE_SECONDS", 3600))
+
+
+class ImageError(ValueError):
+    """이미지로 읽을 수 없거나 허용 범위를 넘음 (화면에 그대로 보여줄 메시지)"""
+
+
+def _write_file(path: str, data: bytes) -> None:
+    """임시 파일에 쓰고 fsync 후 교체 (읽는 쪽은 반쯤 쓴 이미지를 보지 않는다)"""
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    metrics.count_io("written", len(data))
+
+
+def _pil():
+    """Pillow는 이미지를 처음 다룰 때 불러온다 (src.ui를 가져오는 시작 경로에서 빠지게)"""
+    try:
+        from PIL import Image, ImageOps
+    except ImportError as e:
+        # 업로드 화면이 ImageError로 안내할 수 있게 (Pillow는 선택 의존성)
+        raise ImageError("이미지를 처리하려면 Pillow가 필요합니다 (pip install Pillow).") from e
+
+    Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
+    return Image, ImageOps
+
+
+def original_path(digest: str) -> str:
+    return os.path.join(IMAGES_DIR, digest[:2], digest)
+
+
+def variant_file(digest: str, variant: str) -> str:
+    return os.path.join(IMAGE_CACHE_DIR, f"{digest}_{variant}.jpg")
+
+
+# =============================================================================
+# 원본 저장
+# =============================================================================
+
+def _check(data: bytes) -> None:
+    if len(data) > IMAGE_MAX_MB * 1024 * 1024:
+        raise ImageError(f"이미지는 한 장에 {IMAGE_MAX_MB:g}MB까지 올릴 수 있습니다.")
+    Image, _ = _pil()
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            if image.format not in FORMATS:
+                raise ImageError(f"지원하지 않는 이미지 형식입니다 ({image.format}).")
+            image.verify()
+    except (Image.DecompressionBombError, OSError, SyntaxError) as e:
+        raise ImageError(f"이미지 파일을 읽을 수 없습니다: {e}") from e
+
+
+def store_original(data: bytes) -> str:
+    """검사한 원본을 내용 해시 이름으로 저장하고 해시 반환 (이미 있으면 쓰지 않는다)"""
+    _check(data)
+    digest = hashlib.sha256(data).hexdigest()
+    path = original_path(digest)
+    try:
+        # 이미 있으면 쓰지 않고 mtime만 새로 - compact가 곧 다시 참조될 원본을 지우지 않게
+        os.utime(path)
+    except FileNotFoundError:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 잠금 없이 쓴다 - 같은 이름이면 내용도 같으므로 누가 교체해도 결과가 같다
+        _write_file(path, data)
+    return digest
+
+
+# =============================================================================
+# 변형 (썸네일 / 피드 크기)
+# =============================================================================
+
+def _render(digest: str, variant: str) -> bytes:
+    """원본 → 긴 변이 VARIANTS[variant] 이하인 JPEG"""
+    path = original_path(digest)
+    metrics.count_file_read(path)
+    Image, ImageOps = _pil()
+    with Image.open(path) as image:
+        image = ImageOps.exif_transpose(image)  # 휴대폰 사진의 회전 정보 반영
+        image.thumbnail((VARIANTS[variant], VARIANTS[variant]))
+        if image.mode != "RGB":
+            # 투명 배경은 흰색으로
+            background = Image.new("RGB", image.size, "white")
+            rgba = image.convert("RGBA")
+            background.paste(rgba, mask=rgba.getchannel("A"))
+            image = background
+        out = io.BytesIO()
+        image.save(out, "JPEG", quality=82, optimize=True, progressive=True)
+    return out.getvalue()
+
+
+class VariantCache:
+    """
+    크기 상한이 있는 변형 파일 캐시 (LRU - 파일 mtime이 마지막 사용 시각)
+
+    전체 크기는 처음 한 번 디렉토리를 훑어 알아 두고 이후에는 쓸 때마다 더한다.
+    상한을 넘을 때만 다시 훑어서 오래된 것부터 지우므로 여러 프로세스가 함께
+    써도 그때 실제 크기로 맞춰진다.
+    """
+
+    def __init__(self, root: str = IMAGE_CACHE_DIR, max_bytes: int = int(IMAGE_CACHE_MB * 1024 * 1024)):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._bytes = None
+
+    def _entries(self) -> list:
+        """[(mtime, size, path), ...] - 오래된 순"""
+        entries = []
+        with os.scandir(self.root) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(".jpg"):
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+        return sorted(entries)
+
+    def _added(self, nbytes: int) -> None:
+        with self._lock:
+            if self._bytes is None:
+                self._bytes = sum(size for _, size, _ in self._entries())
+            else:
+                self._bytes += nbytes
+            if self._bytes <= self.max_bytes:
+                return
+        self.evict()
+
+    def evict(self) -> int:
+        """상한의 90%가 될 때까지 오래 안 쓴 변형을 지우고 지운 파일 수 반환"""
+        with file_lock(self.root), self._lock:
+            entries = self._entries()
+            total = sum(size for _, size, _ in entries)
+            removed = 0
+            for _, size, path in entries:
+                if total <= self.max_bytes * 0.9:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                removed += 1
+            self._bytes = total
+        if removed and metrics.ENABLED:
+            metrics.registry.inc("image_cache_evictions_total", removed)
+        return removed
+
+    def path(self, digest: str, variant: str):
+        """변형 파일 경로 - 없으면 원본에서 만들고, 원본도 없으면 None"""
+        path = variant_file(digest, variant)
+        try:
+            mtime = os.stat(path).st_mtime
+        except FileNotFoundError:
+            return self.build(digest, variant)
+        if time.time() - mtime > TOUCH_SECONDS:
+            try:
+                os.utime(path)  # 최근 사용으로 표시
+            except FileNotFoundError:
+                return self.build(digest, variant)
+        return path
+
+    def build(self, digest: str, variant: str):
+        if not os.path.exists(original_path(digest)):
+            return None
+        data = _render(digest, variant)
+        path = variant_file(digest, variant)
+        os.makedirs(self.root, exist_ok=True)
+        # 원본과 마찬가지로 잠금 없이 쓴다 (두 프로세스가 같은 변형을 만들어도 내용이 같다)
+        _write_file(path, data)
+        self._added(len(data))
+        return path
+
+
+cache = VariantCache()
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _workers() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(IMAGE_WORKERS, thread_name_prefix="community-images")
+        return _pool
+
+
+# =============================================================================
+# 공개 함수
+# =============================================================================
+
+def store_images(blobs: list) -> list:
+    """
+    업로드된 이미지들을 저장하고 원본 해시 목록 반환 (게시글 작성 전에 호출)
+
+    모든 변형을 작업자 풀에서 한 번에 만들고 끝날 때까지 기다리므로, 게시글이
+    피드에 처음 보일 때 이미 작은 변형이 있다. 하나라도 이미지가 아니면
+    ImageError (그때까지 저장한 원본은 같은 사진을 다시 올리면 그대로 쓰인다).
+    """
+    if len(blobs) > MAX_IMAGES_PER_POST:
+        raise ImageError(f"이미지는 게시글 하나에 {MAX_IMAGES_PER_POST}장까지 올릴 수 있습니다.")
+    digests = [store_original(data) for data in blobs]
+    with metrics.span("call_seconds", "images.variants"):
+        jobs = [_workers().submit(cache.build, digest, variant)
+                for digest in dict.fromkeys(digests) for variant in VARIANTS]
+        for job in jobs:
+            job.result()
+    return digests
+
+
+def image_path(digest: str, variant: str = "feed"):
+    """화면에 보여줄 변형 파일 경로 (없으면 None)"""
+    try:
+        return cache.path(digest, variant)
+    except (OSError, ImageError) as e:
+        print(f"이미지 변형 오류: {e}")
+        return None
+
+
+def prune_originals(referenced: set) -> int:
+    """
+    post_images가 가리키지 않는 원본과 그 변형을 지우고 지운 원본 수 반환 (유지보수 compact)
+
+    PRUNE_GRACE_SECONDS 안에 저장/재사용된 원본은 남긴다 - 업로드는 끝났지만 아직
+    add_post가 post_images에 쓰지 않은 사진일 수 있다.
+    """
+    removed = 0
+    cutoff = time.time() - PRUNE_GRACE_SECONDS
+    if not os.path.isdir(IMAGES_DIR):
+        return 0
+    for prefix in os.listdir(IMAGES_DIR):
+        folder = os.path.join(IMAGES_DIR, prefix)
+        if not os.path.isdir(folder):
+            continue
+        for name in os.listdir(folder):
+            path = os.path.join(folder, name)
+            if len(name) != 64 or name in referenced:
+                continue
+            try:
+                if os.stat(path).st_mtime > cutoff:
+                    continue
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            for variant in VARIANTS:
+                if os.path.exists(variant_file(name, variant)):
+                    os.remove(variant_file(name, variant))
+            removed += 1
+    return removed
@@ -0,0 +1,73 @@
+class IntervalTree:
+    """
+    구간 트리 (centered interval tree)
+
+    [start, end] 닫힌 구간들을 담고, 주어진 기간과 겹치는 구간을
+    O(log n + k)에 찾는다. 만든 뒤에는 바뀌지 않으며, 원본이 바뀌면
+    새로 만든다.
+    """
+
+    __slots__ = ("center", "by_start", "by_end", "left", "right")
+
+    def __init__(self, intervals: list):
+        """intervals: [(start, end, value), ...] - start <= end 인 정수 구간"""
+        self.center = None
+        self.by_start = []
+        self.by_end = []
+        self.left = None
+        self.right = None
+        if not intervals:
+            return
+
+        points = sorted(p for start, end, _ in intervals for p in (start, end))
+        self.center = points[len(points) // 2]
+        here, left, right = [], [], []
+        for interval in intervals:
+            if interval[1] < self.center:
+                left.append(interval)
+            elif interval[0] > self.center:
+                right.append(interval)
+            else:
+                here.append(interval)
+
+        # 중심점을 지나는 구간: 시작 오름차순 / 끝 내림차순 두 벌
+        self.by_start = sorted(here, key=lambda i: i[0])
+        self.by_end = sorted(here, key=lambda i: i[1], reverse=True)
+        self.left = IntervalTree(left) if left else None
+        self.right = IntervalTree(right) if right else None
+
+    def overlapping(self, lo: int, hi: int) -> list:
+        """[lo, hi]와 하루라도 겹치는 구간의 value 목록"""
+        found = []
+        node_stack = [self]
+        while node_stack:
+            node = node_stack.pop()
+            if node is None or node.center is None:
+                continue
+            if hi < node.center:
+                # 중심 구간 중 hi 이전에 시작한 것만 겹친다
+                for start, _, value in node.by_start:
+                    if start > hi:
+                        break
+                    found.append(value)
+                node_stack.append(node.left)
+            elif lo > node.center:
+                # 중심 구간 중 lo 이후에 끝나는 것만 겹친다
+                for _, end, value in node.by_end:
+                    if end < lo:
+                        break
+                    found.append(value)
+                node_stack.append(node.right)
+            else:
+                found.extend(value for _, _, value in node.by_start)
+                node_stack.append(node.left)
+                node_stack.append(node.right)
+        return found
+
+    def __len__(self) -> int:
+        size = len(self.by_start)
+        if self.left is not None:
+            size += len(self.left)
+        if self.right is not None:
+            size += len(self.right)
+        return size
@@ -0,0 +1,453 @@
+"""
+데이터 디렉토리 유지보수 도구 (앱을 내린 상태에서 실행)
+
+    python -m src.maintenance migrate --from csv --to sqlite
+    python -m src.maintenance compact
+    python -m src.maintenance reindex
+    python -m src.maintenance verify
+    python -m src.maintenance import users members.csv --dry-run
+    python -m src.maintenance export posts posts.jsonl
+
+테이블은 --chunk-size행씩 나눠 읽고 쓰므로 데이터가 커져도 한 조각만 메모리에
+올린다. 진행 상황은 표준 오류로, 결과 요약은 표준 출력으로 낸다.
+import/export는 다른 쓰기와 같은 잠금을 거치므로 앱이 떠 있어도 된다.
+예외: user_likes.json은 JSON 문서 하나라 csv/log 백엔드에서는 통째로 읽고,
+log 백엔드의 로그는 재생한 상태로 스냅샷을 쓰므로 압축할 때 테이블이 메모리에 올라온다.
+"""
+import argparse
+import itertools
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+from . import images, search, stats
+from .storage import (COUNTER_COLUMNS, LOG_TABLES, SCAN_CHUNK_ROWS, SQLITE_FILE, STORAGE_BACKEND,
+                      TABLES, _counter_path, _log_path, copy_tables, open_storage)
+
+BACKENDS = ("csv", "sqlite", "log")
+
+# 검사 항목마다 보여줄 예시 수
+EXAMPLES = 5
+
+
+class Progress:
+    """조각 하나를 처리할 때마다 표준 오류에 누적 행 수와 처리 속도를 한 줄씩"""
+
+    def __init__(self, stream=None, quiet: bool = False):
+        self.stream = stream or sys.stderr
+        self.quiet = quiet
+        self.rows = {}
+        self.seconds = {}
+        self._last = time.monotonic()
+
+    def step(self, message: str) -> None:
+        """새 단계 시작 (누적 행 수를 새로 센다)"""
+        self.rows, self.seconds = {}, {}
+        self._last = time.monotonic()
+        if not self.quiet:
+            print(message, file=self.stream, flush=True)
+
+    def __call__(self, label: str, rows: int) -> None:
+        now = time.monotonic()
+        self.rows[label] = self.rows.get(label, 0) + rows
+        self.seconds[label] = self.seconds.get(label, 0.0) + (now - self._last)
+        self._last = now
+        if not self.quiet:
+            rate = self.rows[label] / max(self.seconds[label], 1e-9)
+            print(f"  {label}: {self.rows[label]:,}행 ({rate:,.0f}행/초)", file=self.stream, flush=True)
+
+    def wrap(self, label: str, chunks):
+        """조각을 그대로 흘려보내면서 진행 상황을 센다"""
+        for chunk in chunks:
+            yield chunk
+            self(label, len(chunk))
+
+
+class Problems:
+    """검사 항목별 문제 건수와 앞쪽 예시 몇 개"""
+
+    def __init__(self):
+        self.found = {}
+
+    def add(self, check: str, examples) -> None:
+        examples = list(examples)
+        if not examples:
+            return
+        entry = self.found.setdefault(check, [0, []])
+        entry[0] += len(examples)
+        entry[1].extend(examples[:EXAMPLES - len(entry[1])])
+
+    def __bool__(self) -> bool:
+        return bool(self.found)
+
+
+def _ints(values: pd.Series) -> np.ndarray:
+    """ID/카운트 컬럼 → int64 배열 (숫자가 아니면 -1)"""
+    return pd.to_numeric(values, errors="coerce").fillna(-1).to_numpy(dtype="int64")
+
+
+def _duplicates(values: np.ndarray) -> np.ndarray:
+    ordered = np.sort(values)
+    return np.unique(ordered[1:][ordered[1:] == ordered[:-1]])
+
+
+def _remove(paths) -> None:
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _fold_counters(storage, chunk_size: int, progress: Progress) -> None:
+    """카운터 스트림이 남은 테이블을 스트림 값을 합쳐 다시 쓴다 (csv 백엔드)"""
+    for table in COUNTER_COLUMNS:
+        path = _counter_path(table)
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            progress.step(f"{table}: 카운터 스트림 반영 ({os.path.getsize(path):,}바이트)")
+            storage.replace(table, progress.wrap(table, storage.scan(table, chunk_size)))
+
+
+# =============================================================================
+# 명령
+# =============================================================================
+
+def migrate(source: str, target: str, chunk_size: int, force: bool, progress: Progress) -> int:
+    """
+    source 백엔드의 데이터를 target 백엔드 형식으로 옮긴다
+
+    csv와 log는 같은 CSV 스냅샷을 쓰므로, 둘 사이의 이전은 카운터 스트림이나
+    로그를 스냅샷에 반영하고 다른 쪽이 남긴 부속 파일을 치우는 것으로 끝난다.
+    """
+    if source == target:
+        print(f"이미 {target} 형식입니다.", file=sys.stderr)
+        return 2
+    if source == "sqlite" and not os.path.exists(SQLITE_FILE):
+        print(f"{SQLITE_FILE}이 없습니다.", file=sys.stderr)
+        return 2
+    if target == "sqlite" and os.path.exists(SQLITE_FILE):
+        if not force:
+            print(f"{SQLITE_FILE}이 이미 있습니다 (덮어쓰려면 --force).", file=sys.stderr)
+            return 2
+        _remove([SQLITE_FILE, f"{SQLITE_FILE}-wal", f"{SQLITE_FILE}-shm"])
+
+    if source == "log":
+        # 로그를 스냅샷에 반영 - 카운터 스트림은 csv 백엔드 시절에 남은 것이라 버린다
+        log_storage = open_storage("log")
+        for table in LOG_TABLES:
+            progress.step(f"{table}: 로그 압축")
+            log_storage.compact(table)
+        _remove(_counter_path(table) for table in COUNTER_COLUMNS)
+    elif source == "csv":
+        # 카운터 스트림을 반영 - 로그는 log 백엔드 시절에 남은 것이라 버린다
+        _fold_counters(open_storage("csv"), chunk_size, progress)
+        _remove(_log_path(table) for table in LOG_TABLES)
+
+    if target != "sqlite" and source != "sqlite":
+        print(f"{source} → {target}: CSV 스냅샷이 최신 상태가 되었습니다.")
+        return 0
+
+    if target == "sqlite":
+        src, dst = open_storage("csv"), open_storage("sqlite", import_csv=False)
+    else:
+        src, dst = open_storage("sqlite"), open_storage(target)
+    progress.step(f"{source} → {target}: 테이블 복사 ({chunk_size:,}행씩)")
+    counts = copy_tables(src, dst, chunk_size, progress)
+    if target != "sqlite":
+        # 이제 CSV 스냅샷이 전부 - 예전 카운터 스트림/로그가 덮어쓰지 않게 치운다
+        _remove(_counter_path(table) for table in COUNTER_COLUMNS)
+        _remove(_log_path(table) for table in LOG_TABLES)
+    print(f"{source} → {target}: " + ", ".join(f"{name} {rows:,}" for name, rows in counts.items()))
+    return 0
+
+
+def compact(backend: str, chunk_size: int, progress: Progress) -> int:
+    """백엔드와 검색 색인이 쌓아 두는 변경분을 본 파일에 반영하고 참조 없는 이미지 원본을 지운다"""
+    storage = open_storage(backend)
+    if backend == "log":
+        for table in LOG_TABLES:
+            path = _log_path(table)
+            before = os.path.getsize(path) if os.path.exists(path) else 0
+            progress.step(f"{table}: 로그 압축 ({before:,}바이트)")
+            storage.compact(table)
+    elif backend == "csv":
+        _fold_counters(storage, chunk_size, progress)
+    else:
+        before = sum(os.path.getsize(p) for p in (SQLITE_FILE, f"{SQLITE_FILE}-wal") if os.path.exists(p))
+        progress.step(f"{SQLITE_FILE}: 체크포인트 + VACUUM ({before:,}바이트)")
+        storage.vacuum()
+        print(f"{SQLITE_FILE}: {before:,} → {os.path.getsize(SQLITE_FILE):,}바이트")
+
+    for table in search.SEARCH_FIELDS:
+        progress.step(f"search_{table}: 검색 색인 변경 로그 반영")
+        folded = search.compact_index(table)
+        if folded is not None:
+            print(f"search_{table}: 변경 {folded:,}건을 스냅샷에 합침")
+
+    if os.path.isdir(images.IMAGES_DIR):
+        # 삭제된 게시글만 가리키던 이미지 원본 (같은 사진을 쓰는 다른 게시글이 있으면 남긴다)
+        progress.step("images: 참조 없는 원본 정리")
+        referenced = set()
+        for chunk in progress.wrap("post_images", storage.scan("post_images", chunk_size)):
+            referenced.update(chunk["image"])
+        print(f"images: 원본 {images.prune_originals(referenced):,}개 삭제")
+    print(f"{backend}: 압축 완료")
+    return 0
+
+
+def reindex(backend: str, chunk_size: int, progress: Progress) -> int:
+    """파생 색인 (검색 n-gram, 게시글↔태그 매핑, 좋아요 색인, 통계 카운터)을 테이블에서 다시 만든다"""
+    from .data import build_post_tags
+
+    storage = open_storage(backend)
+    for table in search.SEARCH_FIELDS:
+        progress.step(f"{table}: 검색 색인")
+        index = search.rebuild_index_chunks(table, progress.wrap(table, storage.scan(table, chunk_size)))
+        print(f"search_{table}: 문서 {len(index.docs):,}개, n-gram {len(index.postings):,}개")
+
+    chunks = storage.scan("posts", chunk_size)
+    first = next(chunks, None)
+    if first is not None:  # 게시글 테이블이 아직 없으면 매핑도 처음 읽을 때 만든다
+        progress.step("post_tags: 게시글 태그 컬럼에서 다시 만들기")
+        chunks = progress.wrap("posts", itertools.chain([first], chunks))
+        rows = storage.replace("post_tags", (build_post_tags(chunk) for chunk in chunks))
+        print(f"post_tags: {rows:,}행")
+
+    progress.step("likes: 좋아요 색인")
+    if backend == "sqlite":
+        # 좋아요는 테이블 자체가 원본이라 인덱스만 다시 만든다 (다른 인덱스도 함께)
+        storage.rebuild_indexes()
+        print("likes: SQLite 인덱스 재구성")
+    else:
+        pairs = storage.replace_likes(progress.wrap("likes", storage.scan_likes(chunk_size)))
+        print(f"likes: {pairs:,}쌍")
+
+    progress.step("stats: 통계 카운터와 일별 집계")
+    values = stats.compute(*(progress.wrap(table, storage.scan(table, chunk_size))
+                             for table in ("users", "posts", "travel_mates")),
+                           progress.wrap("likes", storage.scan_likes(chunk_size)))
+    stats.community.replace(values)
+    print("stats: " + ", ".join(f"{name} {values[name][stats.TOTAL]:,}" for name in stats.TOTALS))
+    return 0
+
+
+def verify(backend: str, chunk_size: int, progress: Progress) -> int:
+    """
+    테이블 사이 참조 무결성 검사 - 문제가 있으면 1을 반환
+
+    조각마다 ID 배열만 남기므로 메모리는 행 수 × 8바이트 정도만 쓴다.
+    """
+    storage = open_storage(backend)
+    problems = Problems()
+    scanned = {}
+
+    progress.step("users")
+    user_ids, usernames, emails = [], set(), set()
+    for chunk in progress.wrap("users", storage.scan("users", chunk_size)):
+        user_ids.append(_ints(chunk["user_id"]))
+        for name in chunk["username"]:
+            if name in usernames:
+                problems.add("users.username 중복", [name])
+            usernames.add(name)
+        for email in chunk["email"].dropna():
+            if email and email in emails:
+                problems.add("users.email 중복", [email])
+            emails.add(email)
+    users = np.concatenate(user_ids) if user_ids else np.zeros(0, dtype="int64")
+    problems.add("users.user_id 중복", _duplicates(users).tolist())
+    scanned["users"] = len(users)
+    users = np.unique(users)
+    del usernames, emails
+
+    progress.step("posts")
+    post_ids, post_likes = [], []
+    for chunk in progress.wrap("posts", storage.scan("posts", chunk_size)):
+        ids, authors = _ints(chunk["post_id"]), _ints(chunk["user_id"])
+        likes, reposts = _ints(chunk["likes"]), _ints(chunk["reposts"])
+        missing = ~np.isin(authors, users)
+        problems.add("posts.user_id → users 없음",
+                     [f"post {p}: user {u}" for p, u in zip(ids[missing], authors[missing])])
+        negative = (likes < 0) | (reposts < 0)
+        problems.add("posts 좋아요/리포스트 수가 음수 또는 빈 값", ids[negative].tolist())
+        post_ids.append(ids)
+        post_likes.append(likes)
+    posts = np.concatenate(post_ids) if post_ids else np.zeros(0, dtype="int64")
+    likes_column = np.concatenate(post_likes) if post_likes else np.zeros(0, dtype="int64")
+    problems.add("posts.post_id 중복", _duplicates(posts).tolist())
+    scanned["posts"] = len(posts)
+    order = np.argsort(posts, kind="stable")
+    posts, likes_column = posts[order], likes_column[order]
+
+    progress.step("travel_mates")
+    count = 0
+    for chunk in progress.wrap("travel_mates", storage.scan("travel_mates", chunk_size)):
+        ids, authors = _ints(chunk["mate_id"]), _ints(chunk["user_id"])
+        missing = ~np.isin(authors, users)
+        problems.add("travel_mates.user_id → users 없음",
+                     [f"mate {m}: user {u}" for m, u in zip(ids[missing], authors[missing])])
+        count += len(chunk)
+    scanned["travel_mates"] = count
+
+    progress.step("post_tags")
+    count = 0
+    for chunk in progress.wrap("post_tags", storage.scan("post_tags", chunk_size)):
+        ids = _ints(chunk["post_id"])
+        missing = ~np.isin(ids, posts)
+        problems.add("post_tags.post_id → posts 없음",
+                     [f"post {p}: {t}" for p, t in zip(ids[missing], chunk["tag"][missing])])
+        count += len(chunk)
+    scanned["post_tags"] = count
+
+    progress.step("post_images")
+    count = 0
+    for chunk in progress.wrap("post_images", storage.scan("post_images", chunk_size)):
+        ids = _ints(chunk["post_id"])
+        missing = ~np.isin(ids, posts)
+        problems.add("post_images.post_id → posts 없음",
+                     [f"post {p}: {h[:12]}" for p, h in zip(ids[missing], chunk["image"][missing])])
+        problems.add("post_images.image → 원본 파일 없음",
+                     [f"post {p}: {h[:12]}" for p, h in zip(ids, chunk["image"])
+                      if not os.path.exists(images.original_path(h))])
+        count += len(chunk)
+    scanned["post_images"] = count
+
+    progress.step("likes")
+    liked, liker_ids = [], []
+    for pairs in progress.wrap("likes", storage.scan_likes(chunk_size)):
+        pairs = np.asarray(pairs, dtype="int64").reshape(-1, 2)
+        likers, targets = pairs[:, 0], pairs[:, 1]
+        missing = ~np.isin(likers, users)
+        problems.add("likes.user_id → users 없음",
+                     [f"user {u}: post {p}" for u, p in zip(likers[missing], targets[missing])])
+        missing = ~np.isin(targets, posts)
+        problems.add("likes.post_id → posts 없음",
+                     [f"user {u}: post {p}" for u, p in zip(likers[missing], targets[missing])])
+        liked.append(targets[~missing])
+        liker_ids.append(likers)
+    liked = np.concatenate(liked) if liked else np.zeros(0, dtype="int64")
+    scanned["likes"] = len(liked)
+    # 좋아요 수에는 로그인 없이 누른 좋아요도 들어가므로 좋아요 한 사용자 수보다 작을 수만 없다
+    liked_posts, likers_count = np.unique(liked, return_counts=True)
+    positions = np.searchsorted(posts, liked_posts)
+    short = likes_column[positions] < likers_count
+    problems.add("posts.likes < 좋아요 한 사용자 수",
+                 [f"post {p}: {n} < {c}" for p, n, c in
+                  zip(liked_posts[short], likes_column[positions][short], likers_count[short])])
+
+    if os.path.exists(stats.STATS_FILE):
+        # 쓰기 경로가 유지하는 통계 카운터가 테이블과 맞는지 (다르면 reindex로 다시 계산)
+        totals, _ = stats.community.read(1, rebuild=None)
+        actual = {
+            "users": scanned["users"],
+            "posts": scanned["posts"],
+            "travel_mates": scanned["travel_mates"],
+            "likes": int(likes_column.sum()),
+            "active_likers": len(np.unique(np.concatenate(liker_ids))) if liker_ids else 0,
+        }
+        problems.add("통계 카운터 ≠ 테이블",
+                     [f"{name}: {totals[name]} ≠ {count}" for name, count in actual.items()
+                      if totals[name] != count])
+
+    print("검사한 행: " + ", ".join(f"{name} {rows:,}" for name, rows in scanned.items()))
+    if not problems:
+        print("문제 없음")
+        return 0
+    for check, (count, examples) in problems.found.items():
+        print(f"✗ {check}: {count:,}건 (예: {', '.join(map(str, examples))})")
+    return 1
+
+
+def import_(table: str, path: str, fmt: str, chunk_size: int, dry_run: bool,
+            progress: Progress) -> int:
+    """CSV/JSON Lines 파일을 검증·중복 제거해서 한 번에 추가 (src/bulk.py)"""
+    from .bulk import import_file
+
+    progress.step(f"{path} → {table}" + (" (쓰지 않고 검사만)" if dry_run else ""))
+    report = import_file(table, path, fmt, chunk_size, dry_run, progress)
+    print(report.summary())
+    return 1 if report.failed else 0
+
+
+def export(table: str, path: str, fmt: str, backend: str, chunk_size: int, progress: Progress) -> int:
+    """테이블을 조각 단위로 CSV/JSON Lines 파일에 내보내기 (src/bulk.py)"""
+    from .bulk import export_table
+
+    progress.step(f"{table} → {path}")
+    rows = export_table(table, path, fmt, chunk_size, open_storage(backend), progress)
+    progress.step(f"{table}: {rows:,}행")
+    return 0
+
+
+def init() -> int:
+    """기본 데이터 생성 후 통계 출력 (python -m src.data의 예전 동작)"""
+    from . import data
+
+    data.initialize_data()
+    print("데이터 파일이 생성되었습니다.")
+    print(f"통계: {data.get_user_statistics()}")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.maintenance",
+        description="데이터 디렉토리 이전/압축/색인 재구성/무결성 검사, 대량 가져오기/내보내기",
+    )
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--chunk-size", type=int, default=SCAN_CHUNK_ROWS,
+                        help="한 번에 읽고 쓰는 행 수")
+    common.add_argument("--quiet", action="store_true", help="진행 상황을 찍지 않는다")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    command = commands.add_parser("migrate", parents=[common], help="다른 저장소 형식으로 옮기기")
+    command.add_argument("--from", dest="source", choices=BACKENDS, default=STORAGE_BACKEND,
+                         help="지금 형식 (기본: COMMUNITY_STORAGE)")
+    command.add_argument("--to", dest="target", choices=BACKENDS, required=True, help="옮길 형식")
+    command.add_argument("--force", action="store_true", help="이미 있는 SQLite DB를 지우고 다시 만든다")
+
+    for name, help_text in (("compact", "로그/카운터 스트림 압축, SQLite VACUUM"),
+                            ("reindex", "검색/태그/좋아요 색인 다시 만들기"),
+                            ("verify", "posts/users/좋아요 참조 무결성 검사")):
+        command = commands.add_parser(name, parents=[common], help=help_text)
+        command.add_argument("--backend", choices=BACKENDS, default=STORAGE_BACKEND,
+                             help="저장소 형식 (기본: COMMUNITY_STORAGE)")
+
+    command = commands.add_parser("import", parents=[common],
+                                  help="CSV/JSON Lines 파일의 사용자/게시글/여행메이트 일괄 추가")
+    command.add_argument("table", choices=["users", "posts", "travel_mates"])
+    command.add_argument("path", help="가져올 파일")
+    command.add_argument("--format", choices=["csv", "jsonl"], help="파일 형식 (기본: 확장자로 판단)")
+    command.add_argument("--dry-run", action="store_true", help="검증 결과만 보고 쓰지 않는다")
+
+    command = commands.add_parser("export", parents=[common], help="테이블을 CSV/JSON Lines로 내보내기")
+    command.add_argument("table", choices=[*TABLES, "likes"])
+    command.add_argument("path", help="내보낼 파일 (-는 표준 출력)")
+    command.add_argument("--format", choices=["csv", "jsonl"], help="파일 형식 (기본: 확장자로 판단)")
+    command.add_argument("--backend", choices=BACKENDS, default=STORAGE_BACKEND,
+                         help="저장소 형식 (기본: COMMUNITY_STORAGE)")
+
+    commands.add_parser("init", parents=[common], help="기본 데이터 생성 후 통계 출력")
+    args = parser.parse_args(argv)
+
+    progress = Progress(quiet=args.quiet)
+    start = time.monotonic()
+    if args.command == "migrate":
+        status = migrate(args.source, args.target, args.chunk_size, args.force, progress)
+    elif args.command == "compact":
+        status = compact(args.backend, args.chunk_size, progress)
+    elif args.command == "reindex":
+        status = reindex(args.backend, args.chunk_size, progress)
+    elif args.command == "verify":
+        status = verify(args.backend, args.chunk_size, progress)
+    elif args.command == "import":
+        status = import_(args.table, args.path, args.format, args.chunk_size, args.dry_run, progress)
+    elif args.command == "export":
+        status = export(args.table, args.path, args.format, args.backend, args.chunk_size, progress)
+    else:
+        status = init()
+    progress.step(f"{args.command}: {time.monotonic() - start:.1f}초")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
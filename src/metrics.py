@@ -0,0 +1,284 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# 계측은 선택 사항 - 꺼져 있으면 데코레이터/컨텍스트가 아무 일도 하지 않는다
+ENABLED = os.environ.get("COMMUNITY_METRICS", "").lower() in ("1", "true", "yes", "on")
+
+# 리런마다 내보낼 파일 (.json이면 JSON, 그 외는 Prometheus 텍스트)
+METRICS_FILE = os.environ.get("COMMUNITY_METRICS_FILE", "")
+
+# 0이 아니면 http://127.0.0.1:<port>/metrics (Prometheus), /metrics.json 제공
+METRICS_PORT = int(os.environ.get("COMMUNITY_METRICS_PORT", 0))
+
+# 히스토그램마다 분위수 계산에 쓰는 최근 표본 수
+SAMPLE_LIMIT = int(os.environ.get("COMMUNITY_METRICS_SAMPLES", 2048))
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+# 히스토그램 종류 → (설명, 라벨 이름)
+FAMILIES = {
+    "call_seconds": ("src/data.py 함수 호출 시간", "name"),
+    "render_seconds": ("페이지 렌더 시간", "page"),
+    "write_seconds": ("백그라운드 쓰기 한 건의 시간", "name"),
+    "rerun_seconds": ("Streamlit 리런 한 번의 시간", None),
+    "rerun_bytes_read": ("리런 한 번에 읽은 파일 바이트", None),
+    "rerun_bytes_written": ("리런 한 번에 쓴 파일 바이트", None),
+}
+
+
+class Histogram:
+    """호출 수/합계 + 최근 표본으로 분위수를 내는 히스토그램"""
+
+    __slots__ = ("count", "total", "samples")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.samples = deque(maxlen=SAMPLE_LIMIT)
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.samples.append(value)
+
+    def quantiles(self) -> dict:
+        ordered = sorted(self.samples)
+        if not ordered:
+            return {q: 0.0 for q in QUANTILES}
+        return {q: ordered[min(len(ordered) - 1, int(q * len(ordered)))] for q in QUANTILES}
+
+    def snapshot(self) -> dict:
+        quantiles = self.quantiles()
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "p50": quantiles[0.5],
+            "p95": quantiles[0.95],
+            "p99": quantiles[0.99],
+        }
+
+
+class Registry:
+    """프로세스 전역 히스토그램 + 누적 카운터"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._counters = {}
+
+    def observe(self, family: str, label: str, value: float) -> None:
+        with self._lock:
+            histogram = self._histograms.get((family, label))
+            if histogram is None:
+                histogram = self._histograms[(family, label)] = Histogram()
+            histogram.observe(value)
+
+    def inc(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def snapshot(self) -> dict:
+        """{"histograms": {family: {label: {...}}}, "counters": {...}}"""
+        with self._lock:
+            histograms = {}
+            for (family, label), histogram in sorted(self._histograms.items()):
+                histograms.setdefault(family, {})[label] = histogram.snapshot()
+            return {"histograms": histograms, "counters": dict(self._counters)}
+
+    def to_prometheus(self) -> str:
+        snapshot = self.snapshot()
+        lines = []
+        for family, by_label in snapshot["histograms"].items():
+            help_text, label_name = FAMILIES.get(family, (family, "name"))
+            metric = f"community_{family}"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} summary")
+            for label, stats in by_label.items():
+                base = f'{label_name}="{label}"' if label_name else ""
+                for q in QUANTILES:
+                    labels = ",".join(filter(None, [base, f'quantile="{q}"']))
+                    lines.append(f"{metric}{{{labels}}} {stats[f'p{round(q * 100)}']:.9g}")
+                suffix = f"{{{base}}}" if base else ""
+                lines.append(f"{metric}_sum{suffix} {stats['sum']:.9g}")
+                lines.append(f"{metric}_count{suffix} {stats['count']}")
+        for name, value in sorted(snapshot["counters"].items()):
+            metric = f"community_{name}"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+# 현재 스레드에서 진행 중인 리런의 I/O 누적 (Streamlit은 세션마다 스크립트 스레드가 따로)
+_rerun = threading.local()
+
+
+# =============================================================================
+# 기록
+# =============================================================================
+
+def timed(family: str, label: str):
+    """함수 실행 시간을 family/label 히스토그램에 기록하는 데코레이터"""
+    def decorator(fn):
+        if not ENABLED:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                registry.observe(family, label, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def instrument(namespace: dict, prefix: str) -> None:
+    """
+    모듈의 공개 함수들을 call_seconds로 계측 (모듈 맨 끝에서 globals()로 호출)
+
+    같은 모듈 안의 호출도 globals()를 거치므로 함께 계측된다.
+    """
+    if not ENABLED:
+        return
+    module = namespace["__name__"]
+    for name, value in list(namespace.items()):
+        if (not name.startswith("_") and callable(value) and not isinstance(value, type)
+                and getattr(value, "__module__", None) == module):
+            namespace[name] = timed("call_seconds", f"{prefix}.{name}")(value)
+
+
+@contextmanager
+def span(family: str, label: str = ""):
+    """with 블록 실행 시간을 기록"""
+    if not ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        registry.observe(family, label, time.perf_counter() - start)
+
+
+def count_io(direction: str, nbytes: int) -> None:
+    """파일 I/O 바이트 기록 - direction은 "read" 또는 "written" """
+    if not ENABLED or not nbytes:
+        return
+    registry.inc(f"bytes_{direction}_total", int(nbytes))
+    totals = getattr(_rerun, "io", None)
+    if totals is not None:
+        totals[direction] += int(nbytes)
+
+
+def count_file_read(path: str) -> None:
+    """파일 하나를 통째로 읽었을 때"""
+    if ENABLED:
+        try:
+            count_io("read", os.path.getsize(path))
+        except OSError:
+            pass
+
+
+@contextmanager
+def rerun():
+    """Streamlit 스크립트 한 번 실행을 감싸서 시간과 읽기/쓰기 바이트를 기록"""
+    if not ENABLED:
+        yield
+        return
+    _rerun.io = {"read": 0, "written": 0}
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        registry.observe("rerun_seconds", "", time.perf_counter() - start)
+        registry.observe("rerun_bytes_read", "", _rerun.io["read"])
+        registry.observe("rerun_bytes_written", "", _rerun.io["written"])
+        registry.inc("reruns_total")
+        _rerun.io = None
+        if METRICS_FILE:
+            try:
+                export(METRICS_FILE)
+            except OSError as e:
+                # 지표 파일을 못 써도 화면은 그대로 그린다
+                print(f"지표 내보내기 오류: {e}")
+
+
+# =============================================================================
+# 내보내기
+# =============================================================================
+
+def to_json() -> str:
+    return json.dumps(registry.snapshot(), ensure_ascii=False, indent=2)
+
+
+def export(path: str) -> None:
+    """path에 현재 지표를 쓴다 (.json이면 JSON, 그 외는 Prometheus 텍스트)"""
+    # storage가 이 모듈을 import하므로 여기서 가져온다
+    from .storage import atomic_write
+
+    text = to_json() if path.endswith(".json") else registry.to_prometheus()
+    # 세션마다 다른 스레드에서 리런하므로 임시 파일 이름에 스레드 ID까지 넣는 atomic_write를 쓴다
+    atomic_write(path, lambda f: f.write(text))
+
+
+def _metrics_response(path: str):
+    """요청 경로 → (본문, Content-Type) - 없는 경로면 None"""
+    if path == "/metrics":
+        return registry.to_prometheus(), "text/plain; version=0.0.4"
+    if path == "/metrics.json":
+        return to_json(), "application/json"
+    return None
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def serve(port: int = METRICS_PORT) -> None:
+    """127.0.0.1:port에 지표 엔드포인트를 띄운다 (프로세스당 1번, 포트가 이미 쓰이면 무시)"""
+    global _server
+    if not ENABLED or not port:
+        return
+    # http.server는 지표 서버를 켤 때만 불러온다
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            response = _metrics_response(self.path)
+            if response is None:
+                self.send_error(404)
+                return
+            body, content_type = response
+            data = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass  # 스크랩마다 콘솔에 찍지 않는다
+
+    with _server_lock:
+        if _server is not None:
+            return
+        try:
+            _server = ThreadingHTTPServer(("127.0.0.1", port), MetricsHandler)
+        except OSError as e:
+            print(f"지표 서버 시작 오류: {e}")
+            _server = False
+            return
+        threading.Thread(target=_server.serve_forever, daemon=True).start()
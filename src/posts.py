@@ -1,10 +1,29 @@
 import streamlit as st
 import pandas as pd
-from .data import get_users, get_posts, add_post, inc_repost, delete_post, toggle_like, is_post_liked_by_user
+from . import metrics
+from .images import MAX_IMAGES_PER_POST, ImageError, store_images
+from .ui import render_post_images, render_user_link
+from .writer import writer, WriteQueueFull
+from .data import (
+    get_usernames, get_posts, get_posts_page, add_post, inc_repost, delete_post,
+    toggle_like, get_liked_post_ids, get_post_likers_many, get_tag_counts, get_post_images,
+    FEED_PAGE_SIZE,
+)
 
-def _username(users: pd.DataFrame, user_id: int) -> str:
-    row = users[users["user_id"] == user_id]
-    return row.iloc[0]["username"] if len(row) else "알수없음"
+# 화면 정렬 이름 → 데이터 계층 정렬 이름
+ORDER_OPTIONS = {"최신순": "latest", "🔥 인기순": "hot", "좋아요순": "likes", "관련도순": "relevance"}
+
+# 태그 필터에 보여줄 인기 태그 수
+TAG_FACET_LIMIT = 8
+
+# 게시글마다 이름을 보여줄 좋아요 한 사람 수
+LIKERS_SHOWN = 3
+
+def _likers_caption(likers, usernames: dict, limit: int = LIKERS_SHOWN) -> str:
+    shown = sorted(likers)[:limit]
+    names = [f"@{usernames.get(user_id, '알수없음')}" for user_id in shown]
+    more = f" 외 {len(likers) - limit}명" if len(likers) > limit else ""
+    return f"좋아요 한 사람: {', '.join(names)}{more}"
 
 def _safe_rerun():
     # Streamlit 버전에 따라 지원 함수가 다를 수 있어 방어적으로 처리
@@ -13,67 +32,169 @@ def _safe_rerun():
     elif hasattr(st, "experimental_rerun"):
         st.experimental_rerun()
 
+def _queue_write(kind: str, post_id: int, fn, *args, **overlay):
+    """
+    쓰기를 백그라운드 큐에 넣고 세션에 낙관적 상태로 기록 (버튼 on_click 콜백)
+
+    콜백은 리런 전에 실행되므로 이어지는 렌더가 바로 낙관적 상태를 보여준다.
+    """
+    try:
+        future = writer.submit(fn, *args)
+    except WriteQueueFull:
+        st.session_state["write_errors"] = ["요청이 많아 잠시 처리하지 못했습니다. 다시 눌러주세요."]
+        return
+    pending = st.session_state.setdefault("pending_writes", [])
+    pending.append({"kind": kind, "post_id": post_id, "future": future, **overlay})
+
+def _on_like(post_id: int, user_id: int, liked: bool):
+    # 토글이 아니라 목표 상태로 보내서 늦게 반영되거나 연달아 눌러도 결과가 같다
+    _queue_write("like", post_id, toggle_like, post_id, user_id, liked, liked=liked)
+
+def _on_repost(post_id: int):
+    _queue_write("repost", post_id, inc_repost, post_id)
+
+def _write_succeeded(future) -> bool:
+    if future.exception() is not None:
+        return False
+    result = future.result()
+    return result.get("success", False) if isinstance(result, dict) else bool(result)
+
+def _reconcile_writes() -> tuple:
+    """
+    끝난 쓰기는 치우고 (실패는 알림), 아직 진행 중인 쓰기의 낙관적 상태를 반환
+
+    Returns:
+        ({post_id: 목표 좋아요 상태}, {post_id: 아직 반영 안 된 리포스트 수})
+    """
+    errors = st.session_state.pop("write_errors", [])
+    likes, reposts, remaining = {}, {}, []
+    for write in st.session_state.get("pending_writes", []):
+        future = write["future"]
+        if future.done():
+            if not _write_succeeded(future):
+                errors.append("좋아요 반영에 실패했습니다." if write["kind"] == "like"
+                              else "리포스트 반영에 실패했습니다.")
+            continue
+        remaining.append(write)
+        if write["kind"] == "like":
+            likes[write["post_id"]] = write["liked"]
+        else:
+            reposts[write["post_id"]] = reposts.get(write["post_id"], 0) + 1
+    st.session_state["pending_writes"] = remaining
+    for error in errors:
+        st.error(error)
+    return likes, reposts
+
+def _render_tag_filters():
+    """인기 태그 버튼 (태그 색인의 게시글 수) - 누르면 해당 태그로 필터링"""
+    active_tag = st.session_state.get("feed_tag")
+    facets = get_tag_counts(TAG_FACET_LIMIT)
+    if facets:
+        cols = st.columns(len(facets))
+        for col, (tag, count) in zip(cols, facets):
+            with col:
+                selected = tag == active_tag
+                if st.button(f"#{tag} ({count})", key=f"tag_{tag}",
+                             type="primary" if selected else "secondary"):
+                    st.session_state["feed_tag"] = None if selected else tag
+                    _safe_rerun()
+    if active_tag:
+        st.caption(f"태그 필터: **#{active_tag}** (같은 태그를 다시 누르면 해제)")
+        if st.button("태그 필터 해제", key="tag_clear"):
+            st.session_state["feed_tag"] = None
+            _safe_rerun()
+    return active_tag
+
+@metrics.timed("render_seconds", "render_feed_page")
 def render_feed_page():
     st.subheader("타임라인")
-    users = get_users()
-    posts = get_posts()
+    get_posts()  # 최초 실행 시 기본 데이터 생성
     current_user = st.session_state.get("user")
 
-    col1, col2 = st.columns([2, 1])
+    col1, col2, col3 = st.columns([2, 1, 1])
     with col1:
         q = st.text_input("검색어(내용/태그)")
     with col2:
-        order = st.selectbox("정렬", ["최신순", "좋아요순"])
-
-    df = posts.copy()
-    if q:
-        ql = q.lower()
-        df = df[
-            df["content"].str.lower().str.contains(ql, na=False)
-            | df["tags"].str.lower().str.contains(ql, na=False)
-        ]
-
-    if order == "최신순":
-        df = df.sort_values("created_at", ascending=False)
-    else:
-        df = df.sort_values("likes", ascending=False)
+        order = st.selectbox("정렬", list(ORDER_OPTIONS.keys()))
+    with col3:
+        size_options = sorted({FEED_PAGE_SIZE, 10, 20, 50})
+        page_size = st.selectbox("페이지 크기", size_options, index=size_options.index(FEED_PAGE_SIZE))
+
+    tag = _render_tag_filters()
+
+    # 검색어/태그/정렬/페이지 크기가 바뀌면 첫 페이지부터 다시 보여준다
+    feed_state = (q, tag, order, page_size)
+    if st.session_state.get("feed_state") != feed_state:
+        st.session_state["feed_state"] = feed_state
+        st.session_state["feed_pages"] = 1
+
+    # 지금까지 펼친 페이지 수만큼 커서를 따라가며 필요한 행만 가져온다
+    pages, cursor = [], None
+    for _ in range(st.session_state["feed_pages"]):
+        page, cursor = get_posts_page(ORDER_OPTIONS[order], cursor, page_size, q, tag)
+        pages.append(page)
+        if cursor is None:
+            break
+    df = pd.concat(pages)
+    # 현재 사용자의 좋아요 목록은 화면당 한 번만 불러온다
+    liked_post_ids = get_liked_post_ids(current_user["user_id"]) if current_user else frozenset()
+    # 진행 중인 쓰기는 데이터를 읽은 뒤에 확인한다 (그 사이 끝난 쓰기가 두 번 반영되지 않게)
+    pending_likes, pending_reposts = _reconcile_writes()
+    # 작성자 이름과 첨부 이미지는 페이지 전체를 한 번에 조회
+    authors = get_usernames(df["user_id"].tolist())
+    post_images = get_post_images(df["post_id"].tolist())
+    # 좋아요 한 사람도 페이지 전체를 한 번에 조회하고, 캡션에 보일 이름만 모아서 찾는다
+    post_likers = get_post_likers_many(df["post_id"].tolist())
+    liker_names = get_usernames(
+        user_id for likers in post_likers.values() for user_id in sorted(likers)[:LIKERS_SHOWN]
+    )
     
-    # 게시글 렌더링
-    for _, row in df.iterrows():
+    # 게시글 렌더링 (to_dict는 파이썬 기본 타입으로 돌려준다)
+    for row in df.to_dict("records"):
         with st.container(border=True):
-            user_name = _username(users, int(row["user_id"]))
-            st.markdown(f"**@{user_name}**", help=f"작성자 ID: {int(row['user_id'])}")
+            user_name = authors.get(row["user_id"], "알수없음")
+            render_user_link(row["user_id"], user_name, key=f"author_{row['post_id']}")
             st.write(row["content"])
+            post_id = row["post_id"]
+            if post_id in post_images:
+                render_post_images(post_images[post_id])
             st.caption(f"태그: {row['tags']}")
             st.caption(f"작성 시간: {row['created_at']}")
 
+            # 좋아요 한 사람 (페이지 단위로 조회한 게시글→사용자 색인)
+            likers = post_likers.get(post_id)
+            if likers:
+                st.caption(_likers_caption(likers, liker_names))
+
             col_like, col_repost, col_delete = st.columns([1, 1, 4])
-            post_id = int(row["post_id"])
             
             # 좋아요 버튼
             with col_like:
-                liked_by_user = False
-                if current_user:
-                    liked_by_user = is_post_liked_by_user(post_id, int(current_user["user_id"]))
-                
-                like_count = int(row["likes"])
+                liked_by_user = post_id in liked_post_ids
+                like_count = row["likes"]
+
+                # 아직 반영되지 않은 좋아요는 목표 상태로 보여준다
+                target = pending_likes.get(post_id, liked_by_user)
+                if target != liked_by_user:
+                    liked_by_user, like_count = target, max(0, like_count + (1 if target else -1))
+
                 like_label = "❤️" if liked_by_user else "🤍"
-                if st.button(f"{like_label} {like_count}", key=f"like_{post_id}"):
-                    if current_user:
-                        toggle_like(post_id, int(current_user["user_id"]))
-                        _safe_rerun()
-                    else:
-                        st.info("로그인해야 좋아요를 누를 수 있습니다.")
+                clicked = st.button(
+                    f"{like_label} {like_count}", key=f"like_{post_id}",
+                    on_click=_on_like if current_user else None,
+                    args=(post_id, current_user["user_id"], not liked_by_user) if current_user else None,
+                )
+                if clicked and not current_user:
+                    st.info("로그인해야 좋아요를 누를 수 있습니다.")
 
             # 리포스트 버튼
             with col_repost:
-                if st.button(f"🔄 {row['reposts']}", key=f"repost_{post_id}"):
-                    inc_repost(post_id)
-                    _safe_rerun()
+                reposts = row["reposts"] + pending_reposts.get(post_id, 0)
+                st.button(f"🔄 {reposts}", key=f"repost_{post_id}", on_click=_on_repost, args=(post_id,))
             
             # 삭제 버튼 (작성자만 보이게)
             with col_delete:
-                is_author = current_user and int(current_user["user_id"]) == int(row["user_id"])
+                is_author = current_user and current_user["user_id"] == row["user_id"]
                 if is_author:
                     confirm_key = f"confirm_delete_{post_id}"
                     if st.button("❌ 삭제", key=f"delete_{post_id}"):
@@ -96,6 +217,12 @@ def render_feed_page():
                                     del st.session_state[confirm_key]
                                 _safe_rerun()
 
+    # 다음 페이지가 있으면 더 보기
+    if cursor is not None and st.button("더 보기", key="feed_more"):
+        st.session_state["feed_pages"] += 1
+        _safe_rerun()
+
+@metrics.timed("render_seconds", "render_write_page")
 def render_write_page():
     if not st.session_state.get("user"):
         st.info("글쓰기는 로그인 후 이용 가능합니다.")
@@ -111,10 +238,20 @@ def render_write_page():
     
     content = st.text_area("내용", value=default_content)
     tags = st.text_input("태그 (쉼표로 구분)", value=default_tags)
+    uploads = st.file_uploader(
+        f"사진 (최대 {MAX_IMAGES_PER_POST}장)", type=["jpg", "jpeg", "png", "webp", "gif"],
+        accept_multiple_files=True,
+    )
 
     if st.button("게시"):
         if content.strip():
-            add_post(int(st.session_state["user"]["user_id"]), content, tags)
+            # 원본 저장과 썸네일/피드 크기 변형 생성은 게시글을 쓰기 전에 끝낸다
+            try:
+                images = store_images([upload.getvalue() for upload in uploads or []])
+            except ImageError as e:
+                st.error(str(e))
+                return
+            add_post(st.session_state["user"]["user_id"], content, tags, images)
             st.success("게시글이 성공적으로 작성되었습니다! 🎉")
             st.session_state.post_submitted = True
             _safe_rerun()
@@ -0,0 +1,111 @@
+import os
+import streamlit as st
+import pandas as pd
+from . import metrics
+from .ui import render_post_images, render_user_link
+from .data import (
+    get_user, get_usernames, get_user_activity_counts, get_user_posts, get_user_travel_mates,
+    get_user_liked_posts, get_post_images,
+)
+
+# 목록마다 처음 보여줄 글 수 ("더 보기"로 이만큼씩 늘어난다)
+PROFILE_PAGE_SIZE = int(os.environ.get("COMMUNITY_PROFILE_PAGE_SIZE", 10))
+
+def _safe_rerun():
+    # Streamlit 버전에 따라 지원 함수가 다를 수 있어 방어적으로 처리
+    if hasattr(st, "rerun"):
+        st.rerun()
+    elif hasattr(st, "experimental_rerun"):
+        st.experimental_rerun()
+
+def _format_date(value) -> str:
+    return value.strftime("%Y-%m-%d") if pd.notna(value) else "-"
+
+def _shown(name: str, user_id: int) -> int:
+    """목록별로 지금까지 펼친 글 수 (다른 사용자로 바뀌면 처음부터)"""
+    state = st.session_state.setdefault("profile_shown", {})
+    return state.get((name, user_id), PROFILE_PAGE_SIZE)
+
+def _render_more(name: str, user_id: int, total: int):
+    shown = _shown(name, user_id)
+    if total > shown and st.button(f"더 보기 ({shown}/{total})", key=f"profile_more_{name}"):
+        st.session_state["profile_shown"][(name, user_id)] = shown + PROFILE_PAGE_SIZE
+        _safe_rerun()
+
+def _render_posts(df: pd.DataFrame, name: str, show_author: bool):
+    # 좋아요 한 글은 작성자가 여러 명이므로 화면 전체를 한 번에 조회
+    authors = get_usernames(df["user_id"].tolist()) if show_author else {}
+    post_images = get_post_images(df["post_id"].tolist())
+    for row in df.to_dict("records"):
+        with st.container(border=True):
+            if show_author:
+                render_user_link(row["user_id"], authors.get(row["user_id"], "알수없음"),
+                                 key=f"profile_{name}_author_{row['post_id']}")
+            st.write(row["content"])
+            if row["post_id"] in post_images:
+                render_post_images(post_images[row["post_id"]], large=False)
+            st.caption(f"태그: {row['tags']}")
+            st.caption(f"작성 시간: {row['created_at']} · ❤️ {row['likes']} · 🔄 {row['reposts']}")
+
+def _render_mates(df: pd.DataFrame):
+    for row in df.to_dict("records"):
+        with st.container(border=True):
+            st.markdown(f"**{row['title']}**")
+            st.write(f"✈️ {row['departure_city']} → {row['destination_city']} · "
+                     f"🗓️ {_format_date(row['date_from'])} ~ {_format_date(row['date_to'])}")
+            st.caption(f"등록일: {row['created_at']} · 상태: `{row['status']}`")
+
+def _select_user():
+    """보여줄 사용자 (@사용자명으로 들어왔으면 그 사용자, 아니면 로그인한 사용자)"""
+    current_user = st.session_state.get("user")
+    user_id = st.session_state.get("profile_user_id") or (current_user or {}).get("user_id")
+    username = get_usernames([user_id]).get(user_id, "") if user_id else ""
+
+    query = st.text_input("사용자 찾기 (사용자명)", value=username).strip().lstrip("@")
+    if query and query != username:
+        user = get_user(query)
+        if not user:
+            st.warning(f"'{query}' 사용자가 없습니다.")
+            return None, ""
+        user_id, username = int(user["user_id"]), user["username"]
+        st.session_state["profile_user_id"] = user_id
+    if not username:
+        if user_id:
+            st.warning("탈퇴했거나 없는 사용자입니다.")
+        return None, ""
+    return user_id, username
+
+@metrics.timed("render_seconds", "render_profile_page")
+def render_profile_page():
+    user_id, username = _select_user()
+    if user_id is None:
+        st.info("피드나 여행메이트 글의 @사용자명을 누르거나 사용자명을 입력하세요.")
+        return
+
+    st.subheader(f"@{username}")
+    # 목록 길이는 user_id 색인에서 바로 나온다 (테이블을 훑지 않는다)
+    counts = get_user_activity_counts(user_id)
+    col_posts, col_mates, col_liked = st.columns(3)
+    col_posts.metric("게시글", counts["posts"])
+    col_mates.metric("여행메이트", counts["travel_mates"])
+    col_liked.metric("좋아요 한 글", counts["liked"])
+
+    tab_posts, tab_mates, tab_liked = st.tabs(["게시글", "여행메이트 모집글", "좋아요 한 글"])
+    with tab_posts:
+        df = get_user_posts(user_id, _shown("posts", user_id))
+        if df.empty:
+            st.caption("아직 쓴 게시글이 없습니다.")
+        _render_posts(df, "posts", show_author=False)
+        _render_more("posts", user_id, counts["posts"])
+    with tab_mates:
+        df = get_user_travel_mates(user_id, _shown("travel_mates", user_id))
+        if df.empty:
+            st.caption("아직 올린 모집글이 없습니다.")
+        _render_mates(df)
+        _render_more("travel_mates", user_id, counts["travel_mates"])
+    with tab_liked:
+        df = get_user_liked_posts(user_id, _shown("liked", user_id))
+        if df.empty:
+            st.caption("아직 좋아요 한 게시글이 없습니다.")
+        _render_posts(df, "liked", show_author=True)
+        _render_more("liked", user_id, counts["liked"])
@@ -0,0 +1,186 @@
+import heapq
+import math
+import os
+import threading
+import time
+import numpy as np
+import pandas as pd
+
+# 인기도가 절반으로 줄어드는 시간 (시간 단위)
+HOT_HALF_LIFE_HOURS = float(os.environ.get("COMMUNITY_HOT_HALF_LIFE_HOURS", 12))
+
+# 증분 갱신으로 유지하는 상위 게시글 수 (첫 페이지들은 여기서 바로 꺼낸다)
+HOT_TOP_K = int(os.environ.get("COMMUNITY_HOT_TOP_K", 200))
+
+# 다른 프로세스의 변경을 놓쳤을 수 있으므로 이 시간이 지나면 새로 만든다 (초)
+HOT_REBUILD_SECONDS = float(os.environ.get("COMMUNITY_HOT_REBUILD_SECONDS", 300))
+
+# 리포스트 한 번은 좋아요 몇 번만큼인지
+REPOST_WEIGHT = 2
+
+# 점수를 int64 정렬키로 바꿀 때의 배율 (커서가 다른 정렬과 같은 (int, int) 모양이 되도록)
+_SCALE = 1_000_000
+
+# 상위 집합 밖에 게시글이 하나도 없음
+_EMPTY = (-(2 ** 63), -(2 ** 63))
+
+
+def hot_keys(likes, reposts, created_ns) -> np.ndarray:
+    """
+    hot 점수 정렬키 (int64, 클수록 위)
+
+    점수는 (1 + 좋아요 + 2×리포스트) × 2^(-경과시간/반감기)이고, 정렬키는 그 log2에
+    "지금" 항을 뺀 log2(1 + 좋아요 + 2×리포스트) + 작성시각/반감기다. 모든 게시글이
+    같은 비율로 식으므로 시간이 흘러도 순서는 바뀌지 않고, 정렬키는 좋아요/리포스트
+    수가 바뀔 때만 다시 계산하면 된다.
+    """
+    engagement = 1 + np.maximum(np.asarray(likes, dtype="float64"), 0) \
+        + REPOST_WEIGHT * np.maximum(np.asarray(reposts, dtype="float64"), 0)
+    age_units = np.asarray(created_ns, dtype="float64") / (HOT_HALF_LIFE_HOURS * 3600e9)
+    return np.floor((np.log2(engagement) + age_units) * _SCALE).astype("int64")
+
+
+def hot_score(key: int, now_ns: int = None) -> float:
+    """정렬키 → 지금 시점의 점수 (화면 표시용)"""
+    now_ns = time.time_ns() if now_ns is None else now_ns
+    return math.pow(2.0, key / _SCALE - now_ns / (HOT_HALF_LIFE_HOURS * 3600e9))
+
+
+class HotRanking:
+    """
+    hot 점수 상위 K개 게시글 (증분 갱신)
+
+    만들 때 한 번 전체 점수를 계산해 상위 K개만 (정렬키, post_id) 최소 힙에 담고,
+    밖에 남은 게시글 점수의 상한(bound)을 기억한다. 그 뒤로는 좋아요/리포스트 수가
+    바뀐 게시글 하나만 다시 계산해 힙에 넣거나 빼므로 전체를 다시 정렬하지 않는다.
+    상위 집합에 든 게시글은 항상 상한보다 크므로, 상위 집합만으로 채울 수 있는
+    페이지는 전체 순위와 같다.
+    """
+
+    def __init__(self, ids, likes, reposts, created_ns, k: int = HOT_TOP_K):
+        self.k = k
+        self._lock = threading.Lock()
+        self.built_at = time.monotonic()
+        self._index = pd.Index(np.asarray(ids, dtype="int64"))
+        self._likes = np.array(likes, dtype="int64")
+        self._reposts = np.array(reposts, dtype="int64")
+        self._created = np.array(created_ns, dtype="int64")
+        self._added = {}  # 만든 뒤 추가된 게시글 {post_id: [likes, reposts, created_ns]}
+        self._removed = set()
+
+        keys = hot_keys(self._likes, self._reposts, self._created)
+        ids = self._index.to_numpy()
+        if len(ids) > k:
+            top = np.argpartition(keys, len(ids) - k)[len(ids) - k:]
+            outside = np.ones(len(ids), dtype=bool)
+            outside[top] = False
+            best = np.lexsort((ids[outside], keys[outside]))[-1]
+            self.bound = (int(keys[outside][best]), int(ids[outside][best]))
+        else:
+            top = np.arange(len(ids))
+            self.bound = _EMPTY
+        self._top = {int(ids[i]): int(keys[i]) for i in top}
+        self._heap = [(key, post_id) for post_id, key in self._top.items()]
+        heapq.heapify(self._heap)
+
+    # -- 갱신 ------------------------------------------------------------------
+
+    def _counts(self, post_id: int):
+        if post_id in self._added:
+            return self._added[post_id]
+        if post_id in self._removed or post_id not in self._index:
+            return None
+        position = self._index.get_loc(post_id)
+        return [self._likes[position], self._reposts[position], self._created[position]]
+
+    def set_counts(self, post_id: int, likes: int = None, reposts: int = None) -> bool:
+        """게시글 하나의 좋아요/리포스트 수가 바뀜 (모르는 게시글이면 False)"""
+        with self._lock:
+            return self._set_counts(post_id, likes, reposts)
+
+    def _set_counts(self, post_id: int, likes, reposts) -> bool:
+        counts = self._counts(post_id)
+        if counts is None:
+            return False
+        if likes is not None:
+            counts[0] = likes
+        if reposts is not None:
+            counts[1] = reposts
+        if post_id not in self._added:
+            position = self._index.get_loc(post_id)
+            self._likes[position], self._reposts[position] = counts[0], counts[1]
+        self._place(post_id, int(hot_keys([counts[0]], [counts[1]], [counts[2]])[0]))
+        return True
+
+    def add(self, post_id: int, created_ns: int) -> bool:
+        """새 게시글 (좋아요/리포스트 0)"""
+        with self._lock:
+            self._removed.discard(post_id)
+            self._added[post_id] = [0, 0, created_ns]
+            self._place(post_id, int(hot_keys([0], [0], [created_ns])[0]))
+        return True
+
+    def remove(self, post_id: int) -> bool:
+        with self._lock:
+            self._added.pop(post_id, None)
+            self._removed.add(post_id)
+            self._top.pop(post_id, None)  # 힙에 남은 항목은 꺼낼 때 버린다
+        return True
+
+    def _place(self, post_id: int, key: int) -> None:
+        entry = (key, post_id)
+        if entry > self.bound:
+            self._top[post_id] = key
+            heapq.heappush(self._heap, entry)
+            if len(self._top) > self.k:
+                evicted = self._pop_min()
+                self.bound = max(self.bound, evicted)
+        else:
+            # 상한 아래로 내려간 게시글은 상위 집합에서 빼고 상한을 올린다
+            self._top.pop(post_id, None)
+            self.bound = max(self.bound, entry)
+        if len(self._heap) > 4 * self.k:
+            self._heap = [(k, i) for i, k in self._top.items()]
+            heapq.heapify(self._heap)
+
+    def _pop_min(self) -> tuple:
+        while True:
+            key, post_id = heapq.heappop(self._heap)
+            if self._top.get(post_id) == key:
+                del self._top[post_id]
+                return key, post_id
+
+    def __sizeof__(self) -> int:
+        # 캐시 메모리 상한 계산용 대략값
+        arrays = self._likes.nbytes + self._reposts.nbytes + self._created.nbytes
+        return arrays + self._index.memory_usage() + 100 * (len(self._top) + len(self._heap))
+
+    # -- 조회 ------------------------------------------------------------------
+
+    def expired(self) -> bool:
+        """
+        새로 만들어야 하는지
+
+        상위 집합이 절반 아래로 줄었거나 (점수가 내려간 게시글이 빠져서),
+        다른 프로세스의 변경을 놓쳤을 수 있을 만큼 오래됐을 때.
+        """
+        shrunk = self.bound != _EMPTY and len(self._top) < self.k // 2
+        return shrunk or time.monotonic() - self.built_at > HOT_REBUILD_SECONDS
+
+    def page(self, cursor, limit: int):
+        """
+        (post_id 목록, next_cursor) - 상위 집합만으로 채울 수 없으면 None
+
+        cursor와 next_cursor는 다른 정렬과 같은 (정렬키, post_id) 모양이라
+        상위 집합을 다 쓴 뒤에는 전체 테이블 키셋 페이지로 이어진다.
+        """
+        with self._lock:
+            entries = sorted(((key, post_id) for post_id, key in self._top.items()), reverse=True)
+        if cursor is not None:
+            cursor = (int(cursor[0]), int(cursor[1]))
+            entries = [entry for entry in entries if entry < cursor]
+        if len(entries) < limit and self.bound != _EMPTY:
+            return None
+        entries = entries[:limit]
+        next_cursor = entries[-1] if len(entries) == limit else None
+        return [post_id for _, post_id in entries], next_cursor
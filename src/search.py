@@ -0,0 +1,432 @@
+import json
+import math
+import os
+import threading
+import unicodedata
+from . import metrics
+from .storage import DATA_DIR, LOG_COMPACT_BYTES, TABLES, _file_signature, atomic_write, file_lock
+
+# 변경 로그가 LOG_COMPACT_BYTES와 스냅샷 크기의 이 비율을 모두 넘으면 스냅샷에 합친다
+SEARCH_LOG_COMPACT_RATIO = float(os.environ.get("COMMUNITY_SEARCH_LOG_COMPACT_RATIO", 0.25))
+
+# 테이블별 검색 대상 컬럼
+SEARCH_FIELDS = {
+    "posts": ["content", "tags"],
+    "travel_mates": ["title", "notes", "departure_city", "destination_city"],
+}
+
+
+def _index_path(table: str) -> str:
+    return os.path.join(DATA_DIR, f"search_{table}.json")
+
+
+# =============================================================================
+# 토큰화 (문자 n-gram)
+# =============================================================================
+
+def _normalize(text) -> str:
+    if text is None or (isinstance(text, float) and math.isnan(text)):
+        return ""
+    return unicodedata.normalize("NFKC", str(text)).casefold()
+
+
+def query_terms(text) -> list:
+    """
+    공백/문장부호로 나눈 단어 목록
+
+    한글·데바나가리의 모음 기호(결합 문자)가 단어 중간에서 잘리지 않도록
+    유니코드 문자(L)·결합 기호(M)·숫자(N)를 모두 단어 글자로 본다.
+    """
+    words, current = [], []
+    for ch in _normalize(text):
+        if unicodedata.category(ch)[0] in "LMN":
+            current.append(ch)
+        elif current:
+            words.append("".join(current))
+            current = []
+    if current:
+        words.append("".join(current))
+    return words
+
+
+def _term_grams(term: str) -> list:
+    """한 단어의 검색용 n-gram (두 글자 이상은 bigram, 한 글자는 그대로)"""
+    if len(term) < 2:
+        return [term]
+    return [term[i:i + 2] for i in range(len(term) - 1)]
+
+
+def tokenize(text) -> list:
+    """색인용 n-gram 목록 (중복 포함) - 한 글자 검색을 위해 unigram도 넣는다"""
+    grams = []
+    for word in query_terms(text):
+        grams.extend(word)
+        if len(word) >= 2:
+            grams.extend(_term_grams(word))
+    return grams
+
+
+# =============================================================================
+# 역색인
+# =============================================================================
+
+class SearchIndex:
+    """
+    n-gram → {문서 ID: 출현 횟수} 역색인
+
+    검색어의 각 단어를 n-gram으로 나눠 게시 목록(posting)을 가장 짧은 것부터
+    교집합하므로, 조회 비용이 전체 문서 수가 아니라 일치 문서 수에 비례한다.
+    """
+
+    def __init__(self):
+        self.postings = {}
+        self.docs = {}
+
+    def add(self, doc_id: int, text) -> None:
+        doc_id = int(doc_id)
+        self.remove(doc_id)
+        counts = {}
+        for gram in tokenize(text):
+            counts[gram] = counts.get(gram, 0) + 1
+        for gram, tf in counts.items():
+            self.postings.setdefault(gram, {})[doc_id] = tf
+        self.docs[doc_id] = list(counts)
+
+    def remove(self, doc_id: int) -> None:
+        for gram in self.docs.pop(int(doc_id), ()):
+            posting = self.postings.get(gram)
+            if posting is not None:
+                posting.pop(int(doc_id), None)
+                if not posting:
+                    del self.postings[gram]
+
+    def search(self, query) -> list:
+        """모든 단어를 포함하는(AND) 문서 ID를 관련도 높은 순으로 반환"""
+        grams = []
+        for term in query_terms(query):
+            grams.extend(_term_grams(term))
+        if not grams:
+            return []
+        postings = [self.postings.get(gram) for gram in set(grams)]
+        if any(p is None for p in postings):
+            return []
+        postings.sort(key=len)
+        matches = set(postings[0])
+        for posting in postings[1:]:
+            matches.intersection_update(posting)
+            if not matches:
+                return []
+
+        # tf-idf 합으로 순위 결정 (동점이면 최신 ID 우선)
+        n_docs = len(self.docs) or 1
+        idf = {gram: math.log(1 + n_docs / len(self.postings[gram])) for gram in set(grams)}
+        scores = {
+            doc_id: sum(self.postings[gram][doc_id] * weight for gram, weight in idf.items())
+            for doc_id in matches
+        }
+        return sorted(matches, key=lambda doc_id: (scores[doc_id], doc_id), reverse=True)
+
+    def to_json(self) -> dict:
+        return {
+            "postings": {g: {str(d): tf for d, tf in p.items()} for g, p in self.postings.items()},
+            "docs": {str(d): grams for d, grams in self.docs.items()},
+        }
+
+    @classmethod
+    def from_json(cls, raw: dict) -> "SearchIndex":
+        index = cls()
+        index.postings = {g: {int(d): tf for d, tf in p.items()} for g, p in raw["postings"].items()}
+        index.docs = {int(d): grams for d, grams in raw["docs"].items()}
+        return index
+
+
+# =============================================================================
+# 색인 보관 (스냅샷 + 변경 로그 + 프로세스 메모리)
+# =============================================================================
+#
+# 색인 전체는 search_<table>.json 스냅샷에 두고, 글 추가/삭제는 그 옆
+# search_<table>.log에 {"op": "add", "id", "text"} / {"op": "remove", "id"} 한 줄씩
+# 덧붙인다. 읽을 때는 스냅샷 위에 로그를 이어서 재생하고, 로그가 LOG_COMPACT_BYTES와
+# 스냅샷 크기의 SEARCH_LOG_COMPACT_RATIO배를 모두 넘으면 백그라운드 스레드가 스냅샷에
+# 합친다 (유지보수 compact/reindex도 합친다). 같은 레코드를 두 번 재생해도 결과가
+# 같으므로 합치는 도중에 읽어도 틀어지지 않는다.
+
+class _Loaded:
+    """프로세스에 올린 색인과, 그 색인이 반영한 스냅샷/로그 위치"""
+
+    __slots__ = ("index", "snapshot_sig", "log_ino", "offset", "records", "version", "max_id")
+
+    def __init__(self, index: SearchIndex, snapshot_sig):
+        self.index = index
+        self.snapshot_sig = snapshot_sig
+        self.log_ino = None
+        self.offset = 0
+        self.records = 0
+        self.version = None  # 마지막으로 테이블과 맞춰 본 테이블 버전
+        self.max_id = None  # 그때 테이블의 가장 큰 ID (None이면 다음에 전체를 맞춘다)
+
+
+_indexes = {}
+_lock = threading.RLock()
+_compacting = set()
+
+
+def _log_path(table: str) -> str:
+    return os.path.join(DATA_DIR, f"search_{table}.log")
+
+
+def row_text(table: str, row) -> str:
+    return " ".join(_normalize(row[field]) for field in SEARCH_FIELDS[table])
+
+
+def _apply(index: SearchIndex, record: dict) -> None:
+    if record["op"] == "add":
+        index.add(record["id"], record["text"])
+    else:
+        index.remove(record["id"])
+
+
+def _save(table: str, index: SearchIndex) -> _Loaded:
+    """색인 전체를 스냅샷으로 쓰고 변경 로그를 비운다 (file_lock 안에서)"""
+    path = _index_path(table)
+    # json.dump(f)는 순수 파이썬 인코더로 조금씩 쓰므로, C 인코더로 한 번에 만든 문자열을 쓴다
+    text = json.dumps(index.to_json(), ensure_ascii=False, separators=(",", ":"))
+    # 쓰는 중에 실패하면 메모리 색인도 버려서 다음에 파일에서 다시 읽게 한다
+    _indexes.pop(table, None)
+    atomic_write(path, lambda f: f.write(text))
+    atomic_write(_log_path(table), lambda f: None)
+    entry = _Loaded(index, _file_signature(path))
+    entry.log_ino = _file_signature(_log_path(table))[0]
+    _indexes[table] = entry
+    return entry
+
+
+def _read_snapshot(table: str, sig):
+    metrics.count_file_read(_index_path(table))
+    with open(_index_path(table), "r", encoding="utf-8") as f:
+        return _Loaded(SearchIndex.from_json(json.load(f)), sig)
+
+
+def _replay(table: str, entry: _Loaded) -> bool:
+    """로그에 새로 붙은 레코드만 재생 - 로그가 통째로 바뀌었으면 False (스냅샷부터 다시)"""
+    sig = _file_signature(_log_path(table))
+    if sig is None:
+        return entry.offset == 0
+    if entry.offset and (sig[0] != entry.log_ino or sig[2] < entry.offset):
+        return False
+    entry.log_ino = sig[0]
+    if sig[2] == entry.offset:
+        return True
+    start = entry.offset
+    with open(_log_path(table), "rb") as f:
+        f.seek(entry.offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break  # 아직 쓰는 중인 마지막 줄은 다음에 읽는다
+            _apply(entry.index, json.loads(line))
+            entry.offset += len(line)
+            entry.records += 1
+    metrics.count_io("read", entry.offset - start)
+    return True
+
+
+def _load(table: str):
+    """스냅샷 + 로그를 반영한 메모리 색인 (스냅샷이 없거나 읽을 수 없으면 None)"""
+    sig = _file_signature(_index_path(table))
+    entry = _indexes.get(table)
+    try:
+        if entry is None or entry.snapshot_sig != sig:
+            if sig is None:
+                _indexes.pop(table, None)
+                return None
+            entry = _read_snapshot(table, sig)
+        if not _replay(table, entry):
+            entry = _read_snapshot(table, sig)
+            _replay(table, entry)
+    except (OSError, json.JSONDecodeError, KeyError, ValueError, TypeError):
+        _indexes.pop(table, None)
+        return None
+    _indexes[table] = entry
+    return entry
+
+
+def _append(table: str, entry: _Loaded, records: list) -> None:
+    """
+    변경 레코드를 로그에 덧붙이고 fsync가 끝난 뒤에야 메모리 색인에 반영 (file_lock 안에서)
+
+    쓰기가 실패하면 메모리 색인은 파일과 같은 상태로 남는다.
+    """
+    if not records:
+        return
+    data = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records).encode("utf-8")
+    try:
+        with open(_log_path(table), "ab") as f:
+            # 쓰다 죽은 프로세스가 남긴 잘린 줄은 잘라내고 이어 쓴다
+            if f.tell() > entry.offset:
+                f.truncate(entry.offset)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        # 일부만 써졌을 수 있으니 다음에 파일에서 다시 읽는다
+        _indexes.pop(table, None)
+        raise
+    metrics.count_io("written", len(data))
+    if entry.log_ino is None:
+        entry.log_ino = _file_signature(_log_path(table))[0]
+    entry.offset += len(data)
+    entry.records += len(records)
+    for record in records:
+        _apply(entry.index, record)
+    if entry.offset > max(LOG_COMPACT_BYTES, entry.snapshot_sig[2] * SEARCH_LOG_COMPACT_RATIO):
+        _schedule_compaction(table)
+
+
+def _schedule_compaction(table: str) -> None:
+    if table in _compacting:
+        return
+    _compacting.add(table)
+    threading.Thread(target=compact_index, args=(table,), daemon=True).start()
+
+
+def rebuild_index(table: str, df) -> SearchIndex:
+    """테이블 전체로 색인을 새로 만든다"""
+    return rebuild_index_chunks(table, [df])
+
+
+def rebuild_index_chunks(table: str, chunks) -> SearchIndex:
+    """DataFrame 조각들로 색인을 새로 만든다 (테이블 전체를 한 번에 올리지 않는다)"""
+    key = TABLES[table]["key"]
+    with _lock, file_lock(_index_path(table)):
+        index = SearchIndex()
+        for df in chunks:
+            for row in df[[key] + SEARCH_FIELDS[table]].itertuples(index=False):
+                row = row._asdict()
+                index.add(row[key], row_text(table, row))
+        _save(table, index)
+        return index
+
+
+def compact_index(table: str):
+    """변경 로그를 스냅샷에 합치고 합친 레코드 수 반환 (색인이 없으면 None - 유지보수 compact)"""
+    try:
+        with _lock, file_lock(_index_path(table)):
+            entry = _load(table)
+            if entry is None:
+                return None
+            records = entry.records
+            if records:
+                # 색인 내용은 그대로이므로 테이블과 맞춰 본 위치도 이어받는다
+                saved = _save(table, entry.index)
+                saved.version, saved.max_id = entry.version, entry.max_id
+            return records
+    finally:
+        _compacting.discard(table)
+
+
+def _sync(table: str, entry: _Loaded, df) -> bool:
+    """
+    테이블에 있는데 색인에 없는 행은 넣고, 색인에만 있는 행은 뺀다 (이 프로세스 메모리만)
+
+    다른 프로세스의 쓰기가 아직 로그에 닿지 않았거나, 복원/이전 뒤에 색인 파일이
+    테이블과 어긋난 경우를 맞춘다. 평소에는 지난번에 맞춘 뒤로 ID가 커진 꼬리 행만
+    보므로 좋아요처럼 행이 그대로인 변경은 전체 ID를 훑지 않는다. 삭제 등으로 수가
+    안 맞을 때만 전체를 비교하고, 어긋난 행이 절반을 넘으면 False (다시 만드는 게 낫다).
+    """
+    key = TABLES[table]["key"]
+    ids = df[key].to_numpy()
+    if entry.max_id is not None and _sync_tail(table, entry, df, ids):
+        return True
+    if not _sync_all(table, entry, df, set(ids.tolist())):
+        return False
+    entry.max_id = int(ids.max()) if len(ids) else 0
+    return True
+
+
+def _sync_tail(table: str, entry: _Loaded, df, ids) -> bool:
+    """
+    ID 순으로 덧붙는 새 행만 색인에 넣는다 - 그 뒤 문서 수가 행 수와 다르면 False
+
+    색인에서 문서가 빠지는 건 삭제 레코드를 재생할 때뿐이라, 새 행을 넣은 뒤
+    문서 수가 같으면 ID 집합도 같다.
+    """
+    start = int(ids.searchsorted(entry.max_id, side="right"))
+    new_ids = ids[start:].tolist()
+    missing = {doc_id for doc_id in new_ids if doc_id not in entry.index.docs}
+    if missing:
+        _add_rows(table, entry, df.iloc[start:], missing)
+    if len(entry.index.docs) != len(ids):
+        return False
+    if new_ids:
+        entry.max_id = max(entry.max_id, max(new_ids))
+    return True
+
+
+def _add_rows(table: str, entry: _Loaded, df, doc_ids: set) -> None:
+    key = TABLES[table]["key"]
+    rows = df.loc[df[key].isin(doc_ids), [key] + SEARCH_FIELDS[table]]
+    for row in rows.itertuples(index=False):
+        row = row._asdict()
+        entry.index.add(row[key], row_text(table, row))
+
+
+def _sync_all(table: str, entry: _Loaded, df, ids: set) -> bool:
+    """테이블 전체 ID와 색인 문서를 비교해서 맞춘다"""
+    missing = ids.difference(entry.index.docs)
+    extra = set(entry.index.docs).difference(ids)
+    if len(missing) + len(extra) > len(ids) // 2:
+        return False
+    for doc_id in extra:
+        entry.index.remove(doc_id)
+    if missing:
+        _add_rows(table, entry, df, missing)
+    return True
+
+
+def get_index(table: str, df, version=None) -> SearchIndex:
+    """
+    테이블과 맞춘 색인 (없거나 크게 어긋나면 다시 만든다)
+
+    version은 테이블 캐시와 같은 저장소 버전으로, 버전이 그대로면 다시 맞춰 보지 않는다.
+    None이면 매번 맞춘다.
+    """
+    with _lock:
+        entry = _load(table)
+        if entry is not None and (version is None or entry.version != version):
+            if not _sync(table, entry, df):
+                entry = None
+        if entry is None:
+            rebuild_index(table, df)
+            entry = _indexes[table]
+            ids = df[TABLES[table]["key"]]
+            entry.max_id = int(ids.max()) if len(ids) else 0
+        entry.version = version
+        return entry.index
+
+
+def search(table: str, df, query, version=None) -> list:
+    """검색어에 일치하는 문서 ID (관련도 순)"""
+    with _lock:
+        return get_index(table, df, version).search(query)
+
+
+def add_document(table: str, doc_id: int, row: dict) -> None:
+    """행 추가 시 색인 갱신 (색인이 아직 없으면 첫 검색 때 만든다)"""
+    add_documents(table, [(doc_id, row)])
+
+
+def add_documents(table: str, docs) -> None:
+    """(문서 ID, 행) 여러 개를 변경 로그에 한 번에 덧붙인다"""
+    with _lock, file_lock(_index_path(table)):
+        entry = _load(table)
+        if entry is not None:
+            _append(table, entry, [{"op": "add", "id": int(doc_id), "text": row_text(table, row)}
+                                   for doc_id, row in docs])
+
+
+def remove_document(table: str, doc_id: int) -> None:
+    """행 삭제 시 색인 갱신"""
+    with _lock, file_lock(_index_path(table)):
+        entry = _load(table)
+        if entry is not None:
+            _append(table, entry, [{"op": "remove", "id": int(doc_id)}])
@@ -0,0 +1,233 @@
+"""
+커뮤니티 통계 (누적 카운터 + 일별 집계)
+
+통계 화면이 테이블 크기와 상관없이 바로 그려지도록, 합계와 날짜별 건수를
+쓰기 경로가 그때그때 더해 둔다. 변경은 게시글 카운터와 같은 형식의 스트림
+(data/stats.counters)에 절대값으로 덧붙이고, 레코드가 쌓이면 스냅샷
+(data/stats.json)에 합친 뒤 스트림을 비운다. 스냅샷이 없을 때(처음 실행, 또는
+유지보수 reindex)만 테이블을 한 번 훑어 계산한다.
+
+키 0은 합계, 그 밖의 키는 날짜의 서수(date.toordinal())다.
+"""
+import json
+import os
+from datetime import date
+import numpy as np
+import pandas as pd
+
+from .storage import DATA_DIR, CounterLog, _file_signature, atomic_write
+
+STATS_FILE = os.path.join(DATA_DIR, "stats.json")
+STATS_COUNTERS_FILE = os.path.join(DATA_DIR, "stats.counters")
+
+# 스트림 레코드가 이만큼 쌓이면 스냅샷에 합친다
+STATS_FOLD_RECORDS = int(os.environ.get("COMMUNITY_STATS_FOLD_RECORDS", 1000))
+
+# 합계 카운터 → 화면 이름
+TOTALS = {
+    "users": "사용자",
+    "posts": "게시글",
+    "travel_mates": "여행메이트",
+    "likes": "좋아요",
+    "reposts": "리포스트",
+    "active_likers": "좋아요 한 사용자",
+    "travel_open": "모집 중",
+    "travel_closed": "마감",
+}
+
+# 일별 집계 → 화면 이름 (그날 일어난 일의 수 - 삭제는 합계에만 반영)
+DAILY = {
+    "users": "가입",
+    "posts": "게시글",
+    "likes": "좋아요",
+    "reposts": "리포스트",
+    "travel_mates": "새 모집",
+    "travel_closed": "마감",
+}
+
+TOTAL = 0
+
+# 1970-01-01의 서수 (datetime64[D] → 서수 변환용)
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def _ordinal(day) -> int:
+    """date/datetime/문자열 → 날짜 서수"""
+    if isinstance(day, (int, np.integer)):
+        return int(day)
+    if not isinstance(day, date):
+        day = pd.Timestamp(day)
+    return day.toordinal()
+
+
+def _day_ordinals(values) -> np.ndarray:
+    """날짜/시각 컬럼 → 날짜 서수 배열 (읽을 수 없는 값은 빠진다)"""
+    stamps = pd.to_datetime(pd.Series(values), errors="coerce").dropna()
+    return stamps.to_numpy().astype("datetime64[D]").astype("int64") + _EPOCH_ORDINAL
+
+
+def _add_days(values: dict, name: str, ordinals: np.ndarray) -> None:
+    days, counts = np.unique(ordinals, return_counts=True)
+    daily = values.setdefault(name, {})
+    for day, count in zip(days.tolist(), counts.tolist()):
+        daily[day] = daily.get(day, 0) + count
+
+
+def compute(users, posts, travel_mates, likes) -> dict:
+    """
+    테이블 조각들에서 통계를 처음부터 계산 → {이름: {키: 값}}
+
+    users/posts/travel_mates는 DataFrame 조각, likes는 (user_id, post_id) 쌍 목록 조각의
+    iterable. 좋아요/리포스트/마감의 날짜는 테이블에 남지 않으므로 일별 집계는
+    이때부터 쌓인다.
+    """
+    values = {name: {TOTAL: 0} for name in TOTALS}
+
+    def add(name, amount):
+        values[name][TOTAL] += int(amount)
+
+    for chunk in users:
+        add("users", len(chunk))
+        if "joined_at" in chunk:
+            _add_days(values, "users", _day_ordinals(chunk["joined_at"]))
+    for chunk in posts:
+        add("posts", len(chunk))
+        add("likes", pd.to_numeric(chunk["likes"], errors="coerce").fillna(0).sum())
+        add("reposts", pd.to_numeric(chunk["reposts"], errors="coerce").fillna(0).sum())
+        _add_days(values, "posts", _day_ordinals(chunk["created_at"]))
+    for chunk in travel_mates:
+        add("travel_mates", len(chunk))
+        is_open = (chunk["status"].astype(str) == "open").sum()
+        add("travel_open", is_open)
+        add("travel_closed", len(chunk) - is_open)
+        _add_days(values, "travel_mates", _day_ordinals(chunk["created_at"]))
+    likers = set()
+    for pairs in likes:
+        likers.update(user_id for user_id, _ in pairs)
+    add("active_likers", len(likers))
+    return values
+
+
+class CommunityStats:
+    """
+    합계/일별 카운터 (여러 프로세스 공유)
+
+    스냅샷 위에 스트림의 최신 값을 덮어 읽는다. 갱신은 스트림 잠금 안에서
+    현재 값에 더한 절대값을 쓰므로 여러 프로세스가 동시에 더해도 잃지 않는다.
+    """
+
+    def __init__(self, path: str = STATS_FILE, counters_path: str = STATS_COUNTERS_FILE):
+        self.path = path
+        self._log = CounterLog("stats", counters_path)
+        self._snapshot = {}
+        self._snapshot_sig = None
+
+    # -- 스냅샷 ----------------------------------------------------------------
+
+    def _load_snapshot(self) -> bool:
+        """바뀌었으면 다시 읽는다 - 스냅샷이 없으면 False (스트림 잠금 안에서)"""
+        sig = _file_signature(self.path)
+        if sig is None:
+            self._snapshot, self._snapshot_sig = {}, None
+            return False
+        if sig != self._snapshot_sig:
+            with open(self.path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+            self._snapshot = {name: {int(key): int(value) for key, value in by_key.items()}
+                              for name, by_key in raw.items()}
+            self._snapshot_sig = sig
+        return True
+
+    def _store(self, values: dict) -> None:
+        """values를 새 스냅샷으로 쓰고 스트림을 비운다 (스트림 잠금 안에서)"""
+        atomic_write(self.path, lambda f: f.write(json.dumps(values)))
+        self._log.clear()
+        self._snapshot, self._snapshot_sig = values, _file_signature(self.path)
+
+    def _value(self, name: str, key: int) -> int:
+        value = self._log.value(key, name)
+        return value if value is not None else self._snapshot.get(name, {}).get(key, 0)
+
+    def _rebuild(self, rebuild) -> None:
+        """
+        스냅샷이 없을 때 rebuild()로 계산해 저장 (스트림 잠금 밖에서 호출)
+
+        테이블을 훑는 동안 다른 쓰기가 통계 잠금에서 기다리지 않도록 계산은 잠금 밖에서
+        하고, 그 사이 다른 쪽이 먼저 만들었으면 그 스냅샷을 쓴다.
+        """
+        values = rebuild()
+        with self._log.writing():
+            if not self._load_snapshot():
+                self._store(values)
+
+    def _fold(self) -> None:
+        values = {name: dict(by_key) for name, by_key in self._snapshot.items()}
+        for name, by_key in self._log.values.items():
+            values.setdefault(name, {}).update(by_key)
+        self._store(values)
+
+    # -- 갱신 ------------------------------------------------------------------
+
+    def record(self, events, rebuild) -> None:
+        """
+        events: (이름, 증감, 날짜 또는 None) - 날짜가 있고 증가면 그날의 일별 집계에도 더한다
+        (좋아요 취소 같은 감소는 합계에만 - 일별 집계는 그날 일어난 일의 수)
+
+        아직 스냅샷이 없으면 rebuild()로 테이블에서 계산해 두고 events는 버린다
+        (rebuild가 읽는 테이블에는 이미 이번 변경이 들어 있다).
+        """
+        with self._log.writing():
+            if self._load_snapshot():
+                self._record(events)
+                return
+        self._rebuild(rebuild)
+
+    def _record(self, events) -> None:
+        """events를 스트림에 덧붙인다 (스트림 잠금 안에서)"""
+        deltas = {}
+        for name, delta, day in events:
+            if not delta:
+                continue
+            keys = [TOTAL]
+            if day is not None and name in DAILY and delta > 0:
+                keys.append(_ordinal(day))
+            for key in keys:
+                deltas[key, name] = deltas.get((key, name), 0) + int(delta)
+        self._log.append_many(
+            (key, name, delta, self._value(name, key) + delta)
+            for (key, name), delta in deltas.items() if delta
+        )
+        if self._log.records >= STATS_FOLD_RECORDS:
+            self._fold()
+
+    def replace(self, values: dict) -> None:
+        """다시 계산한 통계로 통째로 바꾼다 (유지보수 reindex)"""
+        with self._log.writing():
+            self._store(values)
+
+    # -- 조회 ------------------------------------------------------------------
+
+    def read(self, days: int, rebuild, today: date = None) -> tuple:
+        """
+        (합계 {이름: 값}, 최근 days일의 일별 집계 DataFrame (날짜 × DAILY 이름))
+
+        스냅샷/스트림에서 새로 붙은 부분만 읽으므로 테이블 크기와 상관없다.
+        """
+        with self._log.writing():
+            ready = self._load_snapshot()
+        if not ready:
+            self._rebuild(rebuild)
+        with self._log.writing():
+            self._load_snapshot()
+            totals = {name: self._value(name, TOTAL) for name in TOTALS}
+            last = (today or date.today()).toordinal()
+            ordinals = range(last - days + 1, last + 1)
+            series = pd.DataFrame(
+                {name: [self._value(name, key) for key in ordinals] for name in DAILY},
+                index=pd.DatetimeIndex([date.fromordinal(key) for key in ordinals]),
+            )
+        return totals, series
+
+
+# 프로세스 전체에서 공유
+community = CommunityStats()
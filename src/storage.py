@@ -0,0 +1,1925 @@
+import pandas as pd
+import numpy as np
+import itertools
+import json
+import mmap
+import os
+import sqlite3
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from . import metrics
+from .columnar import COLUMNAR_TABLES, open_columns, write_columns
+
+try:
+    import fcntl
+except ImportError:  # Windows 등 - 프로세스 내 잠금만 사용
+    fcntl = None
+
+# 데이터 파일 경로
+DATA_DIR = "data"
+USER_LIKES_FILE = os.path.join(DATA_DIR, "user_likes.json")
+SQLITE_FILE = os.path.join(DATA_DIR, "community.db")
+
+# 저장소 백엔드 선택 (csv | sqlite | log)
+STORAGE_BACKEND = os.environ.get("COMMUNITY_STORAGE", "csv")
+
+# 테이블 정의: CSV 파일, 기본키, 컬럼 순서
+TABLES = {
+    "users": {
+        "file": os.path.join(DATA_DIR, "users.csv"),
+        "key": "user_id",
+        "columns": ["user_id", "username", "password_sha256", "email",
+                    "country", "city_in_korea", "joined_at"],
+    },
+    "posts": {
+        "file": os.path.join(DATA_DIR, "posts.csv"),
+        "key": "post_id",
+        "columns": ["post_id", "user_id", "content", "tags",
+                    "created_at", "likes", "reposts"],
+    },
+    "travel_mates": {
+        "file": os.path.join(DATA_DIR, "travel_mates.csv"),
+        "key": "mate_id",
+        "columns": ["mate_id", "user_id", "title", "departure_city", "destination_city",
+                    "date_from", "date_to", "budget_range_krw", "preferred_transport",
+                    "contact", "notes", "status", "created_at"],
+    },
+    # 게시글↔태그 정규화 매핑 (기본키 없이 (post_id, tag) 쌍으로 관리)
+    "post_tags": {
+        "file": os.path.join(DATA_DIR, "post_tags.csv"),
+        "key": None,
+        "columns": ["post_id", "tag"],
+    },
+    # 게시글 첨부 이미지 (원본 SHA-256, position 순서로 보여준다 - 파일은 src/images.py)
+    "post_images": {
+        "file": os.path.join(DATA_DIR, "post_images.csv"),
+        "key": None,
+        "columns": ["post_id", "position", "image"],
+    },
+}
+
+# 자주 바뀌는 카운터 컬럼 - CSV 백엔드에서는 변경 스트림으로 따로 쌓는다
+COUNTER_COLUMNS = {"posts": ("likes", "reposts")}
+
+# 카운터 스트림을 테이블에 반영(materialize)하는 주기: 레코드 수 / 초
+COUNTER_FLUSH_RECORDS = int(os.environ.get("COMMUNITY_COUNTER_FLUSH_RECORDS", 500))
+COUNTER_FLUSH_SECONDS = float(os.environ.get("COMMUNITY_COUNTER_FLUSH_SECONDS", 60))
+
+# 테이블을 나눠 읽고 쓸 때 한 조각의 행 수 (백엔드 간 이전, 유지보수 도구)
+SCAN_CHUNK_ROWS = int(os.environ.get("COMMUNITY_SCAN_CHUNK_ROWS", 50_000))
+
+
+def _table_file(table: str) -> str:
+    """테이블이 저장되는 파일 경로 (좋아요는 JSON 파일)"""
+    if table == "likes":
+        return USER_LIKES_FILE
+    return TABLES[table]["file"]
+
+
+def _file_signature(path: str):
+    """파일 식별자 (inode, 수정 시각, 크기) - 없으면 None"""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _columnar_dir(table: str) -> str:
+    return os.path.splitext(TABLES[table]["file"])[0] + ".col"
+
+
+def _json_default(value):
+    # numpy 스칼라 등은 파이썬 기본 타입으로 변환
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+# =============================================================================
+# 안전한 파일 쓰기 (잠금 + 원자적 교체 + 그룹 커밋)
+# =============================================================================
+
+_path_locks = {}
+_path_locks_guard = threading.Lock()
+_lock_state = threading.local()
+
+
+@contextmanager
+def file_lock(path: str):
+    """
+    path 단위 배타 잠금 (다른 프로세스와는 path.lock 파일의 advisory lock)
+
+    같은 스레드에서 다시 잡아도 교착되지 않는다.
+    """
+    with _path_locks_guard:
+        thread_lock = _path_locks.setdefault(path, threading.RLock())
+    depths = getattr(_lock_state, "depths", None)
+    if depths is None:
+        depths = _lock_state.depths = {}
+
+    with thread_lock:
+        if depths.get(path, 0) > 0:
+            depths[path] += 1
+            try:
+                yield
+            finally:
+                depths[path] -= 1
+            return
+
+        lock_file = open(path + ".lock", "a") if fcntl is not None else None
+        try:
+            if lock_file is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            depths[path] = 1
+            try:
+                yield
+            finally:
+                depths[path] = 0
+        finally:
+            if lock_file is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+                lock_file.close()
+
+
+def _holds_file_lock(path: str) -> bool:
+    """이 스레드가 path의 file_lock을 잡고 있는지"""
+    return getattr(_lock_state, "depths", {}).get(path, 0) > 0
+
+
+def atomic_write(path: str, write) -> None:
+    """
+    임시 파일에 쓰고 fsync 후 교체 - 읽는 쪽은 항상 완전한 이전/새 파일만 본다
+
+    write는 열린 텍스트 파일을 받아 내용을 쓰는 함수.
+    """
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+            metrics.count_io("written", os.fstat(f.fileno()).st_size)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    if hasattr(os, "O_DIRECTORY"):
+        # 이름 교체 자체도 디스크에 남도록 디렉토리 fsync
+        dir_fd = os.open(os.path.dirname(path) or ".", os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+class _PendingChange:
+    __slots__ = ("apply", "done", "result", "error")
+
+    def __init__(self, apply):
+        self.apply = apply
+        self.done = False
+        self.result = None
+        self.error = None
+
+
+class GroupCommit:
+    """
+    한 파일에 대한 읽기-수정-쓰기를 묶어 처리하는 커밋 큐
+
+    변경은 apply(state) -> (새 state 또는 변경 없으면 None, 결과) 함수로 제출한다.
+    먼저 잠금을 잡은 스레드가 그때까지 쌓인 변경을 모두 꺼내, 파일을 한 번 읽고
+    순서대로 적용한 뒤 한 번만 쓴다. 나머지 스레드는 자기 변경이 끝났음을
+    확인하고 바로 돌아가므로, 클릭이 몰려도 클릭 수만큼 전체를 다시 쓰지 않는다.
+    """
+
+    def __init__(self, path: str, load, save, on_error=None):
+        self.path = path
+        self.load = load
+        self.save = save
+        self.on_error = on_error
+        self._pending = []
+        self._pending_lock = threading.Lock()
+        self._leader_lock = threading.Lock()
+
+    def submit(self, apply):
+        change = _PendingChange(apply)
+        if _holds_file_lock(self.path):
+            # 호출자가 이미 파일 잠금을 잡고 있으면 (Storage.write_lock) 리더를 기다리지 않고
+            # 바로 적용한다 - 리더가 그 잠금을 기다리는 중일 수 있다
+            self._commit([change])
+        else:
+            with self._pending_lock:
+                self._pending.append(change)
+            with self._leader_lock:
+                if not change.done:
+                    with self._pending_lock:
+                        batch, self._pending = self._pending, []
+                    self._commit(batch)
+        if change.error is not None:
+            raise change.error
+        return change.result
+
+    def _commit(self, batch: list) -> None:
+        try:
+            with file_lock(self.path):
+                state = self.load()
+                changed = False
+                for change in batch:
+                    try:
+                        new_state, change.result = change.apply(state)
+                    except Exception as e:
+                        change.error = e
+                        continue
+                    if new_state is not None:
+                        state, changed = new_state, True
+                if changed:
+                    self.save(state)
+        except Exception as e:
+            if self.on_error is not None:
+                self.on_error()
+            for change in batch:
+                if change.error is None:
+                    change.error = e
+        finally:
+            for change in batch:
+                change.done = True
+
+
+# =============================================================================
+# 카운터 변경 스트림 (좋아요/리포스트 수)
+# =============================================================================
+
+def _counter_path(table: str) -> str:
+    return os.path.splitext(TABLES[table]["file"])[0] + ".counters"
+
+
+class CounterLog:
+    """
+    카운터 컬럼 변경 스트림 (data/<table>.counters)
+
+    한 줄에 {"key", "column", "delta", "value"} 레코드 하나를 덧붙이고,
+    읽을 때는 키·컬럼별 마지막 value를 테이블 위에 덮어쓴다. value가 절대값이라
+    같은 레코드를 두 번 적용해도 결과가 같으므로, 테이블에 반영한 뒤 스트림을
+    비우기 전에 죽어도 숫자가 틀어지지 않는다.
+    """
+
+    def __init__(self, table: str, path: str = None):
+        self.table = table
+        self.path = path or _counter_path(table)
+        self._lock = threading.RLock()
+        self._reset(None)
+
+    def _reset(self, ino) -> None:
+        self.values = {}
+        self.records = 0
+        self.offset = 0
+        self.ino = ino
+        self.first_at = None
+
+    def refresh(self) -> None:
+        """파일에 새로 붙은 레코드만 읽어 반영"""
+        with self._lock:
+            sig = _file_signature(self.path)
+            if sig is None:
+                if self.records:
+                    self._reset(None)
+                return
+            if sig[0] != self.ino or sig[2] < self.offset:
+                self._reset(sig[0])
+            if sig[2] == self.offset:
+                return
+            start = self.offset
+            with open(self.path, "rb") as f:
+                f.seek(self.offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # 아직 쓰는 중인 마지막 줄은 다음에 읽는다
+                    self.offset += len(line)
+                    self._apply_record(json.loads(line))
+            metrics.count_io("read", self.offset - start)
+
+    def _apply_record(self, record: dict) -> None:
+        self.values.setdefault(record["column"], {})[int(record["key"])] = int(record["value"])
+        self.records += 1
+        if self.first_at is None:
+            self.first_at = time.monotonic()
+
+    @contextmanager
+    def writing(self):
+        """프로세스 내 잠금 + 파일 잠금을 잡고 최신 상태로 맞춘다"""
+        with self._lock, file_lock(self.path):
+            self.refresh()
+            yield
+
+    def value(self, key: int, column: str):
+        return self.values.get(column, {}).get(int(key))
+
+    def append(self, key: int, column: str, delta: int, value: int) -> None:
+        """writing() 안에서 호출"""
+        self.append_many([(key, column, delta, value)])
+
+    def append_many(self, entries) -> None:
+        """(key, column, delta, value) 여러 개를 한 번에 쓰고 fsync도 한 번 (writing() 안에서 호출)"""
+        records = [{"key": int(key), "column": column, "delta": int(delta), "value": int(value)}
+                   for key, column, delta, value in entries]
+        if not records:
+            return
+        data = "".join(json.dumps(record) + "\n" for record in records).encode("utf-8")
+        with open(self.path, "ab") as f:
+            # 쓰다 죽은 프로세스가 남긴 잘린 줄은 잘라내고 이어 쓴다
+            if f.tell() > self.offset:
+                f.truncate(self.offset)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        metrics.count_io("written", len(data))
+        if self.ino is None:
+            self.ino = _file_signature(self.path)[0]
+        self.offset += len(data)
+        for record in records:
+            self._apply_record(record)
+
+    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        """스트림의 최신 값을 덮어쓴 테이블"""
+        key = TABLES[self.table]["key"]
+        with self._lock:
+            for column, values in self.values.items():
+                if not values:
+                    continue
+                hit = df[key].isin(list(values))
+                if hit.any():
+                    df.loc[hit, column] = df.loc[hit, key].map(values)
+        return df
+
+    def clear(self) -> None:
+        """테이블에 반영한 뒤 스트림을 비운다 (writing() 안에서 호출)"""
+        atomic_write(self.path, lambda f: None)
+        self._reset(_file_signature(self.path)[0])
+
+    def due(self) -> bool:
+        """테이블에 반영할 때가 됐는지"""
+        if not self.records:
+            return False
+        return (self.records >= COUNTER_FLUSH_RECORDS
+                or time.monotonic() - self.first_at >= COUNTER_FLUSH_SECONDS)
+
+
+# =============================================================================
+# 테이블 변경 알림 (여러 프로세스가 같은 data/를 쓸 때 캐시 무효화)
+# =============================================================================
+
+# 다른 프로세스의 변경을 아는 방법 (csv/log 백엔드)
+#   shared - 공유 카운터 파일(mmap)의 테이블별 값 (기본, 쓰는 쪽이 올린다)
+#   watch  - 파일 감시(watchdog/inotify) 이벤트로 올리는 프로세스 내 값
+#   stat   - 매번 테이블 파일을 stat
+CHANGE_NOTIFY = os.environ.get("COMMUNITY_CHANGE_NOTIFY", "shared")
+
+CHANGES_FILE = os.path.join(DATA_DIR, "versions.bin")
+
+# 공유 파일의 슬롯 순서 - 파일을 같이 쓰는 모든 프로세스가 같아야 하므로 뒤에만 추가한다
+CHANGE_SLOTS = ("users", "posts", "travel_mates", "post_tags", "likes", "post_images")
+_CHANGES_SIZE = 64 * 8
+
+
+class SharedVersions:
+    """
+    테이블별 변경 카운터를 담은 공유 파일 (int64 슬롯, mmap)
+
+    쓰는 프로세스는 테이블 파일을 바꾼 뒤 슬롯을 1 올리고, 읽는 쪽은 매핑된
+    메모리에서 값만 읽으므로 stat이나 파일 읽기 없이 다른 프로세스의 변경을 안다.
+    """
+
+    def __init__(self, path: str = CHANGES_FILE):
+        self.path = path
+        self._map = None
+        self._lock = threading.Lock()
+
+    def _mapped(self) -> mmap.mmap:
+        if self._map is None:
+            with self._lock, file_lock(self.path):
+                if self._map is None:
+                    with open(self.path, "a+b") as f:
+                        if os.fstat(f.fileno()).st_size < _CHANGES_SIZE:
+                            f.truncate(_CHANGES_SIZE)
+                        self._map = mmap.mmap(f.fileno(), _CHANGES_SIZE)
+        return self._map
+
+    def get(self, table: str) -> int:
+        return struct.unpack_from("<q", self._mapped(), CHANGE_SLOTS.index(table) * 8)[0]
+
+    def bump(self, table: str) -> None:
+        offset = CHANGE_SLOTS.index(table) * 8
+        with file_lock(self.path):
+            shared = self._mapped()
+            struct.pack_into("<q", shared, offset, struct.unpack_from("<q", shared, offset)[0] + 1)
+
+
+class WatchedVersions:
+    """
+    파일 감시 이벤트로 올리는 테이블별 세대 번호 (watchdog 필요)
+
+    공유 카운터를 올리지 않는 쓰기(손으로 고친 CSV 등)까지 잡는다. 이벤트 때의
+    파일 식별자를 모아 두었다가 조회할 때 마지막으로 안 식별자와 다르면 세대를
+    올린다. 이 프로세스가 쓴 직후의 식별자도 기록하므로 자기 쓰기는 건너뛴다.
+    """
+
+    # 내용이 바뀌었을 수 있는 이벤트 (읽기로 생기는 opened/closed_no_write는 제외)
+    EVENT_TYPES = ("created", "modified", "moved", "deleted", "closed")
+
+    def __init__(self, directory: str = DATA_DIR):
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+
+        self._epochs = {}
+        self._seen = {}
+        self._table_paths = {table: self._paths(table) for table in CHANGE_SLOTS}
+        self._known = {
+            path: _file_signature(path) for paths in self._table_paths.values() for path in paths
+        }
+        versions = self
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if event.event_type not in versions.EVENT_TYPES:
+                    return
+                for path in (event.src_path, getattr(event, "dest_path", "")):
+                    if path:
+                        versions._changed(os.path.abspath(path))
+
+        self._observer = Observer()
+        self._observer.daemon = True
+        self._observer.schedule(Handler(), os.path.abspath(directory), recursive=False)
+        self._observer.start()
+
+    @staticmethod
+    def _paths(table: str) -> list:
+        paths = [_table_file(table)]
+        if table in COUNTER_COLUMNS:
+            paths.append(_counter_path(table))
+        if table in LOG_TABLES:
+            paths.append(_log_path(table))
+        return [os.path.abspath(path) for path in paths]
+
+    def _changed(self, path: str) -> None:
+        if any(path in paths for paths in self._table_paths.values()):
+            self._seen[path] = _file_signature(path)
+
+    def get(self, table: str) -> int:
+        for path in self._table_paths[table]:
+            seen = self._seen.pop(path, None)
+            if seen is not None and seen != self._known.get(path):
+                self._known[path] = seen
+                self._epochs[table] = self._epochs.get(table, 0) + 1
+        return self._epochs.get(table, 0)
+
+    def bump(self, table: str) -> None:
+        for path in self._table_paths[table]:
+            self._known[path] = _file_signature(path)
+
+
+def _open_change_versions():
+    """CHANGE_NOTIFY에 맞는 변경 알림 (stat이면 None - 호출자가 파일을 stat)"""
+    if CHANGE_NOTIFY == "watch":
+        try:
+            return WatchedVersions()
+        except ImportError:
+            print("watchdog이 없어 파일 stat으로 변경을 확인합니다.")
+            return None
+    if CHANGE_NOTIFY == "shared":
+        return SharedVersions()
+    return None
+
+
+# =============================================================================
+# 저장소 인터페이스
+# =============================================================================
+
+class Storage:
+    """
+    테이블 단위 저장소 인터페이스
+
+    data.py의 공개 함수들은 이 인터페이스만 사용하므로
+    백엔드를 바꿔도 함수 시그니처는 그대로 유지된다.
+    """
+
+    def __init__(self):
+        self._write_counts = {}
+        self._changes = None
+
+    def version(self, table: str):
+        """캐시 검증용 테이블 버전 - 테이블이 바뀌면 값도 바뀐다"""
+        return self._write_counts.get(table, 0)
+
+    def _bump(self, table: str) -> None:
+        self._write_counts[table] = self._write_counts.get(table, 0) + 1
+        if self._changes is not None:
+            self._changes.bump(table)
+
+    def load(self, table: str):
+        """테이블 전체를 DataFrame으로 반환 (없으면 None)"""
+        raise NotImplementedError
+
+    def save(self, table: str, df: pd.DataFrame) -> None:
+        """테이블 전체를 덮어쓰기 (기본 데이터 생성용)"""
+        raise NotImplementedError
+
+    def insert(self, table: str, row: dict) -> int:
+        """행 추가 후 새로 부여한 기본키 반환"""
+        raise NotImplementedError
+
+    def update(self, table: str, key: int, fields: dict) -> bool:
+        """기본키로 한 행의 일부 컬럼 수정"""
+        raise NotImplementedError
+
+    def increment(self, table: str, key: int, column: str, delta: int, floor=None):
+        """숫자 컬럼 증감 후 새 값 반환 (행이 없으면 None)"""
+        raise NotImplementedError
+
+    def delete(self, table: str, key: int) -> bool:
+        """기본키로 한 행 삭제"""
+        raise NotImplementedError
+
+    def insert_rows(self, table: str, rows: list) -> list:
+        """행 여러 개를 한 번에 추가하고 새로 부여한 (연속된) 기본키 목록 반환"""
+        return [self.insert(table, row) for row in rows]
+
+    def insert_many(self, table: str, rows: list) -> None:
+        """기본키가 없는 매핑 테이블에 여러 행 추가"""
+        raise NotImplementedError
+
+    def delete_where(self, table: str, column: str, value) -> None:
+        """컬럼 값이 일치하는 행 모두 삭제"""
+        raise NotImplementedError
+
+    def load_likes(self) -> dict:
+        """사용자별 좋아요 집합 {user_id: {post_id, ...}}"""
+        raise NotImplementedError
+
+    def save_likes(self, user_likes: dict) -> None:
+        raise NotImplementedError
+
+    def liked_post_ids(self, user_id: int) -> set:
+        """사용자가 좋아요 한 게시글 ID 집합"""
+        return self.load_likes().get(int(user_id), set())
+
+    def post_likers(self, post_id: int) -> set:
+        """게시글을 좋아요 한 사용자 ID 집합"""
+        return {u for u, posts in self.load_likes().items() if int(post_id) in posts}
+
+    def post_likers_many(self, post_ids) -> dict:
+        """게시글 ID 목록 → {post_id: 좋아요 한 사용자 ID 집합} (좋아요가 있는 게시글만, 한 번에 조회)"""
+        wanted = {int(post_id) for post_id in post_ids}
+        likers = {}
+        for user_id, posts in self.load_likes().items():
+            for post_id in wanted.intersection(posts):
+                likers.setdefault(post_id, set()).add(user_id)
+        return likers
+
+    def is_liked(self, post_id: int, user_id: int) -> bool:
+        return int(post_id) in self.liked_post_ids(user_id)
+
+    def set_like(self, post_id: int, user_id: int, liked: bool) -> None:
+        user_likes = self.load_likes()
+        liked_posts = user_likes.setdefault(int(user_id), set())
+        if liked:
+            liked_posts.add(int(post_id))
+        else:
+            liked_posts.discard(int(post_id))
+        self.save_likes(user_likes)
+
+    def remove_post_likes(self, post_id: int) -> None:
+        user_likes = self.load_likes()
+        for liked_posts in user_likes.values():
+            liked_posts.discard(int(post_id))
+        self.save_likes(user_likes)
+
+    def page(self, table: str, column: str, cursor, limit: int):
+        """
+        (column, 기본키) 내림차순 키셋 페이지 (페이지 DataFrame, next_cursor)
+
+        백엔드가 직접 지원하지 않으면 None을 반환하고, 호출자가
+        캐시된 테이블에서 페이지를 고른다.
+        """
+        return None
+
+    def keys_by_user(self, table: str, user_id: int):
+        """
+        user_id가 쓴 행의 기본키 목록 (오름차순)
+
+        user_id 인덱스가 있는 백엔드만 지원하고, 아니면 None (호출자가 캐시된
+        테이블에서 만든 보조 색인을 쓴다).
+        """
+        return None
+
+    def rows(self, table: str, keys: list):
+        """
+        기본키 목록 순서대로 행 DataFrame (없는 키는 건너뜀)
+
+        백엔드가 직접 지원하지 않으면 None을 반환하고, 호출자가
+        캐시된 테이블에서 고른다.
+        """
+        return None
+
+    def sort_keys(self, table: str, column: str):
+        """
+        전체 테이블 행 순서대로 (기본키 배열, int64 정렬키 배열)
+
+        컬럼형 스냅샷처럼 정렬키를 바로 꺼낼 수 있는 백엔드만 지원하고,
+        아니면 None (호출자가 DataFrame 컬럼에서 정렬키를 만든다).
+        """
+        return None
+
+    def scan(self, table: str, chunk_size: int = SCAN_CHUNK_ROWS):
+        """
+        테이블을 chunk_size행 이하의 DataFrame 조각으로 차례로 반환 (없으면 아무것도 없음)
+
+        기본 구현은 전체를 읽어서 자른다. 파일/DB에서 바로 나눠 읽을 수 있는
+        백엔드는 메모리에 한 조각만 올리도록 다시 구현한다.
+        """
+        df = self.load(table)
+        if df is None:
+            return
+        for start in range(0, len(df), chunk_size):
+            yield df.iloc[start:start + chunk_size]
+
+    def replace(self, table: str, chunks) -> int:
+        """테이블 전체를 DataFrame 조각들로 바꿔 쓰고 행 수 반환 (save의 조각 단위판)"""
+        frames = list(chunks)
+        if frames:
+            df = pd.concat(frames, ignore_index=True)
+        else:
+            df = pd.DataFrame(columns=TABLES[table]["columns"])
+        self.save(table, df)
+        return len(df)
+
+    def scan_likes(self, chunk_size: int = SCAN_CHUNK_ROWS):
+        """좋아요 (user_id, post_id) 쌍을 chunk_size개 이하의 목록으로 차례로 반환"""
+        pairs = [
+            (user_id, post_id)
+            for user_id, post_ids in sorted(self.load_likes().items())
+            for post_id in sorted(post_ids)
+        ]
+        for start in range(0, len(pairs), chunk_size):
+            yield pairs[start:start + chunk_size]
+
+    def replace_likes(self, chunks) -> int:
+        """좋아요 전체를 (user_id, post_id) 쌍 목록들로 바꿔 쓰고 쌍 수 반환"""
+        user_likes = {}
+        for pairs in chunks:
+            for user_id, post_id in pairs:
+                user_likes.setdefault(int(user_id), set()).add(int(post_id))
+        self.save_likes(user_likes)
+        return sum(len(post_ids) for post_ids in user_likes.values())
+
+    @contextmanager
+    def transaction(self):
+        """여러 변경을 하나로 묶는 구간 (백엔드가 지원할 때만 의미 있음)"""
+        yield
+
+    def write_lock(self, table: str):
+        """
+        테이블 쓰기 잠금을 잡은 구간 - 안에서 읽은 version()과 쓰기 사이에 다른 프로세스의 쓰기가 끼지 않는다
+
+        쓰기 전후 버전으로 파생 뷰를 증분 갱신할 때 쓴다. 같은 스레드의 쓰기는 안에서 그대로 된다.
+        기본은 transaction() (SQLite는 BEGIN IMMEDIATE가 DB 쓰기 잠금).
+        """
+        return self.transaction()
+
+
+# =============================================================================
+# 좋아요 양방향 색인
+# =============================================================================
+
+class LikeIndex:
+    """
+    사용자→게시글, 게시글→사용자 좋아요 색인
+
+    두 방향을 항상 함께 갱신하므로 게시글 삭제나 "좋아요 한 사람" 조회가
+    전체 좋아요를 훑지 않고 해당 게시글의 좋아요 수만큼만 일한다.
+    """
+
+    def __init__(self, user_likes: dict = None):
+        self.by_user = {}
+        self.by_post = {}
+        for user_id, post_ids in (user_likes or {}).items():
+            for post_id in post_ids:
+                self.add(user_id, post_id)
+
+    def add(self, user_id: int, post_id: int) -> None:
+        self.by_user.setdefault(int(user_id), set()).add(int(post_id))
+        self.by_post.setdefault(int(post_id), set()).add(int(user_id))
+
+    def remove(self, user_id: int, post_id: int) -> None:
+        user_id, post_id = int(user_id), int(post_id)
+        self.by_user.get(user_id, set()).discard(post_id)
+        self.by_post.get(post_id, set()).discard(user_id)
+        if not self.by_user.get(user_id, True):
+            del self.by_user[user_id]
+        if not self.by_post.get(post_id, True):
+            del self.by_post[post_id]
+
+    def remove_post(self, post_id: int) -> set:
+        """게시글의 좋아요를 모두 지우고 영향받은 사용자 ID를 반환"""
+        likers = self.by_post.pop(int(post_id), set())
+        for user_id in likers:
+            self.by_user[user_id].discard(int(post_id))
+            if not self.by_user[user_id]:
+                del self.by_user[user_id]
+        return likers
+
+    def to_dict(self) -> dict:
+        return {user_id: set(post_ids) for user_id, post_ids in self.by_user.items()}
+
+
+# =============================================================================
+# CSV 백엔드 (기존 동작)
+# =============================================================================
+
+class CsvStorage(Storage):
+    """
+    CSV/JSON 파일 백엔드 - 변경 시마다 파일 전체를 다시 쓴다
+
+    모든 쓰기는 파일 잠금 + 임시 파일 + 원자적 교체로 이뤄지고,
+    동시에 들어온 변경은 GroupCommit으로 묶여 한 번만 다시 쓴다.
+    좋아요/리포스트 수(COUNTER_COLUMNS)는 CounterLog에 한 줄씩 쌓고
+    주기적으로만 CSV에 반영하므로, 인기 게시글이 전체 다시 쓰기를 부르지 않는다.
+    COMMUNITY_COLUMNAR에 든 테이블은 CSV를 쓸 때마다 컬럼형 스냅샷도 함께 써서,
+    읽을 때는 CSV 파싱 대신 mmap으로 연다.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._likes = None
+        self._likes_sig = None
+        self._likes_lock = threading.RLock()
+        self._commits = {}
+        self._commits_lock = threading.Lock()
+        self._counters = {table: CounterLog(table) for table in COUNTER_COLUMNS}
+        self._counter_bases = {}
+        self._folding = set()
+        self._columnar_enabled = COLUMNAR_TABLES
+        self._columnar_tables = {}
+        self._changes = _open_change_versions()
+
+    def _group(self, table: str) -> "GroupCommit":
+        with self._commits_lock:
+            if table not in self._commits:
+                if table == "likes":
+                    self._commits[table] = GroupCommit(
+                        USER_LIKES_FILE, self._like_index, self._write_likes, self._reset_likes
+                    )
+                else:
+                    self._commits[table] = GroupCommit(
+                        TABLES[table]["file"], lambda: self.load(table),
+                        lambda df: self._write_table(table, df, fold=True)
+                    )
+            return self._commits[table]
+
+    @contextmanager
+    def write_lock(self, table: str):
+        # 테이블 파일 잠금 (카운터 컬럼이 있으면 카운터 스트림 잠금도) - _write_table과 같은 순서
+        path = USER_LIKES_FILE if table == "likes" else TABLES[table]["file"]
+        with file_lock(path):
+            counters = self._counters.get(table)
+            if counters is None:
+                yield
+            else:
+                with counters.writing():
+                    yield
+
+    def version(self, table: str):
+        if self._changes is not None:
+            # 다른 프로세스의 쓰기는 변경 알림으로, 이 프로세스의 쓰기는 쓰기 카운터로
+            return (self._changes.get(table), super().version(table))
+        if table in self._counters:
+            return (_file_signature(_table_file(table)),
+                    _file_signature(_counter_path(table)), super().version(table))
+        return (_file_signature(_table_file(table)), super().version(table))
+
+    def load(self, table: str):
+        path = TABLES[table]["file"]
+        if not os.path.exists(path):
+            return None
+        df = self._load_columnar(table)
+        if df is None:
+            df = self._read_csv(table)
+        if table in self._counters:
+            counters = self._counters[table]
+            counters.refresh()
+            df = counters.apply(df)
+        return df
+
+    def _read_csv(self, table: str) -> pd.DataFrame:
+        path = TABLES[table]["file"]
+        if table not in self._columnar_enabled:
+            metrics.count_file_read(path)
+            return pd.read_csv(path)
+        # 컬럼형 스냅샷이 없거나 낡았으면 읽은 김에 다시 만든다 (쓰기와 겹치지 않게 잠금)
+        with file_lock(path):
+            metrics.count_file_read(path)
+            df = pd.read_csv(path)
+            self._write_columnar(table, df)
+        return df
+
+    # -- 컬럼형 스냅샷 ---------------------------------------------------------
+
+    def _columnar(self, table: str):
+        """현재 CSV와 내용이 같은 컬럼형 스냅샷 (없거나 CSV가 더 새로우면 None)"""
+        if table not in self._columnar_enabled:
+            return None
+        directory = _columnar_dir(table)
+        current_sig = _file_signature(os.path.join(directory, "CURRENT"))
+        entry = self._columnar_tables.get(table)
+        if entry is None or entry[0] != current_sig:
+            entry = (current_sig, open_columns(directory) if current_sig else None)
+            self._columnar_tables[table] = entry
+        columns = entry[1]
+        if columns is None or columns.source != _file_signature(TABLES[table]["file"]):
+            return None
+        return columns
+
+    def _load_columnar(self, table: str):
+        columns = self._columnar(table)
+        if columns is None:
+            return None
+        try:
+            df = columns.frame()
+        except (OSError, ValueError):
+            return None  # 다른 프로세스가 새 세대로 바꾸며 지운 경우 - CSV로 읽는다
+        metrics.count_io("read", columns.blob_bytes())
+        return df
+
+    def _write_columnar(self, table: str, df: pd.DataFrame) -> None:
+        if table not in self._columnar_enabled:
+            return
+        directory = _columnar_dir(table)
+        os.makedirs(directory, exist_ok=True)
+        write_columns(directory, table, df, _file_signature(TABLES[table]["file"]))
+
+    def sort_keys(self, table: str, column: str):
+        columns = self._columnar(table)
+        if columns is None:
+            return None
+        try:
+            keys = columns.sort_key(column)
+            ids = columns.array(TABLES[table]["key"])
+        except (OSError, ValueError):
+            return None
+        if keys is None:
+            return None
+
+        # 아직 CSV에 반영되지 않은 카운터 값은 사본 위에 덮어쓴다
+        counters = self._counters.get(table)
+        if counters is not None:
+            counters.refresh()
+            pending = counters.values.get(column)
+            if pending:
+                positions = pd.Index(ids).get_indexer(list(pending))
+                found = positions >= 0
+                keys = np.array(keys)
+                keys[positions[found]] = np.fromiter(pending.values(), dtype="int64")[found]
+        return ids, keys
+
+    def _write_table(self, table: str, df: pd.DataFrame, fold: bool = False) -> None:
+        """
+        테이블 파일을 원자적으로 교체
+
+        fold=True면 그 사이 쌓인 카운터 스트림 값을 덮어써서 쓰고, 어느 쪽이든
+        쓴 뒤에는 스트림을 비운다 (save()로 통째로 바꾸는 경우 스트림은 버려진다).
+        """
+        path = TABLES[table]["file"]
+        counters = self._counters.get(table)
+        if counters is None:
+            atomic_write(path, lambda f: df.to_csv(f, index=False))
+            self._write_columnar(table, df)
+        else:
+            with counters.writing():
+                if fold:
+                    df = counters.apply(df)
+                atomic_write(path, lambda f: df.to_csv(f, index=False))
+                self._write_columnar(table, df)
+                counters.clear()
+        self._bump(table)
+
+    def save(self, table: str, df: pd.DataFrame) -> None:
+        with file_lock(TABLES[table]["file"]):
+            self._write_table(table, df)
+
+    def scan(self, table: str, chunk_size: int = SCAN_CHUNK_ROWS):
+        path = TABLES[table]["file"]
+        if not os.path.exists(path):
+            return
+        counters = self._counters.get(table)
+        if counters is not None:
+            counters.refresh()
+        metrics.count_file_read(path)
+        with pd.read_csv(path, chunksize=chunk_size) as reader:
+            for chunk in reader:
+                yield counters.apply(chunk) if counters is not None else chunk
+
+    def replace(self, table: str, chunks) -> int:
+        """
+        조각을 차례로 임시 파일에 이어 쓴 뒤 한 번에 교체 (카운터 스트림은 비운다)
+
+        chunks가 같은 파일을 scan()하는 중이어도 된다 - 교체는 다 읽은 뒤에 일어난다.
+        컬럼형 스냅샷은 원본과 어긋나게 되므로 다음에 읽을 때 다시 만들어진다.
+        """
+        path = TABLES[table]["file"]
+        counters = self._counters.get(table)
+        rows = 0
+
+        def write(f):
+            nonlocal rows
+            order = None
+            for chunk in chunks:
+                # 컬럼 순서는 첫 조각을 따른다 (헤더는 한 번만)
+                header = order is None
+                order = order or list(chunk.columns)
+                chunk.reindex(columns=order).to_csv(f, index=False, header=header)
+                rows += len(chunk)
+            if order is None:
+                pd.DataFrame(columns=TABLES[table]["columns"]).to_csv(f, index=False)
+
+        with file_lock(path):
+            if counters is None:
+                atomic_write(path, write)
+            else:
+                with counters.writing():
+                    atomic_write(path, write)
+                    counters.clear()
+        self._bump(table)
+        return rows
+
+    def insert(self, table: str, row: dict) -> int:
+        key = TABLES[table]["key"]
+
+        def apply(df):
+            if df is None:
+                df = pd.DataFrame(columns=TABLES[table]["columns"])
+            new_id = int(df[key].max()) + 1 if len(df) > 0 else 1
+            new_row = pd.DataFrame([{key: new_id, **row}])
+            return pd.concat([df, new_row], ignore_index=True), new_id
+
+        return self._group(table).submit(apply)
+
+    def update(self, table: str, key: int, fields: dict) -> bool:
+        def apply(df):
+            if df is None:
+                return None, False
+            mask = df[TABLES[table]["key"]] == key
+            if not mask.any():
+                return None, False
+            for column, value in fields.items():
+                df.loc[mask, column] = value
+            return df, True
+
+        return self._group(table).submit(apply)
+
+    def increment(self, table: str, key: int, column: str, delta: int, floor=None):
+        if column in COUNTER_COLUMNS.get(table, ()):
+            return self._increment_counter(table, key, column, delta, floor)
+
+        def apply(df):
+            if df is None:
+                return None, None
+            mask = df[TABLES[table]["key"]] == key
+            if not mask.any():
+                return None, None
+            value = int(df.loc[mask, column].iloc[0]) + delta
+            if floor is not None:
+                value = max(floor, value)
+            df.loc[mask, column] = value
+            return df, value
+
+        return self._group(table).submit(apply)
+
+    def _counter_base(self, table: str):
+        """CSV에 반영된 카운터 값 (키 인덱스) - 파일이 바뀔 때만 다시 읽는다"""
+        path = TABLES[table]["file"]
+        sig = _file_signature(path)
+        entry = self._counter_bases.get(table)
+        if entry is None or entry[0] != sig:
+            if sig is None:
+                return None
+            key = TABLES[table]["key"]
+            columns, base = self._columnar(table), None
+            if columns is not None:
+                # 매핑된 배열을 그대로 인덱스/컬럼으로 쓴다
+                try:
+                    base = pd.DataFrame(
+                        {c: columns.array(c) for c in COUNTER_COLUMNS[table]},
+                        index=pd.Index(columns.array(key), name=key), copy=False,
+                    )
+                except (OSError, ValueError):
+                    base = None
+            if base is None:
+                metrics.count_file_read(path)
+                base = pd.read_csv(path, usecols=[key, *COUNTER_COLUMNS[table]], index_col=key)
+            entry = self._counter_bases[table] = (sig, base)
+        return entry[1]
+
+    def _increment_counter(self, table: str, key: int, column: str, delta: int, floor=None):
+        counters = self._counters[table]
+        with counters.writing():
+            current = counters.value(key, column)
+            if current is None:
+                base = self._counter_base(table)
+                if base is None or key not in base.index:
+                    return None
+                current = base.at[key, column]
+                current = 0 if pd.isna(current) else int(current)
+            value = current + delta
+            if floor is not None:
+                value = max(floor, value)
+            counters.append(key, column, value - current, value)
+            due = counters.due()
+            # 잠금 안에서 올려야 write_lock 안에서 읽은 버전에 이 쓰기가 들어간다
+            self._bump(table)
+        if due:
+            self._schedule_fold(table)
+        return value
+
+    def _schedule_fold(self, table: str) -> None:
+        with self._commits_lock:
+            if table in self._folding:
+                return
+            self._folding.add(table)
+        threading.Thread(target=self.fold_counters, args=(table,), daemon=True).start()
+
+    def fold_counters(self, table: str) -> None:
+        """쌓인 카운터 스트림을 테이블 파일에 반영하고 스트림을 비운다"""
+        try:
+            counters = self._counters.get(table)
+            if counters is None:
+                return
+            counters.refresh()
+            if counters.records:
+                self._group(table).submit(lambda df: (df, None))
+        finally:
+            self._folding.discard(table)
+
+    def delete(self, table: str, key: int) -> bool:
+        def apply(df):
+            if df is None:
+                return None, False
+            mask = df[TABLES[table]["key"]] == key
+            if not mask.any():
+                return None, False
+            return df[~mask], True
+
+        return self._group(table).submit(apply)
+
+    def insert_rows(self, table: str, rows: list) -> list:
+        if not rows:
+            return []
+        key = TABLES[table]["key"]
+
+        def apply(df):
+            if df is None:
+                df = pd.DataFrame(columns=TABLES[table]["columns"])
+            first_id = int(df[key].max()) + 1 if len(df) > 0 else 1
+            new_ids = list(range(first_id, first_id + len(rows)))
+            new_rows = pd.DataFrame([{key: new_id, **row} for new_id, row in zip(new_ids, rows)])
+            return pd.concat([df, new_rows], ignore_index=True), new_ids
+
+        return self._group(table).submit(apply)
+
+    def insert_many(self, table: str, rows: list) -> None:
+        if not rows:
+            return
+
+        def apply(df):
+            new_rows = pd.DataFrame(rows, columns=TABLES[table]["columns"])
+            return (new_rows if df is None else pd.concat([df, new_rows], ignore_index=True)), None
+
+        self._group(table).submit(apply)
+
+    def delete_where(self, table: str, column: str, value) -> None:
+        def apply(df):
+            if df is None:
+                return None, None
+            mask = df[column] == value
+            return (df[~mask] if mask.any() else None), None
+
+        self._group(table).submit(apply)
+
+    def _read_likes_file(self) -> dict:
+        # 파일에는 {"user_id": [post_id, ...]} 형태로 저장 (예전 문자열 ID도 허용)
+        if os.path.exists(USER_LIKES_FILE):
+            metrics.count_file_read(USER_LIKES_FILE)
+            try:
+                with open(USER_LIKES_FILE, "r", encoding="utf-8") as f:
+                    raw = json.load(f)
+            except (json.JSONDecodeError, FileNotFoundError):
+                return {}
+            return {int(u): {int(p) for p in posts} for u, posts in raw.items()}
+        return {}
+
+    def _like_index(self) -> LikeIndex:
+        """파일이 바뀌었을 때만 다시 읽는 좋아요 색인"""
+        sig = _file_signature(USER_LIKES_FILE)
+        if self._likes is None or sig != self._likes_sig:
+            self._likes = LikeIndex(self._read_likes_file())
+            self._likes_sig = sig
+        return self._likes
+
+    def _write_likes(self, index: LikeIndex = None) -> None:
+        raw = {str(u): sorted(posts) for u, posts in (index or self._likes).by_user.items()}
+        atomic_write(USER_LIKES_FILE, lambda f: json.dump(raw, f, separators=(",", ":")))
+        self._likes_sig = _file_signature(USER_LIKES_FILE)
+        self._bump("likes")
+
+    def _reset_likes(self) -> None:
+        # 쓰기 실패 시 메모리 색인을 버리고 다음에 파일에서 다시 읽는다
+        self._likes = None
+
+    def load_likes(self) -> dict:
+        with self._likes_lock:
+            return self._like_index().to_dict()
+
+    def save_likes(self, user_likes: dict) -> None:
+        with self._likes_lock, file_lock(USER_LIKES_FILE):
+            self._likes = LikeIndex(user_likes)
+            self._write_likes()
+
+    def liked_post_ids(self, user_id: int) -> set:
+        with self._likes_lock:
+            return set(self._like_index().by_user.get(int(user_id), ()))
+
+    def post_likers(self, post_id: int) -> set:
+        with self._likes_lock:
+            return set(self._like_index().by_post.get(int(post_id), ()))
+
+    def post_likers_many(self, post_ids) -> dict:
+        with self._likes_lock:
+            by_post = self._like_index().by_post
+            return {int(post_id): set(by_post[int(post_id)]) for post_id in post_ids
+                    if by_post.get(int(post_id))}
+
+    def set_like(self, post_id: int, user_id: int, liked: bool) -> None:
+        def apply(index):
+            if liked:
+                index.add(user_id, post_id)
+            else:
+                index.remove(user_id, post_id)
+            return index, None
+
+        with self._likes_lock:
+            self._group("likes").submit(apply)
+
+    def remove_post_likes(self, post_id: int) -> None:
+        def apply(index):
+            # 해당 게시글을 좋아요 한 사용자만 갱신
+            return (index if index.remove_post(post_id) else None), None
+
+        with self._likes_lock:
+            self._group("likes").submit(apply)
+
+
+# =============================================================================
+# SQLite 백엔드 (WAL 모드)
+# =============================================================================
+
+# IN (...) 한 번에 넣는 값 수 (오래된 SQLite의 바인드 변수 상한 999 아래로)
+SQLITE_MAX_PARAMS = 900
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    user_id INTEGER PRIMARY KEY,
+    username TEXT NOT NULL,
+    password_sha256 TEXT NOT NULL,
+    email TEXT,
+    country TEXT,
+    city_in_korea TEXT,
+    joined_at TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_users_username ON users(username);
+CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
+
+CREATE TABLE IF NOT EXISTS posts (
+    post_id INTEGER PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    content TEXT,
+    tags TEXT,
+    created_at TEXT,
+    likes INTEGER NOT NULL DEFAULT 0,
+    reposts INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_posts_user ON posts(user_id);
+CREATE INDEX IF NOT EXISTS idx_posts_created ON posts(created_at, post_id);
+CREATE INDEX IF NOT EXISTS idx_posts_likes ON posts(likes, post_id);
+
+CREATE TABLE IF NOT EXISTS travel_mates (
+    mate_id INTEGER PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    title TEXT,
+    departure_city TEXT,
+    destination_city TEXT,
+    date_from TEXT,
+    date_to TEXT,
+    budget_range_krw TEXT,
+    preferred_transport TEXT,
+    contact TEXT,
+    notes TEXT,
+    status TEXT NOT NULL DEFAULT 'open',
+    created_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tms_user ON travel_mates(user_id);
+CREATE INDEX IF NOT EXISTS idx_tms_destination ON travel_mates(destination_city, date_from);
+
+CREATE TABLE IF NOT EXISTS likes (
+    user_id INTEGER NOT NULL,
+    post_id INTEGER NOT NULL,
+    PRIMARY KEY (user_id, post_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_likes_post ON likes(post_id, user_id);
+
+CREATE TABLE IF NOT EXISTS post_tags (
+    post_id INTEGER NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (post_id, tag)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_post_tags_tag ON post_tags(tag, post_id);
+
+CREATE TABLE IF NOT EXISTS post_images (
+    post_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    image TEXT NOT NULL,
+    PRIMARY KEY (post_id, position)
+) WITHOUT ROWID;
+
+-- 기본 데이터가 생성된 테이블 목록 (빈 테이블과 미생성 테이블 구분용)
+CREATE TABLE IF NOT EXISTS seeded_tables (
+    name TEXT PRIMARY KEY
+);
+
+-- 테이블별 쓰기 버전 (캐시 무효화용, 쓰기와 같은 트랜잭션에서 증가)
+CREATE TABLE IF NOT EXISTS table_versions (
+    name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+class SqliteStorage(Storage):
+    """
+    SQLite 임베디드 백엔드
+
+    WAL 모드로 읽기와 쓰기가 서로 막지 않으며, 기본키/인덱스 덕분에
+    한 행 수정과 키 조회 비용이 데이터 크기와 무관하다.
+    """
+
+    def __init__(self, path: str = SQLITE_FILE, import_csv: bool = True):
+        super().__init__()
+        self.path = path
+        self._local = threading.local()
+        is_new = not os.path.exists(path)
+        conn = self._conn()
+        conn.executescript(SQLITE_SCHEMA)
+        if is_new and import_csv:
+            self._import_csv()
+
+    def _conn(self) -> sqlite3.Connection:
+        # Streamlit 세션마다 스레드가 다르므로 스레드별 연결을 사용
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.depth = 0
+        return conn
+
+    def _import_csv(self) -> None:
+        """DB를 처음 만들 때 기존 CSV/JSON 데이터를 옮겨온다 (조각 단위)"""
+        copy_tables(CsvStorage(), self)
+
+    @contextmanager
+    def transaction(self):
+        conn = self._conn()
+        if self._local.depth == 0:
+            conn.execute("BEGIN IMMEDIATE")
+        self._local.depth += 1
+        try:
+            yield
+        except Exception:
+            self._local.depth -= 1
+            if self._local.depth == 0:
+                conn.execute("ROLLBACK")
+            raise
+        else:
+            self._local.depth -= 1
+            if self._local.depth == 0:
+                conn.execute("COMMIT")
+
+    def _touch(self, table: str) -> None:
+        self._conn().execute(
+            "INSERT INTO table_versions (name, version) VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET version = version + 1",
+            (table,),
+        )
+
+    def version(self, table: str):
+        row = self._conn().execute(
+            "SELECT version FROM table_versions WHERE name = ?", (table,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def _mark_seeded(self, table: str) -> None:
+        self._conn().execute("INSERT OR IGNORE INTO seeded_tables (name) VALUES (?)", (table,))
+
+    def load(self, table: str):
+        conn = self._conn()
+        if conn.execute("SELECT 1 FROM seeded_tables WHERE name = ?", (table,)).fetchone() is None:
+            return None
+        columns = ", ".join(TABLES[table]["columns"])
+        return pd.read_sql_query(f"SELECT {columns} FROM {table}", conn)
+
+    def save(self, table: str, df: pd.DataFrame) -> None:
+        self.replace(table, [df])
+
+    def replace(self, table: str, chunks) -> int:
+        count = 0
+        with self.transaction():
+            conn = self._conn()
+            conn.execute(f"DELETE FROM {table}")
+            for df in chunks:
+                columns = [c for c in TABLES[table]["columns"] if c in df.columns]
+                placeholders = ", ".join("?" for _ in columns)
+                rows = df[columns].astype(object).where(df[columns].notna(), None).values.tolist()
+                conn.executemany(
+                    f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", rows
+                )
+                count += len(rows)
+            self._mark_seeded(table)
+            self._touch(table)
+        return count
+
+    def scan(self, table: str, chunk_size: int = SCAN_CHUNK_ROWS):
+        conn = self._conn()
+        if conn.execute("SELECT 1 FROM seeded_tables WHERE name = ?", (table,)).fetchone() is None:
+            return
+        columns = ", ".join(TABLES[table]["columns"])
+        key = TABLES[table]["key"]
+        order = f" ORDER BY {key}" if key else ""
+        empty = True
+        for chunk in pd.read_sql_query(f"SELECT {columns} FROM {table}{order}", conn,
+                                       chunksize=chunk_size):
+            empty = False
+            yield chunk
+        if empty:
+            # 빈 테이블도 "있음"으로 구분되도록 CSV 헤더만 있는 파일처럼 빈 조각 하나
+            yield pd.DataFrame(columns=TABLES[table]["columns"])
+
+    def insert(self, table: str, row: dict) -> int:
+        columns = list(row.keys())
+        placeholders = ", ".join("?" for _ in columns)
+        with self.transaction():
+            cur = self._conn().execute(
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})",
+                [row[c] for c in columns],
+            )
+            self._mark_seeded(table)
+            self._touch(table)
+        return int(cur.lastrowid)
+
+    def update(self, table: str, key: int, fields: dict) -> bool:
+        assignments = ", ".join(f"{c} = ?" for c in fields)
+        with self.transaction():
+            cur = self._conn().execute(
+                f"UPDATE {table} SET {assignments} WHERE {TABLES[table]['key']} = ?",
+                [*fields.values(), key],
+            )
+            self._touch(table)
+        return cur.rowcount > 0
+
+    def increment(self, table: str, key: int, column: str, delta: int, floor=None):
+        key_column = TABLES[table]["key"]
+        expr = f"{column} + ?" if floor is None else f"MAX({int(floor)}, {column} + ?)"
+        with self.transaction():
+            conn = self._conn()
+            cur = conn.execute(
+                f"UPDATE {table} SET {column} = {expr} WHERE {key_column} = ?", (delta, key)
+            )
+            if cur.rowcount == 0:
+                return None
+            self._touch(table)
+            row = conn.execute(
+                f"SELECT {column} FROM {table} WHERE {key_column} = ?", (key,)
+            ).fetchone()
+        return int(row[0])
+
+    def delete(self, table: str, key: int) -> bool:
+        with self.transaction():
+            cur = self._conn().execute(
+                f"DELETE FROM {table} WHERE {TABLES[table]['key']} = ?", (key,)
+            )
+            self._touch(table)
+        return cur.rowcount > 0
+
+    def insert_rows(self, table: str, rows: list) -> list:
+        if not rows:
+            return []
+        key = TABLES[table]["key"]
+        columns = [key, *dict.fromkeys(c for row in rows for c in row)]
+        placeholders = ", ".join("?" for _ in columns)
+        with self.transaction():
+            conn = self._conn()
+            # BEGIN IMMEDIATE 안이라 그 사이 다른 연결이 ID를 가져가지 않는다
+            first_id = conn.execute(f"SELECT COALESCE(MAX({key}), 0) + 1 FROM {table}").fetchone()[0]
+            new_ids = list(range(first_id, first_id + len(rows)))
+            conn.executemany(
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})",
+                [[new_id, *(row.get(c) for c in columns[1:])] for new_id, row in zip(new_ids, rows)],
+            )
+            self._mark_seeded(table)
+            self._touch(table)
+        return new_ids
+
+    def insert_many(self, table: str, rows: list) -> None:
+        columns = TABLES[table]["columns"]
+        placeholders = ", ".join("?" for _ in columns)
+        with self.transaction():
+            self._conn().executemany(
+                f"INSERT OR IGNORE INTO {table} ({', '.join(columns)}) VALUES ({placeholders})",
+                [[row[c] for c in columns] for row in rows],
+            )
+            self._mark_seeded(table)
+            self._touch(table)
+
+    def delete_where(self, table: str, column: str, value) -> None:
+        with self.transaction():
+            self._conn().execute(f"DELETE FROM {table} WHERE {column} = ?", (value,))
+            self._touch(table)
+
+    def page(self, table: str, column: str, cursor, limit: int):
+        key = TABLES[table]["key"]
+        columns = ", ".join(TABLES[table]["columns"])
+        where, params = "", []
+        if cursor is not None:
+            where, params = f"WHERE ({column}, {key}) < (?, ?)", list(cursor)
+        df = pd.read_sql_query(
+            f"SELECT {columns} FROM {table} {where} "
+            f"ORDER BY {column} DESC, {key} DESC LIMIT ?",
+            self._conn(), params=[*params, limit],
+        )
+        next_cursor = None
+        if len(df) == limit:
+            last = df.iloc[-1]
+            next_cursor = (_json_default(last[column]), int(last[key]))
+        return df, next_cursor
+
+    def keys_by_user(self, table: str, user_id: int):
+        # idx_posts_user / idx_tms_user가 기본키 순서로 들고 있다
+        key = TABLES[table]["key"]
+        rows = self._conn().execute(
+            f"SELECT {key} FROM {table} WHERE user_id = ? ORDER BY {key}", (int(user_id),)
+        )
+        return [value for (value,) in rows]
+
+    def rows(self, table: str, keys: list):
+        key = TABLES[table]["key"]
+        columns = ", ".join(TABLES[table]["columns"])
+        keys = [int(value) for value in keys]
+        frames = [
+            pd.read_sql_query(
+                f"SELECT {columns} FROM {table} WHERE {key} IN ({', '.join('?' * len(batch))})",
+                self._conn(), params=batch,
+            )
+            for batch in (keys[start:start + SQLITE_MAX_PARAMS]
+                          for start in range(0, len(keys), SQLITE_MAX_PARAMS))
+        ]
+        if not frames:
+            return pd.DataFrame(columns=TABLES[table]["columns"])
+        df = pd.concat(frames, ignore_index=True).set_index(key, drop=False).rename_axis(None)
+        return df.loc[[value for value in keys if value in df.index]]
+
+    def load_likes(self) -> dict:
+        user_likes = {}
+        for user_id, post_id in self._conn().execute("SELECT user_id, post_id FROM likes"):
+            user_likes.setdefault(user_id, set()).add(post_id)
+        return user_likes
+
+    def liked_post_ids(self, user_id: int) -> set:
+        rows = self._conn().execute("SELECT post_id FROM likes WHERE user_id = ?", (int(user_id),))
+        return {post_id for (post_id,) in rows}
+
+    def post_likers(self, post_id: int) -> set:
+        rows = self._conn().execute("SELECT user_id FROM likes WHERE post_id = ?", (int(post_id),))
+        return {user_id for (user_id,) in rows}
+
+    def post_likers_many(self, post_ids) -> dict:
+        post_ids = sorted({int(post_id) for post_id in post_ids})
+        likers = {}
+        for start in range(0, len(post_ids), SQLITE_MAX_PARAMS):
+            batch = post_ids[start:start + SQLITE_MAX_PARAMS]
+            rows = self._conn().execute(
+                f"SELECT post_id, user_id FROM likes WHERE post_id IN ({', '.join('?' * len(batch))})", batch
+            )
+            for post_id, user_id in rows:
+                likers.setdefault(post_id, set()).add(user_id)
+        return likers
+
+    def save_likes(self, user_likes: dict) -> None:
+        rows = [
+            (int(user_key), int(post_key))
+            for user_key, post_keys in user_likes.items()
+            for post_key in post_keys
+        ]
+        self.replace_likes([rows])
+
+    def scan_likes(self, chunk_size: int = SCAN_CHUNK_ROWS):
+        cur = self._conn().execute("SELECT user_id, post_id FROM likes ORDER BY user_id, post_id")
+        while True:
+            pairs = cur.fetchmany(chunk_size)
+            if not pairs:
+                return
+            yield pairs
+
+    def replace_likes(self, chunks) -> int:
+        count = 0
+        with self.transaction():
+            conn = self._conn()
+            conn.execute("DELETE FROM likes")
+            for pairs in chunks:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO likes (user_id, post_id) VALUES (?, ?)",
+                    [(int(user_id), int(post_id)) for user_id, post_id in pairs],
+                )
+                count += len(pairs)
+            self._touch("likes")
+        return count
+
+    def is_liked(self, post_id: int, user_id: int) -> bool:
+        row = self._conn().execute(
+            "SELECT 1 FROM likes WHERE user_id = ? AND post_id = ?", (user_id, post_id)
+        ).fetchone()
+        return row is not None
+
+    def set_like(self, post_id: int, user_id: int, liked: bool) -> None:
+        if liked:
+            sql = "INSERT OR IGNORE INTO likes (user_id, post_id) VALUES (?, ?)"
+        else:
+            sql = "DELETE FROM likes WHERE user_id = ? AND post_id = ?"
+        with self.transaction():
+            self._conn().execute(sql, (user_id, post_id))
+            self._touch("likes")
+
+    def remove_post_likes(self, post_id: int) -> None:
+        with self.transaction():
+            self._conn().execute("DELETE FROM likes WHERE post_id = ?", (post_id,))
+            self._touch("likes")
+
+    # -- 유지보수 --------------------------------------------------------------
+
+    def rebuild_indexes(self) -> None:
+        """모든 인덱스를 테이블에서 다시 만든다"""
+        self._conn().execute("REINDEX")
+
+    def vacuum(self) -> None:
+        """WAL을 DB 파일에 반영해 비우고 빈 페이지를 정리한다"""
+        conn = self._conn()
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.execute("VACUUM")
+
+
+# =============================================================================
+# 추가 전용 로그 백엔드 (posts / travel_mates)
+# =============================================================================
+
+# 로그가 이 크기(바이트)를 넘으면 스냅샷으로 압축
+LOG_COMPACT_BYTES = int(os.environ.get("COMMUNITY_LOG_COMPACT_BYTES", 1024 * 1024))
+
+# 로그로 관리하는 테이블 (나머지는 CSV 백엔드와 동일)
+LOG_TABLES = ("posts", "travel_mates")
+
+
+def _log_path(table: str) -> str:
+    return os.path.splitext(TABLES[table]["file"])[0] + ".log"
+
+
+class LogStorage(CsvStorage):
+    """
+    CSV 스냅샷 + 추가 전용 변경 로그 백엔드
+
+    변경은 insert/update/delete 레코드 한 줄을 로그 끝에 덧붙이는 것으로 끝나고,
+    읽기는 마지막 스냅샷에 로그 꼬리를 재생해서 만든다. 로그가
+    LOG_COMPACT_BYTES를 넘으면 백그라운드 스레드가 스냅샷으로 접어 넣는다.
+    ID는 max()+1 대신 로그에 기록되는 시퀀스로 부여한다.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._states = {}
+        self._locks = {table: threading.RLock() for table in LOG_TABLES}
+        # 로그 테이블의 카운터는 로그 레코드로, 읽기는 메모리 상태로 충분하다
+        for table in LOG_TABLES:
+            self._counters.pop(table, None)
+        self._columnar_enabled = tuple(t for t in COLUMNAR_TABLES if t not in LOG_TABLES)
+        self._compacting = set()
+
+    # -- 상태 재생 ------------------------------------------------------------
+
+    def _state(self, table: str):
+        """스냅샷 + 로그 꼬리를 반영한 메모리 상태 (없으면 None)"""
+        snapshot_sig = _file_signature(TABLES[table]["file"])
+        log_sig = _file_signature(_log_path(table))
+        if snapshot_sig is None and log_sig is None:
+            self._states.pop(table, None)
+            return None
+
+        state = self._states.get(table)
+        log_size = log_sig[2] if log_sig else 0
+        if (state is None or state["snapshot_sig"] != snapshot_sig
+                or state["log_ino"] != (log_sig[0] if log_sig else None)
+                or log_size < state["log_offset"]):
+            state = self._load_snapshot(table, snapshot_sig)
+            self._states[table] = state
+        if log_size > state["log_offset"]:
+            self._replay(table, state)
+        return state
+
+    def _load_snapshot(self, table: str, snapshot_sig) -> dict:
+        key = TABLES[table]["key"]
+        rows = {}
+        if snapshot_sig is not None:
+            metrics.count_file_read(TABLES[table]["file"])
+            df = pd.read_csv(TABLES[table]["file"])
+            df = df.astype(object).where(df.notna(), None)
+            rows = {int(r[key]): r for r in df.to_dict("records")}
+        log_sig = _file_signature(_log_path(table))
+        return {
+            "rows": rows,
+            "seq": max(rows) if rows else 0,
+            "snapshot_sig": snapshot_sig,
+            "log_ino": log_sig[0] if log_sig else None,
+            "log_offset": 0,
+            "df": None,
+        }
+
+    def _replay(self, table: str, state: dict) -> None:
+        key = TABLES[table]["key"]
+        rows = state["rows"]
+        start = state["log_offset"]
+        with open(_log_path(table), "rb") as f:
+            f.seek(state["log_offset"])
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # 아직 쓰는 중인 마지막 줄은 다음에 읽는다
+                state["log_offset"] += len(line)
+                record = json.loads(line)
+                op = record["op"]
+                if op == "insert":
+                    row = record["row"]
+                    rows[int(row[key])] = row
+                    state["seq"] = max(state["seq"], int(row[key]))
+                elif op == "update":
+                    if record["key"] in rows:
+                        rows[record["key"]].update(record["fields"])
+                elif op == "delete":
+                    rows.pop(record["key"], None)
+                elif op == "seq":
+                    state["seq"] = max(state["seq"], int(record["value"]))
+        metrics.count_io("read", state["log_offset"] - start)
+        state["df"] = None
+
+    @contextmanager
+    def _writing(self, table: str):
+        """프로세스 내 잠금 + 로그 파일 잠금 (다른 프로세스와 시퀀스가 겹치지 않게)"""
+        with self._locks[table], file_lock(_log_path(table)):
+            yield
+
+    def write_lock(self, table: str):
+        if table not in LOG_TABLES:
+            return super().write_lock(table)
+        return self._writing(table)
+
+    def _append(self, table: str, state: dict, *records: dict) -> None:
+        """레코드들을 로그 끝에 덧붙인다 (여러 개여도 쓰기와 fsync는 한 번)"""
+        data = "".join(
+            json.dumps(record, ensure_ascii=False, default=_json_default) + "\n" for record in records
+        ).encode("utf-8")
+        with open(_log_path(table), "ab") as f:
+            # 쓰다 죽은 프로세스가 남긴 잘린 줄은 잘라내고 이어 쓴다
+            if f.tell() > state["log_offset"]:
+                f.truncate(state["log_offset"])
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        metrics.count_io("written", len(data))
+        self._bump(table)
+        self._replay(table, state)
+        if state["log_offset"] > LOG_COMPACT_BYTES:
+            self._schedule_compaction(table)
+
+    # -- 압축 ------------------------------------------------------------------
+
+    def _schedule_compaction(self, table: str) -> None:
+        if table in self._compacting:
+            return
+        self._compacting.add(table)
+        threading.Thread(target=self.compact, args=(table,), daemon=True).start()
+
+    def compact(self, table: str) -> None:
+        """로그를 스냅샷에 반영하고 로그를 시퀀스 한 줄로 비운다"""
+        try:
+            with self._writing(table):
+                state = self._state(table)
+                if state is None:
+                    return
+                df = self._frame(table, state)
+                atomic_write(TABLES[table]["file"], lambda f: df.to_csv(f, index=False))
+                seq_line = json.dumps({"op": "seq", "value": state["seq"]}) + "\n"
+                atomic_write(_log_path(table), lambda f: f.write(seq_line))
+                self._states.pop(table, None)
+        finally:
+            self._compacting.discard(table)
+
+    # -- Storage 구현 ----------------------------------------------------------
+
+    def version(self, table: str):
+        if table not in LOG_TABLES or self._changes is not None:
+            return super().version(table)
+        return (
+            _file_signature(TABLES[table]["file"]),
+            _file_signature(_log_path(table)),
+            self._write_counts.get(table, 0),
+        )
+
+    def _frame(self, table: str, state: dict) -> pd.DataFrame:
+        if state["df"] is None:
+            columns = TABLES[table]["columns"]
+            df = pd.DataFrame.from_records(list(state["rows"].values()), columns=columns)
+            state["df"] = df.infer_objects()
+        return state["df"]
+
+    def load(self, table: str):
+        if table not in LOG_TABLES:
+            return super().load(table)
+        with self._locks[table]:
+            state = self._state(table)
+            if state is None:
+                return None
+            return self._frame(table, state)
+
+    def save(self, table: str, df: pd.DataFrame) -> None:
+        if table not in LOG_TABLES:
+            return super().save(table, df)
+        with self._writing(table):
+            super().save(table, df)
+            atomic_write(_log_path(table), lambda f: None)
+            self._states.pop(table, None)
+            self._bump(table)  # 로그까지 비운 뒤에 다른 프로세스가 다시 읽도록
+
+    def _log_pending(self, table: str) -> bool:
+        """로그에 스냅샷에 아직 반영되지 않은 변경이 있는지 (압축 직후의 시퀀스 줄은 제외)"""
+        if not os.path.exists(_log_path(table)):
+            return False
+        with open(_log_path(table), "rb") as f:
+            return any(json.loads(line)["op"] != "seq" for line in f if line.endswith(b"\n"))
+
+    def scan(self, table: str, chunk_size: int = SCAN_CHUNK_ROWS):
+        if table not in LOG_TABLES or not self._log_pending(table):
+            # 로그가 비었으면 스냅샷 CSV를 그대로 나눠 읽는다
+            yield from super().scan(table, chunk_size)
+            return
+        with self._locks[table]:
+            state = self._state(table)
+            df = self._frame(table, state) if state is not None else None
+        for start in range(0, 0 if df is None else len(df), chunk_size):
+            yield df.iloc[start:start + chunk_size]
+
+    def replace(self, table: str, chunks) -> int:
+        if table not in LOG_TABLES:
+            return super().replace(table, chunks)
+        with self._writing(table):
+            rows = super().replace(table, chunks)
+            atomic_write(_log_path(table), lambda f: None)
+            self._states.pop(table, None)
+            self._bump(table)
+        return rows
+
+    def insert(self, table: str, row: dict) -> int:
+        if table not in LOG_TABLES:
+            return super().insert(table, row)
+        key = TABLES[table]["key"]
+        with self._writing(table):
+            state = self._state(table) or self._load_snapshot(table, None)
+            self._states[table] = state
+            new_id = state["seq"] + 1
+            self._append(table, state, {"op": "insert", "row": {key: new_id, **row}})
+        return new_id
+
+    def insert_rows(self, table: str, rows: list) -> list:
+        if table not in LOG_TABLES:
+            return super().insert_rows(table, rows)
+        if not rows:
+            return []
+        key = TABLES[table]["key"]
+        with self._writing(table):
+            state = self._state(table) or self._load_snapshot(table, None)
+            self._states[table] = state
+            new_ids = list(range(state["seq"] + 1, state["seq"] + 1 + len(rows)))
+            self._append(table, state, *(
+                {"op": "insert", "row": {key: new_id, **row}} for new_id, row in zip(new_ids, rows)
+            ))
+        return new_ids
+
+    def update(self, table: str, key: int, fields: dict) -> bool:
+        if table not in LOG_TABLES:
+            return super().update(table, key, fields)
+        with self._writing(table):
+            state = self._state(table)
+            if state is None or key not in state["rows"]:
+                return False
+            self._append(table, state, {"op": "update", "key": key, "fields": fields})
+        return True
+
+    def increment(self, table: str, key: int, column: str, delta: int, floor=None):
+        if table not in LOG_TABLES:
+            return super().increment(table, key, column, delta, floor)
+        with self._writing(table):
+            state = self._state(table)
+            if state is None or key not in state["rows"]:
+                return None
+            value = int(state["rows"][key][column] or 0) + delta
+            if floor is not None:
+                value = max(floor, value)
+            self._append(table, state, {"op": "update", "key": key, "fields": {column: value}})
+        return value
+
+    def delete(self, table: str, key: int) -> bool:
+        if table not in LOG_TABLES:
+            return super().delete(table, key)
+        with self._writing(table):
+            state = self._state(table)
+            if state is None or key not in state["rows"]:
+                return False
+            self._append(table, state, {"op": "delete", "key": key})
+        return True
+
+
+# =============================================================================
+# 백엔드 선택
+# =============================================================================
+
+_BACKENDS = {
+    "csv": CsvStorage,
+    "sqlite": SqliteStorage,
+    "log": LogStorage,
+}
+
+_storage = None
+_storage_lock = threading.Lock()
+
+
+def open_storage(backend: str, **options) -> Storage:
+    """backend 저장소의 새 인스턴스 (유지보수 도구처럼 설정과 다른 백엔드가 필요할 때)"""
+    # 데이터 디렉토리는 import 시점이 아니라 처음 쓸 때 만든다
+    os.makedirs(DATA_DIR, exist_ok=True)
+    return _BACKENDS[backend](**options)
+
+
+def get_storage() -> Storage:
+    """설정된 백엔드의 저장소 인스턴스를 반환 (프로세스당 1개)"""
+    global _storage
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                _storage = open_storage(STORAGE_BACKEND)
+    return _storage
+
+
+def _counted(label: str, chunks, progress):
+    for chunk in chunks:
+        yield chunk
+        if progress is not None:
+            progress(label, len(chunk))
+
+
+def copy_tables(source: Storage, target: Storage, chunk_size: int = SCAN_CHUNK_ROWS,
+                progress=None) -> dict:
+    """
+    source의 모든 테이블과 좋아요를 target으로 조각 단위로 옮기고 {테이블: 행 수} 반환
+
+    source에 없는 테이블은 target에서도 만들지 않는다 (처음 읽을 때 기본 데이터가 생긴다).
+    progress(테이블, 행 수)는 조각 하나를 쓸 때마다 불린다.
+    """
+    counts = {}
+    with target.transaction():
+        for table in TABLES:
+            chunks = source.scan(table, chunk_size)
+            first = next(chunks, None)
+            if first is None:
+                continue
+            counts[table] = target.replace(
+                table, _counted(table, itertools.chain([first], chunks), progress)
+            )
+        counts["likes"] = target.replace_likes(
+            _counted("likes", source.scan_likes(chunk_size), progress)
+        )
+    return counts
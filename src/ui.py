@@ -1,4 +1,7 @@
 import streamlit as st
+import pandas as pd
+from . import metrics
+from .images import image_path
 
 def setup_page():
     st.set_page_config(
@@ -8,4 +11,52 @@ def setup_page():
     )
     st.title("재한 인도인 커뮤니티 नमस्ते")
     with st.sidebar:
-        st.image("assets/india_flag_256x170.png", use_container_width=True)
\ No newline at end of file
+        st.image("assets/india_flag_256x170.png", use_container_width=True)
+# 프로필 메뉴 이름 (app.py 메뉴와 @사용자명 버튼이 함께 쓴다)
+PROFILE_PAGE = "👤 프로필"
+
+def open_profile(user_id: int):
+    """@사용자명 버튼 콜백 - 리런 전에 실행되므로 메뉴 선택을 프로필로 바꿀 수 있다"""
+    st.session_state["profile_user_id"] = int(user_id)
+    st.session_state["menu"] = PROFILE_PAGE
+
+def render_user_link(user_id: int, username: str, key: str):
+    """누르면 그 사용자의 프로필로 가는 @사용자명"""
+    st.button(f"**@{username}**", key=key, type="tertiary", on_click=open_profile, args=(user_id,),
+              help=f"작성자 ID: {user_id} · 프로필 보기")
+
+def render_post_images(images, large: bool = True):
+    """게시글 첨부 이미지 - 작은 변형만 보여준다 (한 장이면 피드 크기, 여러 장이면 썸네일)"""
+    if large and len(images) == 1:
+        path = image_path(images[0], "feed")
+        if path:
+            st.image(path)
+        return
+    for column, image in zip(st.columns(len(images)), images):
+        path = image_path(image, "thumb")
+        if path:
+            column.image(path)
+
+def render_metrics_panel():
+    """관리자용 계측 패널 (COMMUNITY_METRICS가 켜져 있을 때만)"""
+    if not metrics.ENABLED:
+        return
+    snapshot = metrics.registry.snapshot()
+    with st.sidebar.expander("🛠️ 성능 지표"):
+        counters = snapshot["counters"]
+        st.caption(
+            f"리런 {counters.get('reruns_total', 0)}회 · "
+            f"읽기 {counters.get('bytes_read_total', 0):,}B · 쓰기 {counters.get('bytes_written_total', 0):,}B"
+        )
+        rows = [
+            {"종류": family, "이름": label or "-", "호출": stats["count"],
+             "p50": stats["p50"], "p95": stats["p95"], "p99": stats["p99"]}
+            for family, by_label in snapshot["histograms"].items()
+            for label, stats in by_label.items()
+        ]
+        if rows:
+            st.dataframe(pd.DataFrame(rows), hide_index=True)
+        st.download_button("Prometheus", metrics.registry.to_prometheus(), "metrics.prom", "text/plain")
+        st.download_button("JSON", metrics.to_json(), "metrics.json", "application/json")
+        if st.button("지표 초기화"):
+            metrics.registry.reset()
@@ -0,0 +1,72 @@
+import os
+import queue
+import threading
+from concurrent.futures import Future
+from . import metrics
+
+# 대기할 수 있는 쓰기 요청 수 (넘으면 WriteQueueFull)
+WRITE_QUEUE_SIZE = int(os.environ.get("COMMUNITY_WRITE_QUEUE_SIZE", 256))
+
+# 큐가 가득 찼을 때 자리가 나기를 기다리는 시간 (초) - 클릭 응답이 늦어지지 않게 짧게
+WRITE_QUEUE_TIMEOUT = float(os.environ.get("COMMUNITY_WRITE_QUEUE_TIMEOUT", 0.02))
+
+
+class WriteQueueFull(Exception):
+    """쓰기 큐가 가득 차서 요청을 받지 못함 (잠시 후 다시 시도)"""
+
+
+class BackgroundWriter:
+    """
+    프로세스 전역 백그라운드 쓰기 스레드
+
+    Streamlit 세션들은 한 프로세스의 스레드이므로 모든 세션이 이 큐 하나를
+    공유한다. 요청은 들어온 순서대로 한 스레드가 실행하고, submit()은
+    바로 Future를 돌려주므로 화면은 쓰기가 끝나기를 기다리지 않는다.
+    """
+
+    def __init__(self, maxsize: int = WRITE_QUEUE_SIZE):
+        self._queue = queue.Queue(maxsize)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="community-writer", daemon=True)
+                self._thread.start()
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        """fn(*args, **kwargs)를 큐에 넣고 결과를 받을 Future 반환"""
+        self._start()
+        future = Future()
+        try:
+            self._queue.put((future, fn, args, kwargs), timeout=WRITE_QUEUE_TIMEOUT)
+        except queue.Full:
+            if metrics.ENABLED:
+                metrics.registry.inc("write_queue_full_total")
+            raise WriteQueueFull(f"쓰기 대기열이 가득 찼습니다 ({self._queue.maxsize}건)")
+        return future
+
+    def pending(self) -> int:
+        """아직 끝나지 않은 요청 수 (대략값)"""
+        return self._queue.unfinished_tasks
+
+    def flush(self) -> None:
+        """지금까지 들어온 요청이 모두 끝날 때까지 기다린다"""
+        self._queue.join()
+
+    def _run(self) -> None:
+        while True:
+            future, fn, args, kwargs = self._queue.get()
+            try:
+                if future.set_running_or_notify_cancel():
+                    with metrics.span("write_seconds", getattr(fn, "__name__", "write")):
+                        future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                self._queue.task_done()
+
+
+# 프로세스 전체에서 공유하는 쓰기 스레드
+writer = BackgroundWriter()
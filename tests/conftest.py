@@ -0,0 +1,42 @@
+"""
+테스트 공통 준비
+
+src의 데이터 경로(data/...)는 작업 디렉토리 기준이므로, 테스트마다 빈 임시
+디렉토리로 옮겨 가고 프로세스 전역 상태(저장소 인스턴스, 테이블 캐시, 검색 색인,
+통계)를 새로 만든다.
+"""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+BACKENDS = ("csv", "log", "sqlite")
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """빈 데이터 디렉토리 (설정된 기본 백엔드)"""
+    from src import search, stats, storage
+    from src.cache import table_cache
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(storage, "_storage", None)
+    monkeypatch.setattr(stats, "community", stats.CommunityStats())
+    table_cache.invalidate()
+    search._indexes.clear()
+    yield tmp_path
+    table_cache.invalidate()
+    search._indexes.clear()
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request, data_dir, monkeypatch):
+    """빈 데이터 디렉토리 + 세 저장소 백엔드 각각"""
+    from src import storage
+
+    monkeypatch.setattr(storage, "STORAGE_BACKEND", request.param)
+    return request.param
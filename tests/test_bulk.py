@@ -0,0 +1,38 @@
+"""
+빈 데이터 디렉토리에서 대량 가져오기 점검
+
+매번 새 임시 디렉토리에서 maintenance import를 실행하므로 기본 데이터가 처음
+만들어지는 경로(첫 설치 직후 가져오기)를 그대로 탄다.
+"""
+import pytest
+
+from src import maintenance
+
+FILES = {
+    "posts": (
+        "username,content,tags,created_at\n"
+        "alice,갠지스 강 보트 투어 후기,\"varanasi,ganges\",2024-09-01 10:00:00\n"
+        "bob,조드푸르 블루시티 산책,jodhpur,2024-09-02 18:30:00\n"
+    ),
+    "travel_mates": (
+        "username,title,departure_city,destination_city,date_from,date_to,contact\n"
+        "alice,아그라 당일치기,Delhi,Agra,2024-10-01,2024-10-01,alice@email.com\n"
+        "charlie,케랄라 백워터 동행,Kochi,Alleppey,2024-11-03,2024-11-05,charlie@email.com\n"
+    ),
+}
+
+
+@pytest.mark.parametrize("table", list(FILES))
+def test_import_into_empty_data_dir(data_dir, backend, table, capsys):
+    assert not (data_dir / "data").exists()
+    path = data_dir / f"{table}.csv"
+    path.write_text(FILES[table], encoding="utf-8")
+
+    assert maintenance.main(["import", table, str(path), "--quiet"]) == 0
+    assert "2행 추가" in capsys.readouterr().out
+
+    # 다시 가져오면 모두 이미 있는 행으로 건너뛴다
+    assert maintenance.main(["import", table, str(path), "--quiet"]) == 0
+    assert "0행 추가" in capsys.readouterr().out
+
+    assert maintenance.main(["verify", "--backend", backend, "--quiet"]) == 0, capsys.readouterr().out
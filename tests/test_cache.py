@@ -0,0 +1,57 @@
+"""버전별 테이블 캐시와 파생 뷰 증분 갱신 (TableCache)"""
+import pandas as pd
+
+from src.cache import TableCache
+
+
+def test_table_is_reloaded_only_when_version_changes():
+    cache = TableCache()
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return pd.DataFrame({"a": [len(loads)]})
+
+    assert cache.get_table("posts", 1, loader)["a"].tolist() == [1]
+    assert cache.get_table("posts", 1, loader)["a"].tolist() == [1]
+    assert cache.get_table("posts", 2, loader)["a"].tolist() == [2]
+    assert len(loads) == 2
+
+
+def test_callers_cannot_modify_cached_table():
+    cache = TableCache()
+    df = cache.get_table("posts", 1, lambda: pd.DataFrame({"a": [1, 2]}))
+    df.loc[0, "a"] = 99
+    assert cache.get_table("posts", 1, lambda: None)["a"].tolist() == [1, 2]
+
+
+def test_advance_derived_moves_view_to_new_version():
+    cache = TableCache()
+    cache.get_derived("users", 1, "index", lambda: [1, 2])
+    assert cache.advance_derived("users", 1, 2, "index", lambda view: view.append(3) or True)
+    # 새 버전에서는 다시 만들지 않고 고친 뷰를 돌려준다
+    assert cache.get_derived("users", 2, "index", lambda: ["rebuilt"]) == [1, 2, 3]
+
+
+def test_advance_derived_drops_view_on_version_mismatch():
+    cache = TableCache()
+    cache.get_derived("users", 1, "index", lambda: [1, 2])
+    # 그 사이 다른 쓰기가 끼어 캐시의 버전이 old_version이 아니다
+    assert not cache.advance_derived("users", 5, 6, "index", lambda view: True)
+    assert cache.get_derived("users", 1, "index", lambda: ["rebuilt"]) == ["rebuilt"]
+
+
+def test_advance_derived_drops_view_when_update_refuses():
+    cache = TableCache()
+    cache.get_derived("users", 1, "index", lambda: [1, 2])
+    assert not cache.advance_derived("users", 1, 2, "index", lambda view: False)
+    assert cache.get_derived("users", 2, "index", lambda: ["rebuilt"]) == ["rebuilt"]
+    assert not cache.advance_derived("users", 2, 3, "missing", lambda view: True)
+
+
+def test_stale_views_are_dropped_with_the_table():
+    cache = TableCache()
+    cache.get_table("posts", 1, lambda: pd.DataFrame({"a": [1]}))
+    cache.get_derived("posts", 1, "hot", lambda: "old")
+    cache.get_table("posts", 2, lambda: pd.DataFrame({"a": [2]}))
+    assert cache.get_derived("posts", 2, "hot", lambda: "new") == "new"
@@ -0,0 +1,78 @@
+"""좋아요/리포스트 카운터 스트림 (CounterLog)과 CSV 반영(fold)"""
+import pandas as pd
+
+from src import data
+from src.storage import TABLES, CounterLog, _counter_path, open_storage
+
+
+def test_stream_is_shared_through_the_file(data_dir):
+    (data_dir / "data").mkdir()
+    writer = CounterLog("posts")
+    with writer.writing():
+        writer.append_many([(1, "likes", 1, 6), (2, "reposts", 1, 1)])
+        writer.append(1, "likes", 1, 7)
+
+    # 다른 프로세스처럼 새로 연 스트림은 파일에서 마지막 값을 읽는다
+    reader = CounterLog("posts")
+    reader.refresh()
+    assert reader.value(1, "likes") == 7
+    assert reader.value(2, "reposts") == 1
+    assert reader.value(3, "likes") is None
+
+    df = pd.DataFrame({"post_id": [1, 2, 3], "likes": [5, 0, 2], "reposts": [0, 0, 4]})
+    applied = reader.apply(df)
+    assert applied["likes"].tolist() == [7, 0, 2]
+    assert applied["reposts"].tolist() == [0, 1, 4]
+
+
+def test_partial_last_line_is_skipped(data_dir):
+    (data_dir / "data").mkdir()
+    log = CounterLog("posts")
+    with log.writing():
+        log.append(1, "likes", 1, 1)
+    with open(_counter_path("posts"), "a", encoding="utf-8") as f:
+        f.write('{"key": 1, "column": "likes", "delta": 1, "va')
+
+    reader = CounterLog("posts")
+    reader.refresh()
+    assert reader.value(1, "likes") == 1
+    # 잘린 줄은 다음 쓰기가 잘라내고 이어 쓴다
+    with reader.writing():
+        reader.append(1, "likes", 1, 2)
+    fresh = CounterLog("posts")
+    fresh.refresh()
+    assert fresh.value(1, "likes") == 2 and fresh.records == 2
+
+
+def test_fold_writes_counts_into_csv_and_empties_stream(data_dir):
+    storage = open_storage("csv")
+    storage.save("posts", pd.DataFrame({
+        "post_id": [1, 2], "user_id": [1, 1], "content": ["a", "b"], "tags": ["", ""],
+        "likes": [0, 3], "reposts": [0, 0], "created_at": ["2024-08-15 10:00:00"] * 2,
+    }))
+    assert storage.increment("posts", 1, "likes", 1) == 1
+    assert storage.increment("posts", 2, "likes", -5, floor=0) == 0
+    assert storage.increment("posts", 2, "reposts", 1) == 1
+    assert storage.increment("posts", 9, "likes", 1) is None
+
+    # 반영 전에도 읽으면 스트림 값이 덮어써진다
+    assert storage.load("posts")[["likes", "reposts"]].values.tolist() == [[1, 0], [0, 1]]
+    storage.fold_counters("posts")
+    assert (data_dir / _counter_path("posts")).stat().st_size == 0
+    on_disk = pd.read_csv(TABLES["posts"]["file"])
+    assert on_disk[["likes", "reposts"]].values.tolist() == [[1, 0], [0, 1]]
+
+
+def test_counts_survive_reopen(backend):
+    data.get_posts()
+    data.toggle_like(1, 2)
+    data.inc_repost(1)
+    before = data.get_posts().set_index("post_id").loc[1, ["likes", "reposts"]].tolist()
+
+    from src import storage
+    from src.cache import table_cache
+
+    storage._storage = None
+    table_cache.invalidate()
+    after = data.get_posts().set_index("post_id").loc[1, ["likes", "reposts"]].tolist()
+    assert after == before == [6, 2]
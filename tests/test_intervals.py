@@ -0,0 +1,32 @@
+"""여행 기간 구간 트리 (IntervalTree)"""
+import numpy as np
+
+from src.intervals import IntervalTree
+
+
+def _brute_force(intervals: list, lo: int, hi: int) -> list:
+    return sorted(value for start, end, value in intervals if start <= hi and end >= lo)
+
+
+def test_matches_brute_force():
+    rng = np.random.default_rng(0)
+    starts = rng.integers(0, 365, 300)
+    intervals = [(int(start), int(start + rng.integers(0, 30)), i) for i, start in enumerate(starts)]
+    tree = IntervalTree(intervals)
+    assert len(tree) == len(intervals)
+    for lo in range(-5, 400, 7):
+        for length in (0, 1, 14):
+            assert sorted(tree.overlapping(lo, lo + length)) == _brute_force(intervals, lo, lo + length)
+
+
+def test_closed_interval_edges():
+    tree = IntervalTree([(10, 20, "a"), (20, 20, "b"), (21, 25, "c")])
+    assert sorted(tree.overlapping(20, 20)) == ["a", "b"]
+    assert tree.overlapping(0, 9) == []
+    assert sorted(tree.overlapping(25, 30)) == ["c"]
+
+
+def test_empty_tree():
+    tree = IntervalTree([])
+    assert len(tree) == 0
+    assert tree.overlapping(0, 100) == []
@@ -0,0 +1,85 @@
+"""hot 순위 상위 집합(HotRanking)의 증분 갱신과 페이지"""
+import numpy as np
+
+from src.ranking import HotRanking, hot_keys
+
+HOUR_NS = 3600 * 10 ** 9
+
+
+def _expected(counts: dict) -> list:
+    """{post_id: (likes, reposts, created_ns)} → 전체를 정렬한 post_id 순서"""
+    ids = list(counts)
+    likes, reposts, created = zip(*(counts[post_id] for post_id in ids))
+    keys = hot_keys(likes, reposts, created)
+    return [post_id for _, post_id in sorted(zip(keys.tolist(), ids), reverse=True)]
+
+
+def _pages(ranking: HotRanking, limit: int) -> list:
+    """상위 집합만으로 채울 수 있는 페이지를 이어 붙인 순서"""
+    seen, cursor = [], None
+    while True:
+        page = ranking.page(cursor, limit)
+        if page is None:
+            return seen
+        seen += page[0]
+        cursor = page[1]
+        if cursor is None:
+            return seen
+
+
+def _random_posts(count: int, seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    return {
+        post_id: (int(rng.integers(0, 50)), int(rng.integers(0, 10)), int(rng.integers(0, 96)) * HOUR_NS)
+        for post_id in range(1, count + 1)
+    }
+
+
+def _build(counts: dict, k: int) -> HotRanking:
+    ids = list(counts)
+    likes, reposts, created = zip(*(counts[post_id] for post_id in ids))
+    return HotRanking(ids, likes, reposts, created, k=k)
+
+
+def test_pages_match_full_sort_prefix():
+    counts = _random_posts(60)
+    ranking = _build(counts, k=12)
+    seen = _pages(ranking, 5)
+    # 상위 K개 안에서 채울 수 있는 페이지까지만 나오고, 그 순서는 전체 순위와 같다
+    assert 5 <= len(seen) <= 12
+    assert seen == _expected(counts)[:len(seen)]
+
+
+def test_small_table_pages_to_the_end():
+    counts = _random_posts(7)
+    ranking = _build(counts, k=20)
+    assert _pages(ranking, 3) == _expected(counts)
+
+
+def test_incremental_updates_keep_order():
+    counts = _random_posts(40, seed=1)
+    ranking = _build(counts, k=10)
+
+    # 맨 위 게시글 삭제, 바닥의 게시글은 좋아요를 많이 받아 위로 올라오고, 새 글 추가
+    order = _expected(counts)
+    top, bottom = order[0], order[-1]
+    del counts[top]
+    assert ranking.remove(top)
+    counts[bottom] = (10 ** 6, counts[bottom][1], counts[bottom][2])
+    assert ranking.set_counts(bottom, likes=10 ** 6)
+    counts[41] = (0, 0, 100 * HOUR_NS)
+    assert ranking.add(41, 100 * HOUR_NS)
+    assert not ranking.set_counts(999, likes=1)
+
+    seen = _pages(ranking, 4)
+    assert seen and seen == _expected(counts)[:len(seen)]
+    assert seen[0] == bottom and top not in seen
+
+
+def test_cursor_continues_after_last_entry():
+    counts = _random_posts(30, seed=2)
+    ranking = _build(counts, k=30)
+    first, cursor = ranking.page(None, 10)
+    second, _ = ranking.page(cursor, 10)
+    assert not set(first) & set(second)
+    assert first + second == _expected(counts)[:20]
@@ -0,0 +1,99 @@
+"""n-gram 검색 색인과 변경 로그 (스냅샷 + search_<table>.log)"""
+import os
+import time
+
+import pandas as pd
+
+from src import search
+from src.search import SearchIndex, _log_path, query_terms, tokenize
+
+
+def _posts(rows) -> pd.DataFrame:
+    return pd.DataFrame(rows, columns=["post_id", "content", "tags"])
+
+
+def _new_process() -> None:
+    """다른 프로세스처럼 메모리 색인 없이 파일에서 다시 읽게 한다"""
+    search._indexes.clear()
+
+
+def test_korean_terms_keep_vowel_signs_and_match_inside_words():
+    assert query_terms("델리 맛집, नमस्ते!") == ["델리", "맛집", "नमस्ते"]
+    index = SearchIndex()
+    index.add(1, "델리에서 맛있는 카레 맛집")
+    index.add(2, "뭄바이 카레")
+    index.add(3, "델리 지하철")
+    assert sorted(index.search("카레")) == [1, 2]
+    assert index.search("델리 카레") == [1]
+    assert index.search("맛집 지하철") == []
+    # 한 글자 검색어는 글자 단위 토큰으로 단어 안에서도 찾는다
+    assert "리" in tokenize("델리")
+    assert sorted(index.search("리")) == [1, 3]
+
+
+def test_remove_and_relevance():
+    index = SearchIndex()
+    index.add(1, "카레 카레 카레")
+    index.add(2, "카레 한 번")
+    assert index.search("카레")[0] == 1
+    index.remove(1)
+    assert index.search("카레") == [2]
+    index.add(2, "다른 내용")  # 다시 넣으면 이전 내용은 빠진다
+    assert index.search("카레") == []
+
+
+def test_delta_log_is_replayed_by_other_processes(data_dir):
+    (data_dir / "data").mkdir()
+    df = _posts([(1, "갠지스 일출", "varanasi"), (2, "델리 카레", "food")])
+    assert search.search("posts", df, "카레", version=1) == [2]
+
+    search.add_documents("posts", [(3, {"content": "뭄바이 카레", "tags": ""})])
+    search.remove_document("posts", 2)
+    assert os.path.getsize(_log_path("posts")) > 0
+
+    _new_process()
+    entry = search._load("posts")
+    assert entry.records == 2
+    assert entry.index.search("카레") == [3]
+
+
+def test_log_is_compacted_in_the_background(data_dir, monkeypatch):
+    (data_dir / "data").mkdir()
+    df = _posts([(1, "갠지스 일출", "varanasi")])
+    search.get_index("posts", df, version=1)
+    monkeypatch.setattr(search, "LOG_COMPACT_BYTES", 0)
+    monkeypatch.setattr(search, "SEARCH_LOG_COMPACT_RATIO", 0.0)
+
+    search.add_documents("posts", [(2, {"content": "델리 카레", "tags": ""})])
+    deadline = time.monotonic() + 5
+    while os.path.getsize(_log_path("posts")) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert os.path.getsize(_log_path("posts")) == 0
+
+    _new_process()
+    assert search._load("posts").index.search("카레") == [2]
+
+
+def test_version_change_only_looks_at_new_rows(data_dir, monkeypatch):
+    (data_dir / "data").mkdir()
+    df = _posts([(i, f"게시글 {i}", "") for i in range(1, 11)])
+    search.get_index("posts", df, version=1)
+
+    def full_diff(*args):
+        raise AssertionError("전체 ID를 비교하면 안 된다")
+
+    monkeypatch.setattr(search, "_sync_all", full_diff)
+    # 좋아요처럼 행이 그대로인 변경
+    assert search.search("posts", df, "게시글 7", version=2) == [7]
+    # 다른 프로세스가 덧붙인 행 (아직 색인 로그에는 없다)
+    df = pd.concat([df, _posts([(11, "새 카레 글", "")])], ignore_index=True)
+    assert search.search("posts", df, "카레", version=3) == [11]
+
+
+def test_deleted_rows_fall_back_to_full_sync(data_dir):
+    (data_dir / "data").mkdir()
+    df = _posts([(i, f"카레 {i}", "") for i in range(1, 11)])
+    search.get_index("posts", df, version=1)
+    # 색인 로그를 거치지 않고 지워진 행 (복원 등)
+    df = df[df["post_id"] != 4]
+    assert 4 not in search.search("posts", df, "카레", version=2)
@@ -0,0 +1,83 @@
+"""저장소 백엔드(csv/log/sqlite)가 데이터 계층에서 같은 결과를 내는지"""
+import threading
+
+from src import data
+from src.storage import get_storage
+
+
+def _seed_posts(count: int) -> list:
+    data.get_users()
+    data.get_posts()
+    for i in range(count):
+        assert data.add_post(1 + i % 3, f"바라나시 가트 산책 {i}", "india,travel")
+    return data.get_posts()["post_id"].tolist()
+
+
+def test_add_like_repost(backend):
+    post_ids = _seed_posts(4)
+    assert post_ids == [1, 2, 3, 4, 5, 6, 7]
+    new_post = post_ids[-1]
+
+    assert data.toggle_like(new_post, 1)["like_count"] == 1
+    assert data.toggle_like(new_post, 2)["like_count"] == 2
+    assert data.toggle_like(new_post, 1) == {"liked": False, "like_count": 1, "success": True}
+    # 이미 그 상태면 바꾸지 않는다
+    assert data.toggle_like(new_post, 2, liked=True)["like_count"] is None
+    assert data.inc_repost(new_post)
+    assert data.inc_repost(new_post)
+
+    row = data.get_posts().set_index("post_id").loc[new_post]
+    assert (row["likes"], row["reposts"]) == (1, 2)
+    assert data.get_liked_post_ids(2) == {new_post}
+    assert data.get_post_likers(new_post) == {2}
+    assert dict(data.get_post_likers_many([1, new_post, 999])) == {new_post: {2}}
+
+    assert data.delete_post(new_post)
+    assert not data.delete_post(new_post)
+    assert new_post not in data.get_posts()["post_id"].tolist()
+    assert data.get_liked_post_ids(2) == frozenset()
+
+
+def test_paging_cursors_cover_every_post_once(backend):
+    _seed_posts(22)
+    for post_id in range(1, 26, 4):
+        for user_id in range(1, 1 + post_id % 4):
+            data.toggle_like(post_id, user_id)
+    posts = data.get_posts()
+    expected = {
+        "latest": posts.sort_values(["created_at", "post_id"], ascending=False)["post_id"].tolist(),
+        "likes": posts.sort_values(["likes", "post_id"], ascending=False)["post_id"].tolist(),
+    }
+
+    for order in ("latest", "likes", "hot"):
+        seen, cursor = [], None
+        while True:
+            page, cursor = data.get_posts_page(order, cursor, 4)
+            assert len(page) <= 4
+            seen += page["post_id"].tolist()
+            if cursor is None:
+                break
+        assert len(seen) == len(set(seen)) == len(posts), order
+        if order in expected:
+            assert seen == expected[order], order
+
+
+def test_write_lock_holds_off_other_writers(backend):
+    """write_lock 안에서 읽은 버전 사이에는 다른 스레드의 쓰기가 끼지 않는다"""
+    data.get_posts()
+    storage = get_storage()
+    done = threading.Event()
+
+    def other_writer():
+        data.add_post(2, "다른 세션의 글", "")
+        done.set()
+
+    with storage.write_lock("posts"):
+        before = storage.version("posts")
+        thread = threading.Thread(target=other_writer)
+        thread.start()
+        assert not done.wait(0.3)
+        assert storage.version("posts") == before
+    thread.join(10)
+    assert done.is_set()
+    assert storage.version("posts") != before
@@ -0,0 +1,55 @@
+"""백그라운드 쓰기 큐 (BackgroundWriter)"""
+import threading
+
+import pytest
+
+from src import writer as writer_module
+from src.writer import BackgroundWriter, WriteQueueFull
+
+
+def test_requests_run_in_order_on_one_thread():
+    writer = BackgroundWriter()
+    order, threads = [], set()
+
+    def write(i):
+        order.append(i)
+        threads.add(threading.current_thread().name)
+        return i * 10
+
+    futures = [writer.submit(write, i) for i in range(20)]
+    assert [future.result(5) for future in futures] == [i * 10 for i in range(20)]
+    assert order == list(range(20))
+    assert threads == {"community-writer"}
+
+
+def test_errors_go_to_the_future_and_the_thread_keeps_running():
+    writer = BackgroundWriter()
+
+    def fail():
+        raise ValueError("쓰기 실패")
+
+    with pytest.raises(ValueError):
+        writer.submit(fail).result(5)
+    assert writer.submit(lambda: "ok").result(5) == "ok"
+
+
+def test_full_queue_raises_instead_of_blocking(monkeypatch):
+    monkeypatch.setattr(writer_module, "WRITE_QUEUE_TIMEOUT", 0.01)
+    writer = BackgroundWriter(maxsize=1)
+    started, release = threading.Event(), threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+
+    running = writer.submit(slow)
+    assert started.wait(5)
+    queued = writer.submit(lambda: "queued")
+    with pytest.raises(WriteQueueFull):
+        writer.submit(lambda: "dropped")
+    assert writer.pending() == 2
+
+    release.set()
+    writer.flush()
+    assert running.done() and queued.result() == "queued"
+    assert writer.pending() == 0